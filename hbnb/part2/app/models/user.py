@@ -1,10 +1,13 @@
 from .basemodel import BaseModel
 from app import db, bcrypt
 from flask_login import UserMixin
+import logging
 import re
 import uuid
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -27,13 +30,6 @@ class User(UserMixin, db.Model):
                  password=None, role="voyageur", is_admin=False, profile_picture=None, **kwargs):
         super().__init__()
         
-        print(f"🔧 User.__init__ appelé avec:")
-        print(f"   first_name: {first_name or kwargs.get('first_name')}")
-        print(f"   last_name: {last_name or kwargs.get('last_name')}")
-        print(f"   email: {email or kwargs.get('email')}")
-        print(f"   username: {username or kwargs.get('username')}")
-        print(f"   role: {role or kwargs.get('role')}")
-        
         # ✅ Gestion SÉCURISÉE des valeurs None avec double protection
         self.first_name = (kwargs.get('first_name') or first_name) or ''
         self.last_name = (kwargs.get('last_name') or last_name) or ''
@@ -63,7 +59,7 @@ class User(UserMixin, db.Model):
         self.places = []
         self.reviews = []
         
-        print(f"🔧 User créé: username='{self.username}', role='{self.role}'")
+        logger.debug("🔧 User créé: username=%r, role=%r", self.username, self.role)
 
     def _validate_required_fields(self):
         """Validation que les champs requis ne sont pas vides"""
@@ -110,11 +106,11 @@ class User(UserMixin, db.Model):
             
             # ✅ Role - Validation
             if self.role and self.role not in ('owner', 'voyageur'):
-                print(f"⚠️ Rôle invalide '{self.role}', utilisation de 'voyageur'")
+                logger.warning("⚠️ Rôle invalide '%s', utilisation de 'voyageur'", self.role)
                 self.role = 'voyageur'
                 
         except AttributeError as e:
-            print(f"❌ AttributeError dans _validate_and_clean: {str(e)}")
+            logger.error("❌ AttributeError dans _validate_and_clean: %s", e)
             # En cas d'erreur, assigner des valeurs par défaut
             if not hasattr(self, 'first_name') or self.first_name is None:
                 self.first_name = ''
@@ -126,7 +122,7 @@ class User(UserMixin, db.Model):
                 self.username = ''
             raise e
         except Exception as e:
-            print(f"❌ Erreur dans _validate_and_clean: {str(e)}")
+            logger.error("❌ Erreur dans _validate_and_clean: %s", e)
             raise e
 
     # ---------- Mot de passe (utilise password_hash) ----------
@@ -184,16 +180,12 @@ class User(UserMixin, db.Model):
             'profile_picture': self.profile_picture,
             'is_admin': bool(self.is_admin) if self.is_admin is not None else False
         }
-        
-        print(f"🔧 to_dict() retourne: username='{result['username']}', role='{result['role']}'")
         return result
 
     # ✅ Méthode de création depuis données API
     @classmethod
     def from_dict(cls, data):
         """Créer un utilisateur depuis un dictionnaire (API)"""
-        print(f"🔧 User.from_dict() appelé avec: {data}")
-        
         if not data:
             raise ValueError("Data cannot be None or empty")
         
@@ -215,11 +207,10 @@ class User(UserMixin, db.Model):
                 profile_picture=data.get('profile_picture')
             )
             
-            print(f"🔧 User.from_dict() créé: username={instance.username}, role={instance.role}")
             return instance
             
         except Exception as e:
-            print(f"❌ Erreur dans User.from_dict(): {str(e)}")
+            logger.error("❌ Erreur dans User.from_dict(): %s", e)
             raise e
 
     # ---------- Méthodes utilitaires ----------
@@ -238,7 +229,7 @@ class User(UserMixin, db.Model):
         try:
             self._validate_and_clean()
         except Exception as e:
-            print(f"⚠️ Erreur lors de la revalidation: {str(e)}")
+            logger.warning("⚠️ Erreur lors de la revalidation: %s", e)
         
         # Mise à jour du mot de passe si fourni
         if 'password' in data and data['password']:
@@ -276,7 +267,7 @@ class User(UserMixin, db.Model):
         try:
             return cls.query.filter_by(email=str(email).lower().strip()).first()
         except Exception as e:
-            print(f"❌ Erreur find_by_email: {str(e)}")
+            logger.error("❌ Erreur find_by_email: %s", e)
             return None
 
     @classmethod
@@ -287,7 +278,7 @@ class User(UserMixin, db.Model):
         try:
             return cls.query.filter_by(username=str(username).strip()).first()
         except Exception as e:
-            print(f"❌ Erreur find_by_username: {str(e)}")
+            logger.error("❌ Erreur find_by_username: %s", e)
             return None
 
     @classmethod
@@ -306,7 +297,7 @@ class User(UserMixin, db.Model):
         try:
             return cls.query.filter_by(role='owner').all()
         except Exception as e:
-            print(f"❌ Erreur get_owners: {str(e)}")
+            logger.error("❌ Erreur get_owners: %s", e)
             return []
 
     @classmethod
@@ -315,7 +306,7 @@ class User(UserMixin, db.Model):
         try:
             return cls.query.filter_by(role='voyageur').all()
         except Exception as e:
-            print(f"❌ Erreur get_travelers: {str(e)}")
+            logger.error("❌ Erreur get_travelers: %s", e)
             return []
 
     # ---------- Validation avant sauvegarde ----------
@@ -331,14 +322,14 @@ class User(UserMixin, db.Model):
                     value = value_str
                 elif name == 'role' and value:
                     if str(value) not in ('owner', 'voyageur'):
-                        print(f"⚠️ Rôle invalide '{value}', utilisation de 'voyageur'")
+                        logger.warning("⚠️ Rôle invalide '%s', utilisation de 'voyageur'", value)
                         value = 'voyageur'
                 elif name in ['first_name', 'last_name', 'username'] and value:
                     value = str(value).strip()
                     if len(value) == 0:
                         raise ValueError(f"{name} cannot be empty")
             except Exception as e:
-                print(f"⚠️ Erreur validation {name}: {str(e)}")
+                logger.warning("⚠️ Erreur validation %s: %s", name, e)
                 # En cas d'erreur, on garde la valeur mais on la nettoie
                 if value is not None:
                     value = str(value)
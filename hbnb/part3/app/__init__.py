@@ -1,18 +1,31 @@
-from flask_restx import Api
 from flask import Flask
-from app.extensions import db, jwt
+from app.extensions import db, sqlite_pragmas, jwt, cache, query_stats, metrics, profiler, slow_queries, write_queue
+from app.services.logs import configure_logging
+from app.api.swagger import HbnbApi, spec_path
 from flask_cors import CORS
 
-def create_app(config_name='default'):
+def create_app(config_name='default', overrides=None):
     from config import config
 
     app = Flask(__name__)
     app.config.from_object(config[config_name])
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///hbnb.db'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Réglages ponctuels (benchmarks, scripts), prioritaires sur config.py
+    if overrides:
+        app.config.update(overrides)
+    configure_logging(app)
 
     db.init_app(app)
+    sqlite_pragmas.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
+    query_stats.init_app(app)
+    metrics.init_app(app)
+    profiler.init_app(app)
+    slow_queries.init_app(app)
+    write_queue.init_app(app)
+
+    from app.cli import hbnb_cli
+    app.cli.add_command(hbnb_cli)
 
     CORS(app, 
      origins=["http://127.0.0.1:5500", "http://localhost:5500"], 
@@ -28,7 +41,7 @@ def create_app(config_name='default'):
         }
     }
 
-    api = Api(
+    api = HbnbApi(
         app,
         version='1.0',
         title='HBNB API',
@@ -37,6 +50,9 @@ def create_app(config_name='default'):
         authorizations=authorizations,
         security='Bearer Auth'
     )
+    # Spec construite au premier accès, ou relue depuis le fichier pré-généré
+    api.spec_file = spec_path(app)
+    app.extensions['hbnb_api'] = api
 
     # Import et ajout des namespaces Flask-RESTX
     from app.api.v1.users import api as users_ns
@@ -44,11 +60,13 @@ def create_app(config_name='default'):
     from app.api.v1.amenities import api as amenities_ns
     from app.api.v1.reviews import api as reviews_ns
     from app.api.v1.auth import api as auth_ns
+    from app.api.v1.admin import api as admin_ns
 
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(reviews_ns, path='/api/v1/reviews')
     api.add_namespace(auth_ns, path='/api/v1/auth')
+    api.add_namespace(admin_ns, path='/api/v1/admin')
 
     return app
\ No newline at end of file
@@ -0,0 +1,32 @@
+import json
+from flask import request
+
+# Nombre maximum de lieux par requête POST /places/bulk
+BULK_MAX_ITEMS = 50000
+
+
+def parse_bulk_items():
+    """Lit un tableau JSON ou un flux NDJSON (un lieu par ligne)
+
+    Une ligne NDJSON illisible donne None : elle sera rejetée seule. La
+    taille du corps est bornée par MAX_CONTENT_LENGTH (413 au-delà).
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        items = []
+        for line in request.stream:
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(None)
+            # Arrêt dès l'élément de trop, sans lire la suite du flux
+            if len(items) > BULK_MAX_ITEMS:
+                raise ValueError(f"At most {BULK_MAX_ITEMS} places per request")
+        return items
+    items = request.get_json(silent=True)
+    if not isinstance(items, list):
+        raise ValueError("Body must be a JSON array of places or NDJSON")
+    if len(items) > BULK_MAX_ITEMS:
+        raise ValueError(f"At most {BULK_MAX_ITEMS} places per request")
+    return items
@@ -0,0 +1,73 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import Response, current_app, request
+from werkzeug.http import http_date, quote_etag
+
+
+class Validator:
+    """Validateur HTTP d'une ressource, calculé sans sérialiser le corps
+
+    parts : valeurs qui changent dès que la représentation change
+    (updated_at, nombres de lignes...). last_modified n'est fourni que si
+    une date suffit à détecter tout changement : une suppression dans une
+    collection ne fait pas avancer updated_at, seul l'ETag la voit.
+    """
+
+    def __init__(self, parts, last_modified=None):
+        seed = repr((request.full_path, tuple(parts))).encode('utf-8')
+        self.etag = hashlib.sha1(seed).hexdigest()[:20]
+        self.last_modified = last_modified
+
+    def headers(self, policy):
+        headers = {'ETag': quote_etag(self.etag, weak=True)}
+        if self.last_modified:
+            headers['Last-Modified'] = http_date(self.last_modified.replace(tzinfo=timezone.utc))
+        cache_control = current_app.config.get('CACHE_CONTROL', {}).get(policy)
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        return headers
+
+    def matches(self):
+        """Vrai si le client possède déjà cette version (RFC 9110 §13.2.2)"""
+        if request.if_none_match:
+            return request.if_none_match.contains_weak(self.etag)
+        since = request.if_modified_since
+        if since and self.last_modified:
+            modified = self.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+            return modified <= since
+        return False
+
+
+def conditional(policy, validator):
+    """Décorateur de GET : 304 si le validateur correspond, en-têtes de cache sinon
+
+    validator(*args, **kwargs) reçoit les arguments de la route et renvoie un
+    Validator, ou None pour laisser la méthode répondre (404, 400...).
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                current = validator(*args, **kwargs)
+            except ValueError:
+                current = None
+            if current is None:
+                return method(self, *args, **kwargs)
+
+            headers = current.headers(policy)
+            if current.matches():
+                return Response(status=304, headers=headers)
+
+            result = method(self, *args, **kwargs)
+            if isinstance(result, tuple) and len(result) == 2 and result[1] == 200:
+                return result[0], 200, headers
+            return result
+        return wrapper
+    return decorator
+
+
+def latest(*timestamps):
+    """Plus récente des dates non nulles (None si aucune)"""
+    values = [t for t in timestamps if isinstance(t, datetime)]
+    return max(values) if values else None
@@ -0,0 +1,51 @@
+from flask import g
+from app.services.facade import HBnBFacade
+
+
+class DataLoader:
+    """Résout des clés par lots, avec mémorisation pour la requête HTTP
+
+    prime() met des clés en attente ; le premier load() d'une clé inconnue
+    les résout toutes d'un coup via batch(keys) -> {clé: valeur}. Une clé
+    absente du résultat vaut None.
+    """
+
+    def __init__(self, batch):
+        self.batch = batch
+        self._values = {}
+        self._pending = set()
+
+    def prime(self, keys):
+        self._pending.update(k for k in keys if k is not None and k not in self._values)
+
+    def load(self, key):
+        if key is None:
+            return None
+        if key not in self._values:
+            self._pending.add(key)
+            self._dispatch()
+        return self._values[key]
+
+    def _dispatch(self):
+        keys, self._pending = list(self._pending), set()
+        found = self.batch(keys)
+        for key in keys:
+            self._values[key] = found.get(key)
+
+
+class Loaders:
+    """Un DataLoader par type d'entité lue par les sérialiseurs"""
+
+    def __init__(self):
+        facade = HBnBFacade()
+        self.users = DataLoader(facade.get_users_by_ids)
+        self.places = DataLoader(facade.get_places_by_ids)
+        self.place_amenities = DataLoader(facade.get_amenities_by_places)
+        self.place_reviews = DataLoader(facade.get_reviews_by_places)
+
+
+def loaders():
+    """Loaders de la requête courante, attachés à flask.g"""
+    if 'loaders' not in g:
+        g.loaders = Loaders()
+    return g.loaders
@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+from flask import current_app
+from flask_restx import Api
+from flask_restx.swagger import Swagger
+
+logger = logging.getLogger(__name__)
+
+
+class HbnbApi(Api):
+    """Api flask-restx dont la spec Swagger peut être pré-générée
+
+    flask-restx ne construit la spec qu'au premier accès à /swagger.json
+    ou à la page /api/v1/, une fois par processus, en parcourant tous les
+    namespaces et modèles. Avec spec_file (SWAGGER_SPEC_FILE), ce premier
+    accès relit le fichier écrit par `flask hbnb export-swagger` ; sans
+    fichier lisible, la spec est générée comme d'habitude.
+    """
+
+    spec_file = None
+
+    @property
+    def __schema__(self):
+        if not self._schema and self.spec_file:
+            self._schema = load_spec(self.spec_file)
+        return super().__schema__
+
+
+def spec_path(app):
+    """Chemin de SWAGGER_SPEC_FILE (relatif au dossier instance), ou None"""
+    path = app.config.get('SWAGGER_SPEC_FILE')
+    return os.path.join(app.instance_path, path) if path else None
+
+
+def load_spec(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("⚠️ Spec Swagger illisible (%s), génération à la volée: %s", path, e)
+        return None
+
+
+def export_spec(api, path):
+    """Génère la spec depuis les namespaces et l'écrit dans path"""
+    with current_app.test_request_context():
+        schema = Swagger(api).as_dict()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(schema, f, ensure_ascii=False)
+    # Remplacement atomique : un worker qui démarre ne lit jamais un fichier partiel
+    os.replace(tmp_path, path)
+    return schema
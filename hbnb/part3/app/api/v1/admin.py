@@ -0,0 +1,149 @@
+from flask import current_app, request, send_file
+from flask_restx import Namespace, Resource
+from app.services.facade import HBnBFacade
+from app.services.pagination import parse_limit
+from flask_jwt_extended import jwt_required, get_jwt
+
+api = Namespace('admin', description='Administration (admin only)')
+
+# format demandé -> (extension du fichier, type MIME)
+PROFILE_FORMATS = {
+    'pstats': ('prof', 'application/octet-stream'),
+    'collapsed': ('collapsed', 'text/plain; charset=utf-8'),
+}
+
+# Suppression d'un utilisateur : auto choisit selon PURGE_SYNC_MAX_ROWS
+DELETE_MODES = ('auto', 'sync', 'async')
+
+
+def require_admin():
+    claims = get_jwt()
+    if not claims.get('is_admin'):
+        api.abort(403, "Admin only")
+
+
+@api.route('/cache')
+class CacheStats(Resource):
+    @api.response(200, 'Cache counters')
+    @api.response(403, 'Admin only')
+    @jwt_required()
+    def get(self):
+        """Compteurs du cache de réponses (hits, misses, évictions)"""
+        require_admin()
+        return HBnBFacade().get_cache_stats(), 200
+
+
+@api.route('/slow-queries')
+class SlowQueries(Resource):
+    @api.doc(params={
+        'limit': 'Nombre de formes de requête (défaut 20, max 100)',
+        'sort': 'total (défaut), count, max ou recent',
+    })
+    @api.response(200, 'Slow queries grouped by fingerprint')
+    @api.response(400, 'Invalid parameters')
+    @api.response(403, 'Admin only')
+    @jwt_required()
+    def get(self):
+        """Requêtes SQL lentes regroupées par forme, avec plan et parcours complets"""
+        require_admin()
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            return HBnBFacade().get_slow_queries(limit, request.args.get('sort', 'total')), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+
+@api.route('/profiles')
+class ProfileList(Resource):
+    @api.doc(params={'limit': 'Nombre de profils (défaut 20, max 100)'})
+    @api.response(200, 'Recent profiles')
+    @api.response(403, 'Admin only')
+    @jwt_required()
+    def get(self):
+        """Profils de requêtes enregistrés (X-Profile: 1 ou échantillonnage)"""
+        require_admin()
+        try:
+            limit = parse_limit(request.args.get('limit'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'profiles': HBnBFacade().get_profiles(limit)}, 200
+
+
+@api.route('/profiles/<profile_id>')
+class ProfileResource(Resource):
+    @api.doc(params={'format': 'summary (défaut, JSON), pstats (fichier .prof) ou collapsed (piles repliées)'})
+    @api.response(200, 'Profile')
+    @api.response(400, 'Unknown format')
+    @api.response(403, 'Admin only')
+    @api.response(404, 'Profile not found')
+    @jwt_required()
+    def get(self, profile_id):
+        """Un profil : résumé JSON, fichier pstats ou piles repliées (flamegraph)"""
+        require_admin()
+        facade = HBnBFacade()
+        fmt = request.args.get('format', 'summary')
+        if fmt == 'summary':
+            profile = facade.get_profile(profile_id)
+            if profile is None:
+                return {'error': 'Profile not found'}, 404
+            return profile, 200
+        if fmt not in PROFILE_FORMATS:
+            return {'error': f"Unknown format '{fmt}'"}, 400
+        extension, mimetype = PROFILE_FORMATS[fmt]
+        path = facade.get_profile_file(profile_id, extension)
+        if path is None:
+            return {'error': 'Profile not found'}, 404
+        return send_file(path, mimetype=mimetype, as_attachment=True,
+                         download_name=f'{profile_id}.{extension}')
+
+
+@api.route('/users/<user_id>')
+class AdminUser(Resource):
+    @api.doc(params={'mode': 'auto (défaut), sync (une transaction) ou async (purge par lots en arrière-plan)'})
+    @api.response(200, 'User deleted')
+    @api.response(202, 'Purge started')
+    @api.response(400, 'Invalid mode')
+    @api.response(403, 'Admin only')
+    @api.response(404, 'User not found')
+    @jwt_required()
+    def delete(self, user_id):
+        """Supprime un utilisateur, ses lieux et ses avis
+
+        Petit inventaire : une transaction, réponse 200. Au-delà de
+        PURGE_SYNC_MAX_ROWS lieux + avis (ou mode=async) : purge par lots
+        en arrière-plan, réponse 202 avec le job à suivre sur /admin/purges/<id>.
+        """
+        require_admin()
+        mode = request.args.get('mode', 'auto')
+        if mode not in DELETE_MODES:
+            return {'error': f"mode must be one of: {', '.join(DELETE_MODES)}"}, 400
+        facade = HBnBFacade()
+        if mode == 'auto':
+            inventory = facade.get_user_inventory(user_id)
+            if inventory is None:
+                return {'error': 'User not found'}, 404
+            rows = inventory['places'] + inventory['reviews']
+            mode = 'async' if rows > current_app.config.get('PURGE_SYNC_MAX_ROWS', 5000) else 'sync'
+        try:
+            if mode == 'sync':
+                facade.delete_user(user_id)
+                return {'message': 'User deleted successfully'}, 200
+            job = facade.start_user_purge(user_id)
+        except ValueError as e:
+            return {'error': str(e)}, 404
+        return job, 202
+
+
+@api.route('/purges/<job_id>')
+class PurgeJobResource(Resource):
+    @api.response(200, 'Purge progress')
+    @api.response(403, 'Admin only')
+    @api.response(404, 'Purge job not found')
+    @jwt_required()
+    def get(self, job_id):
+        """Progression d'une purge : statut, lignes supprimées / total"""
+        require_admin()
+        job = HBnBFacade().get_purge_job(job_id)
+        if job is None:
+            return {'error': 'Purge job not found'}, 404
+        return job, 200
@@ -1,5 +1,7 @@
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import HBnBFacade
+from app.api.http_cache import Validator, conditional
+from app.extensions import cache
 from flask_jwt_extended import jwt_required, get_jwt
 
 api = Namespace('amenities', description='Amenity operations')
@@ -19,6 +21,9 @@ def amenity_to_dict(amenity):
         'name': amenity.name
     }
 
+def amenities_validator():
+    return Validator(HBnBFacade().get_amenities_version())
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model, validate=True)
@@ -37,7 +42,10 @@ class AmenityList(Resource):
             return {'error': str(e)}, 400
         return amenity_to_dict(amenity), 201
 
-    @api.marshal_list_with(amenity_output_model)
+    @api.response(200, 'Success', [amenity_output_model])
+    @api.response(304, 'Not modified')
+    @conditional('amenities', amenities_validator)
+    @cache.cached(lambda: ['amenities'])
     def get(self):
         amenities = HBnBFacade().get_all_amenities()
         return [{'id': str(a.id), 'name': a.name} for a in amenities], 200
@@ -1,10 +1,21 @@
+import logging
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from app.services.facade import HBnBFacade, PLACE_RELATIONS
+from app.services.fieldsets import parse_fields, parse_expand
+from app.services.pagination import parse_limit
+from app.api.http_cache import Validator, conditional, latest
+from app.api.loaders import loaders
+from app.api.bulk import parse_bulk_items
+from app.extensions import cache
+from app.api.v1.reviews import place_reviews_page, page_params as review_page_params
+from app.services.tiles import MAX_ZOOM, MAX_TILES_PER_REQUEST, tiles_for_bbox
 from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
 
 
 api = Namespace('places', description='Place operations')
 facade = HBnBFacade()
+logger = logging.getLogger(__name__)
 
 
 # Modèles Swagger / validation
@@ -48,60 +59,138 @@ place_output_model = api.model('PlaceOut', {
     'city_name': fields.String(),
     'owner': fields.Nested(user_model),
     'amenities': fields.List(fields.Nested(amenity_model)),
-    'reviews': fields.List(fields.Nested(review_model))
+    'reviews': fields.List(fields.Nested(review_model)),
+    'review_count': fields.Integer(),
+    'average_rating': fields.Float(),
+    'rating_histogram': fields.Raw()
 })
 
-def place_to_dict(place, details=True):
-    host_name = "Inconnu"
-    if hasattr(place, 'owner') and place.owner:
-        host_name = f"{place.owner.first_name} {place.owner.last_name}".strip()
-
-    data = {
-        'id': str(place.id),
-        'name': place.title,
-        'description': place.description,
-        'price_by_night': place.price,
-        'latitude': place.latitude,
-        'longitude': place.longitude,
-        'owner_id': str(place.owner_id),
-        'host_name': host_name,
-        'city_name': getattr(place, 'city_name', ''),
-    }
-
-    if details:
-        if hasattr(place, 'owner') and place.owner:
-            data['owner'] = {
-                'id': str(place.owner.id),
-                'first_name': place.owner.first_name,
-                'last_name': place.owner.last_name,
-                'email': place.owner.email
+def parse_price(value, name):
+    """Convertit un paramètre de prix optionnel en float"""
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+# Champs exposés -> attributs de Place à charger
+PLACE_FIELDS = {
+    'id': ('id',),
+    'name': ('title',),
+    'description': ('description',),
+    'price_by_night': ('price',),
+    'latitude': ('latitude',),
+    'longitude': ('longitude',),
+    'owner_id': ('owner_id',),
+    'host_name': ('owner_id',),
+    'city_name': (),
+    'review_count': ('review_count',),
+    'average_rating': ('rating_avg', 'review_count'),
+    'rating_histogram': tuple(f'rating_{n}' for n in range(1, 6)),
+}
+
+def place_shape(args, default_expand=()):
+    """Forme de la réponse demandée via ?fields= et ?expand=
+
+    Renvoie (fields, expand, columns, relations) : columns pilote le
+    chargement des lieux, relations liste celles dont dépend la réponse
+    (validateurs HTTP) ; elles sont résolues par les loaders de la requête.
+    """
+    fields = parse_fields(args.get('fields'), PLACE_FIELDS)
+    expand = parse_expand(args.get('expand'), PLACE_RELATIONS, default_expand)
+
+    relations = set(expand)
+    if fields is None or 'host_name' in fields:
+        relations.add('owner')
+
+    columns = None
+    if fields is not None:
+        columns = {column for f in fields for column in PLACE_FIELDS[f]}
+        if 'owner' in relations:
+            columns.add('owner_id')
+    return fields, expand, columns, relations
+
+def place_to_dict(place, fields=None, expand=()):
+    def wanted(field):
+        return fields is None or field in fields
+
+    data = {'id': str(place.id)}
+    if wanted('name'):
+        data['name'] = place.title
+    if wanted('description'):
+        data['description'] = place.description
+    if wanted('price_by_night'):
+        data['price_by_night'] = place.price
+    if wanted('latitude'):
+        data['latitude'] = place.latitude
+    if wanted('longitude'):
+        data['longitude'] = place.longitude
+    if wanted('owner_id'):
+        data['owner_id'] = str(place.owner_id)
+    if wanted('host_name'):
+        owner = loaders().users.load(place.owner_id)
+        data['host_name'] = f"{owner.first_name} {owner.last_name}".strip() if owner else "Inconnu"
+    if wanted('city_name'):
+        data['city_name'] = getattr(place, 'city_name', '')
+    if wanted('review_count'):
+        data['review_count'] = place.review_count
+    if wanted('average_rating'):
+        data['average_rating'] = round(place.rating_avg, 2) if place.review_count else None
+    if wanted('rating_histogram'):
+        data['rating_histogram'] = place.rating_histogram
+
+    if 'owner' in expand:
+        owner = loaders().users.load(place.owner_id)
+        data['owner'] = {
+            'id': str(owner.id),
+            'first_name': owner.first_name,
+            'last_name': owner.last_name,
+            'email': owner.email
+        } if owner else None
+
+    if 'amenities' in expand:
+        data['amenities'] = [
+            {'id': str(amenity.id), 'name': amenity.name}
+            for amenity in loaders().place_amenities.load(place.id) or []
+        ]
+
+    if 'reviews' in expand:
+        data['reviews'] = [
+            {
+                'id': str(r.id),
+                'text': r.text,
+                'rating': r.rating,
+                'user_id': str(r.user_id)
             }
-        else:
-            data['owner'] = None
-
-        if hasattr(place, 'amenities'):
-            data['amenities'] = [
-                {'id': str(pa.amenity.id), 'name': pa.amenity.name}
-                for pa in getattr(place, 'amenities', [])
-                if hasattr(pa, 'amenity') and pa.amenity
-            ]
-        else:
-            data['amenities'] = []
-
-        if hasattr(place, 'reviews'):
-            data['reviews'] = [
-                {
-                    'id': str(r.id),
-                    'text': r.text,
-                    'rating': r.rating,
-                    'user_id': str(r.user_id)
-                }
-                for r in place.reviews
-            ]
-        else:
-            data['reviews'] = []
+            for r in loaders().place_reviews.load(place.id) or []
+        ]
     return data
 
+def places_to_dicts(places, fields=None, expand=()):
+    """Sérialise une liste de lieux, relations résolues par lots (une requête par type)"""
+    batch = loaders()
+    if fields is None or 'host_name' in fields or 'owner' in expand:
+        batch.users.prime(place.owner_id for place in places)
+    if 'amenities' in expand:
+        batch.place_amenities.prime(place.id for place in places)
+    if 'reviews' in expand:
+        batch.place_reviews.prime(place.id for place in places)
+    return [place_to_dict(place, fields, expand) for place in places]
+
+def places_validator():
+    _, _, _, relations = place_shape(request.args)
+    return Validator(facade.get_places_version(relations))
+
+def place_validator(place_id):
+    _, _, _, relations = place_shape(request.args, PLACE_RELATIONS)
+    version = facade.get_place_version(place_id, relations)
+    if version is None:
+        return None
+    # Sans collection embarquée, la date seule suffit (Last-Modified)
+    last_modified = None if relations & {'reviews', 'amenities'} else latest(*version)
+    return Validator(version, last_modified)
+
 @api.route('/')
 class PlaceList(Resource):
     @api.expect(place_model, validate=True)
@@ -110,38 +199,18 @@ class PlaceList(Resource):
     @api.response(403, 'Only owners can create a place')
     @jwt_required()
     def post(self):
-         # ✅ TEST IMMÉDIAT - Ajoutez ces lignes en premier
-        print("🚨 ENDPOINT POST /places/ APPELÉ")
-        print("🚨 TEST DE DEBUG ACTIF")
-        
-        current_user_id = get_jwt_identity()
-        claims = get_jwt()
-        
-        print(f"🚨 USER ID: {current_user_id}")
-        print(f"🚨 CLAIMS: {claims}")
-        
         # ✅ Récupération correcte des informations JWT
         current_user_id = get_jwt_identity()
         claims = get_jwt()
         current_user_role = claims.get('role', 'voyageur')
-        
-        # ✅ DEBUG complet pour traquer le problème
-        print(f"=== DEBUG CREATE PLACE ===")
-        print(f"User ID from JWT: {current_user_id}")
-        print(f"Claims complets: {claims}")
-        print(f"Role dans claims: '{current_user_role}'")
-        print(f"Type du rôle: {type(current_user_role)}")
-        print(f"Est owner? {current_user_role == 'owner'}")
-        print("========================")
-
-        # ✅ Vérification du rôle propriétaire avec debug
+        logger.debug("POST /places/ par %s (rôle %r)", current_user_id, current_user_role)
+
+        # ✅ Vérification du rôle propriétaire
         if current_user_role != "owner":
             error_msg = f'Forbidden: only owners can create places. Current role: {current_user_role}'
-            print(f"❌ {error_msg}")
+            logger.debug("❌ %s", error_msg)
             return {'error': error_msg}, 403
 
-        print(f"✅ Accès autorisé - Utilisateur propriétaire confirmé")
-
         # ✅ Validation des données
         data = api.payload.copy()
         data['owner_id'] = current_user_id
@@ -157,35 +226,204 @@ class PlaceList(Resource):
                 return {'error': 'A place already exists at this location'}, 400
 
         try:
-            print(f"🔧 Tentative de création avec données: {data}")
             place = facade.create_place(data)
-            print(f"✅ Place créée avec succès: {place.to_dict() if hasattr(place, 'to_dict') else place}")
-            return place_to_dict(place, details=False), 201
+            return place_to_dict(place), 201
+        except Exception as e:
+            logger.error("❌ Erreur création place: %s", e)
+            return {'error': str(e)}, 400
+
+    @api.doc(params={
+        'limit': 'Nombre de lieux par page (défaut 20, max 100)',
+        'after': 'Curseur next_cursor renvoyé par la page précédente',
+        'min_price': 'Prix minimum par nuit',
+        'max_price': 'Prix maximum par nuit',
+        'amenity': 'ID d\'amenity (répétable, le lieu doit toutes les avoir)',
+        'owner_id': 'ID du propriétaire',
+        'sort': 'price, -price, rating, -rating ou newest (défaut : plus anciens d\'abord)',
+        'fields': 'Champs à renvoyer, séparés par des virgules (défaut : tous)',
+        'expand': 'Relations à embarquer : owner, amenities, reviews (défaut : aucune)'
+    })
+    @api.response(400, 'Invalid filter, field, expansion, limit or cursor')
+    @api.response(304, 'Not modified')
+    @conditional('places', places_validator)
+    @cache.cached(lambda: ['places'])
+    def get(self):
+        """Récupérer les places filtrées, triées et paginées (curseur)"""
+        try:
+            fields, expand, columns, _ = place_shape(request.args)
+            places, next_cursor = facade.get_places_page(
+                limit=parse_limit(request.args.get('limit')),
+                after=request.args.get('after'),
+                min_price=parse_price(request.args.get('min_price'), 'min_price'),
+                max_price=parse_price(request.args.get('max_price'), 'max_price'),
+                amenity_ids=request.args.getlist('amenity'),
+                owner_id=request.args.get('owner_id'),
+                sort=request.args.get('sort'),
+                columns=columns,
+                relations=()
+            )
+            return {
+                'places': places_to_dicts(places, fields, expand),
+                'next_cursor': next_cursor
+            }, 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            logger.error("❌ Erreur récupération places: %s", e)
+            return {'error': 'Internal server error'}, 500
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.expect([place_model])
+    @api.doc(description="Tableau JSON de lieux, ou NDJSON (Content-Type: application/x-ndjson)")
+    @api.response(201, 'All places created')
+    @api.response(207, 'Some places were rejected, see results')
+    @api.response(400, 'Invalid body')
+    @api.response(403, 'Only owners can create places')
+    @api.response(413, 'Body larger than MAX_CONTENT_LENGTH')
+    @jwt_required()
+    def post(self):
+        """Créer des lieux en masse, avec un résultat par élément"""
+        if get_jwt().get('role') != 'owner':
+            return {'error': 'Forbidden: only owners can create places'}, 403
+        # Hors du try : un corps trop gros doit rester une 413, pas une 500
+        try:
+            items = parse_bulk_items()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        try:
+            results = facade.create_places_bulk(items, get_jwt_identity())
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
-            print(f"❌ Erreur création place: {str(e)}")
+            logger.error("❌ Erreur création en masse: %s", e)
+            return {'error': 'Internal server error'}, 500
+
+        created = sum(1 for r in results if r['status'] == 'created')
+        body = {'created': created, 'failed': len(results) - created, 'results': results}
+        return body, 201 if created == len(results) else 207
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc(params={
+        'q': 'Texte recherché dans le titre et la description',
+        'limit': 'Nombre de résultats par page (défaut 20, max 100)',
+        'after': 'Curseur next_cursor renvoyé par la page précédente',
+        'min_price': 'Prix minimum par nuit',
+        'max_price': 'Prix maximum par nuit',
+        'owner_id': 'ID du propriétaire'
+    })
+    @api.response(400, 'Invalid query, filter, limit or cursor')
+    def get(self):
+        """Recherche plein texte dans les lieux, classée par pertinence"""
+        try:
+            results, next_cursor = facade.search_places(
+                request.args.get('q', ''),
+                limit=parse_limit(request.args.get('limit')),
+                after=request.args.get('after'),
+                min_price=parse_price(request.args.get('min_price'), 'min_price'),
+                max_price=parse_price(request.args.get('max_price'), 'max_price'),
+                owner_id=request.args.get('owner_id')
+            )
+            places = places_to_dicts([place for place, _, _ in results])
+            for data, (_, score, snippet) in zip(places, results):
+                data['score'] = score
+                data['snippet'] = snippet
+            return {'places': places, 'next_cursor': next_cursor}, 200
+        except ValueError as e:
             return {'error': str(e)}, 400
+        except Exception as e:
+            logger.error("❌ Erreur recherche places: %s", e)
+            return {'error': 'Internal server error'}, 500
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.doc(params={
+        'lat': 'Latitude du centre',
+        'lon': 'Longitude du centre',
+        'radius_km': 'Rayon de recherche en km (défaut 10, max 500)',
+        'limit': 'Nombre maximum de lieux (défaut 20, max 100)'
+    })
+    @api.response(400, 'Invalid coordinates, radius or limit')
+    def get(self):
+        """Lieux autour d'un point, triés par distance"""
+        try:
+            lat = float(request.args['lat'])
+            lon = float(request.args['lon'])
+            radius_km = float(request.args.get('radius_km', 10))
+            limit = parse_limit(request.args.get('limit'))
+        except (KeyError, ValueError):
+            return {'error': 'lat and lon are required; lat, lon, radius_km and limit must be numbers'}, 400
+        if not (-90.0 <= lat <= 90.0) or not (-180.0 <= lon <= 180.0):
+            return {'error': 'lat must be in [-90, 90] and lon in [-180, 180]'}, 400
+        if not (0 < radius_km <= 500):
+            return {'error': 'radius_km must be in ]0, 500]'}, 400
 
+        try:
+            results = facade.find_places_nearby(lat, lon, radius_km, limit=limit)
+            places = places_to_dicts([place for place, _ in results])
+            for data, (_, distance) in zip(places, results):
+                data['distance_km'] = round(distance, 3)
+            return places, 200
+        except Exception as e:
+            logger.error("❌ Erreur recherche nearby: %s", e)
+            return {'error': 'Internal server error'}, 500
+
+@api.route('/tiles')
+class PlaceTiles(Resource):
+    @api.doc(params={
+        'bbox': 'min_lon,min_lat,max_lon,max_lat de la zone affichée',
+        'zoom': f'Niveau de zoom de la carte (0 à {MAX_ZOOM})'
+    })
+    @api.response(400, 'Invalid bbox or zoom, or too many tiles')
     def get(self):
-        """Récupérer toutes les places"""
+        """Tuiles de carte : clusters aux zooms faibles, lieux aux zooms forts"""
+        try:
+            min_lon, min_lat, max_lon, max_lat = (float(v) for v in request.args['bbox'].split(','))
+            zoom = int(request.args['zoom'])
+        except (KeyError, ValueError):
+            return {'error': 'bbox (min_lon,min_lat,max_lon,max_lat) and zoom are required'}, 400
+        if not (0 <= zoom <= MAX_ZOOM):
+            return {'error': f'zoom must be between 0 and {MAX_ZOOM}'}, 400
+        if not (-180.0 <= min_lon < max_lon <= 180.0 and -90.0 <= min_lat < max_lat <= 90.0):
+            return {'error': 'Invalid bbox'}, 400
+
+        tiles = tiles_for_bbox(min_lon, min_lat, max_lon, max_lat, zoom)
+        if len(tiles) > MAX_TILES_PER_REQUEST:
+            return {'error': 'Too many tiles for this bbox, zoom out or reduce the bbox'}, 400
+
         try:
-            places = facade.get_all_places()
-            return [place_to_dict(p) for p in places], 200
+            return {
+                'zoom': zoom,
+                'tiles': [facade.get_tile(zoom, x, y) for x, y in tiles]
+            }, 200
         except Exception as e:
-            print(f"❌ Erreur récupération places: {str(e)}")
+            logger.error("❌ Erreur récupération tuiles: %s", e)
             return {'error': 'Internal server error'}, 500
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
-    @api.marshal_with(place_output_model)
+    @api.doc(params={
+        'fields': 'Champs à renvoyer, séparés par des virgules (défaut : tous)',
+        'expand': 'Relations à embarquer : owner, amenities, reviews (défaut : toutes)'
+    })
+    @api.response(200, 'Success', place_output_model)
+    @api.response(400, 'Invalid field or expansion')
+    @api.response(304, 'Not modified')
+    @conditional('place', place_validator)
+    @cache.cached(lambda place_id: [f"place:{place_id}"])
     def get(self, place_id):
         """Récupérer une place par ID"""
         try:
-            place = facade.get_place(place_id)
+            fields, expand, columns, _ = place_shape(request.args, PLACE_RELATIONS)
+            place = facade.get_place(place_id, columns=columns, relations=())
             if not place:
                 return {'error': 'Place not found'}, 404
-            return place_to_dict(place), 200
+            return place_to_dict(place, fields, expand), 200
+        except ValueError as e:
+            return {'error': str(e)}, 400
         except Exception as e:
-            print(f"❌ Erreur récupération place {place_id}: {str(e)}")
+            logger.error("❌ Erreur récupération place %s: %s", place_id, e)
             return {'error': 'Internal server error'}, 500
 
     @api.expect(place_model, validate=True)
@@ -198,11 +436,10 @@ class PlaceResource(Resource):
         is_admin = claims.get('is_admin', False)
         current_user_role = claims.get('role', 'voyageur')
 
-        print(f"=== DEBUG UPDATE PLACE ===")
-        print(f"User ID: {current_user_id}")
-        print(f"Role: {current_user_role}")
-        print(f"Is admin: {is_admin}")
-        print("========================")
+        logger.debug(
+            "PUT /places/%s par %s (rôle %r, admin %s)",
+            place_id, current_user_id, current_user_role, is_admin
+        )
 
         try:
             place = facade.get_place(place_id)
@@ -230,10 +467,10 @@ class PlaceResource(Resource):
             if not updated_place:
                 return {'error': 'Place not found'}, 404
                 
-            return place_to_dict(updated_place), 200
+            return place_to_dict(updated_place, expand=PLACE_RELATIONS), 200
             
         except Exception as e:
-            print(f"❌ Erreur update place: {str(e)}")
+            logger.error("❌ Erreur update place: %s", e)
             return {'error': str(e)}, 400
 
     @jwt_required()
@@ -248,11 +485,10 @@ class PlaceResource(Resource):
         current_user_role = claims.get('role', 'voyageur')
         is_admin = claims.get('is_admin', False)
 
-        print(f"=== DEBUG DELETE PLACE ===")
-        print(f"User ID: {current_user_id}")
-        print(f"Role: {current_user_role}")
-        print(f"Is admin: {is_admin}")
-        print("========================")
+        logger.debug(
+            "DELETE /places/%s par %s (rôle %r, admin %s)",
+            place_id, current_user_id, current_user_role, is_admin
+        )
 
         try:
             place = facade.get_place(place_id)
@@ -269,7 +505,7 @@ class PlaceResource(Resource):
             return {'message': 'Place deleted successfully'}, 200
             
         except Exception as e:
-            print(f"❌ Erreur delete place: {str(e)}")
+            logger.error("❌ Erreur delete place: %s", e)
             return {'error': str(e)}, 500
 
 @api.route('/<place_id>/amenities')
@@ -315,45 +551,19 @@ class PlaceAmenities(Resource):
             return {'message': 'Amenities added successfully'}, 200
             
         except Exception as e:
-            print(f"❌ Erreur ajout amenities: {str(e)}")
+            logger.error("❌ Erreur ajout amenities: %s", e)
             return {'error': str(e)}, 400
 
 @api.route('/<place_id>/reviews/')
 class PlaceReviewsList(Resource):
+    @api.doc(params=review_page_params)
+    @api.response(400, 'Invalid field, expansion, sort, limit or cursor')
     def get(self, place_id):
-        """Récupérer toutes les reviews d'une place"""
+        """Récupérer les avis d'une place, paginés (curseur)"""
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            if reviews is None:
-                return {'error': 'Place not found'}, 404
-
-            # Formatage reviews
-            formatted_reviews = []
-            for review in reviews:
-                review_data = {
-                    'id': str(review.id),
-                    'text': review.text,
-                    'rating': review.rating,
-                    'user_id': str(review.user_id),
-                    'user_name': "Utilisateur inconnu"
-                }
-
-                if hasattr(review, 'user') and review.user:
-                    review_data['user_name'] = f"{review.user.first_name} {review.user.last_name}".strip()
-                else:
-                    try:
-                        user = facade.get_user(str(review.user_id))
-                        if user:
-                            review_data['user_name'] = f"{user.first_name} {user.last_name}".strip()
-                    except:
-                        pass
-                        
-                formatted_reviews.append(review_data)
-
-            return formatted_reviews, 200
-            
+            return place_reviews_page(place_id)
         except Exception as e:
-            print(f"❌ Erreur récupération reviews: {str(e)}")
+            logger.error("❌ Erreur récupération reviews: %s", e)
             return {'error': 'Internal server error'}, 500
 
     @api.expect({'text': fields.String(required=True), 'rating': fields.Integer(required=True)})
@@ -402,5 +612,5 @@ class PlaceReviewsList(Resource):
             return review_response, 201
             
         except Exception as e:
-            print(f"❌ Erreur création review: {str(e)}")
+            logger.error("❌ Erreur création review: %s", e)
             return {'error': str(e)}, 400
@@ -1,5 +1,10 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from app.services.facade import HBnBFacade
+from app.services.facade import HBnBFacade, REVIEW_RELATIONS
+from app.services.fieldsets import parse_fields, parse_expand
+from app.services.pagination import parse_limit
+from app.api.http_cache import Validator, conditional, latest
+from app.api.loaders import loaders
 from flask_jwt_extended import jwt_required, get_jwt
 
 api = Namespace('reviews', description='Review operations')
@@ -20,28 +25,119 @@ review_output_model = api.model('ReviewOut', {
     'place_id': fields.String()
 })
 
-def review_to_dict(review):
-    # Récupération du nom d'utilisateur
-    user_name = "Utilisateur inconnu"
-    if hasattr(review, 'user') and review.user:
-        user_name = f"{review.user.first_name} {review.user.last_name}".strip()
-    elif hasattr(review, 'user_id'):
-        # Si pas de relation directe, essaie de récupérer via facade
-        try:
-            user = HBnBFacade().get_user(str(review.user_id))
-            if user:
-                user_name = f"{user.first_name} {user.last_name}".strip()
-        except:
-            pass
-    
+# Champs exposés -> attribut de Review à charger
+REVIEW_FIELDS = {
+    'id': 'id',
+    'text': 'text',
+    'rating': 'rating',
+    'user_id': 'user_id',
+    'user_name': 'user_id',
+    'place_id': 'place_id',
+}
+
+shape_params = {
+    'fields': 'Champs à renvoyer, séparés par des virgules (défaut : tous)',
+    'expand': 'Relations à embarquer : user, place (défaut : aucune)'
+}
+
+page_params = dict(shape_params, **{
+    'limit': 'Nombre d\'avis par page (défaut 20, max 100)',
+    'after': 'Curseur next_cursor renvoyé par la page précédente',
+    'sort': 'newest (défaut), highest ou lowest'
+})
+
+def review_shape(args, default_expand=()):
+    """Forme de la réponse demandée via ?fields= et ?expand=
+
+    Renvoie (fields, expand, columns, relations) : columns pilote le
+    chargement des avis, les relations sont résolues par les loaders.
+    """
+    fields = parse_fields(args.get('fields'), REVIEW_FIELDS)
+    expand = parse_expand(args.get('expand'), REVIEW_RELATIONS, default_expand)
+
+    relations = set(expand)
+    if fields is None or 'user_name' in fields:
+        relations.add('user')
+
+    columns = None
+    if fields is not None:
+        columns = {REVIEW_FIELDS[f] for f in fields}
+        if 'user' in relations:
+            columns.add('user_id')
+        if 'place' in relations:
+            columns.add('place_id')
+    return fields, expand, columns, relations
+
+def review_to_dict(review, fields=None, expand=()):
+    def wanted(field):
+        return fields is None or field in fields
+
+    data = {'id': str(review.id)}
+    if wanted('text'):
+        data['text'] = review.text
+    if wanted('rating'):
+        data['rating'] = review.rating
+    if wanted('user_id'):
+        data['user_id'] = str(review.user_id)
+    if wanted('user_name'):
+        user = loaders().users.load(review.user_id)
+        data['user_name'] = f"{user.first_name} {user.last_name}".strip() if user else "Utilisateur inconnu"
+    if wanted('place_id'):
+        data['place_id'] = str(review.place_id)
+
+    if 'user' in expand:
+        user = loaders().users.load(review.user_id)
+        data['user'] = {
+            'id': str(user.id),
+            'first_name': user.first_name,
+            'last_name': user.last_name
+        } if user else None
+    if 'place' in expand:
+        place = loaders().places.load(review.place_id)
+        data['place'] = {
+            'id': str(place.id),
+            'name': place.title
+        } if place else None
+    return data
+
+def reviews_to_dicts(reviews, fields=None, expand=()):
+    """Sérialise une liste d'avis, auteurs et lieux résolus par lots"""
+    batch = loaders()
+    if fields is None or 'user_name' in fields or 'user' in expand:
+        batch.users.prime(review.user_id for review in reviews)
+    if 'place' in expand:
+        batch.places.prime(review.place_id for review in reviews)
+    return [review_to_dict(review, fields, expand) for review in reviews]
+
+def place_reviews_page(place_id):
+    """Réponse paginée des avis d'un lieu, avec son total et son histogramme"""
+    try:
+        fields, expand, columns, _ = review_shape(request.args)
+        page = HBnBFacade().get_reviews_page(
+            place_id,
+            limit=parse_limit(request.args.get('limit')),
+            after=request.args.get('after'),
+            sort=request.args.get('sort'),
+            columns=columns
+        )
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    if page is None:
+        return {'error': 'Place not found'}, 404
+    place, reviews, next_cursor = page
     return {
-        'id': str(review.id),
-        'text': review.text,
-        'rating': review.rating,
-        'user_id': str(review.user_id),
-        'user_name': user_name,
-        'place_id': str(review.place_id)
-    }
+        'reviews': reviews_to_dicts(reviews, fields, expand),
+        'next_cursor': next_cursor,
+        'total': place.review_count,
+        'average_rating': round(place.rating_avg, 2) if place.review_count else None,
+        'rating_histogram': place.rating_histogram
+    }, 200
+
+def review_validator(review_id):
+    version = HBnBFacade().get_review_version(review_id)
+    if version is None:
+        return None
+    return Validator(version, latest(*version))
 
 @api.route('/')
 class ReviewList(Resource):
@@ -57,17 +153,31 @@ class ReviewList(Resource):
             return {'error': str(e)}, 400
         return review_to_dict(review), 201
 
+    @api.doc(params=shape_params)
+    @api.response(400, 'Invalid field or expansion')
     def get(self):
-        reviews = HBnBFacade().get_all_reviews()
-        return [review_to_dict(r) for r in reviews], 200
+        try:
+            fields, expand, columns, _ = review_shape(request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        reviews = HBnBFacade().get_all_reviews(columns=columns, relations=())
+        return reviews_to_dicts(reviews, fields, expand), 200
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
+    @api.doc(params=shape_params)
+    @api.response(400, 'Invalid field or expansion')
+    @api.response(304, 'Not modified')
+    @conditional('review', review_validator)
     def get(self, review_id):
-        review = HBnBFacade().get_review(review_id)
+        try:
+            fields, expand, columns, _ = review_shape(request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        review = HBnBFacade().get_review(review_id, columns=columns, relations=())
         if not review:
             return {'error': 'Review not found'}, 404
-        return review_to_dict(review), 200
+        return review_to_dict(review, fields, expand), 200
 
     @api.expect(review_model, validate=True)
     @api.response(403, "Permission denied")
@@ -108,11 +218,11 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews/')
 class PlaceReviewList(Resource):
+    @api.doc(params=page_params)
+    @api.response(400, 'Invalid field, expansion, sort, limit or cursor')
     def get(self, place_id):
-        reviews = HBnBFacade().get_reviews_by_place(place_id)
-        if reviews is None:
-            return {'error': 'Place not found'}, 404
-        return [review_to_dict(r) for r in reviews], 200
+        """Récupérer les avis d'un lieu, paginés (curseur)"""
+        return place_reviews_page(place_id)
     
     @api.expect({'text': fields.String(required=True), 'rating': fields.Integer(required=True)})
     @api.response(201, 'Review created')
@@ -0,0 +1,210 @@
+import os
+import sys
+from contextlib import nullcontext
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.extensions import db
+
+hbnb_cli = AppGroup('hbnb', help="Commandes d'administration HBnB")
+
+
+@hbnb_cli.command('rebuild-spatial-index')
+def rebuild_spatial_index():
+    """Crée la table place_cells si besoin et la remplit depuis places"""
+    from app.services.facade import HBnBFacade
+
+    db.create_all()
+    count = HBnBFacade().rebuild_place_cells()
+    click.echo(f"Index spatial reconstruit : {count} lieux")
+
+
+@hbnb_cli.command('rebuild-search-index')
+def rebuild_search_index():
+    """Crée l'index plein texte places_fts si besoin et le reconstruit"""
+    from app.services.facade import HBnBFacade
+
+    db.create_all()
+    HBnBFacade().rebuild_search_index()
+    click.echo("Index plein texte reconstruit")
+
+
+@hbnb_cli.command('repair-ratings')
+def repair_ratings():
+    """Recalcule review_count, rating_sum, rating_avg et l'histogramme des lieux"""
+    from app.services.facade import HBnBFacade
+
+    HBnBFacade().repair_rating_aggregates()
+    click.echo("Agrégats des notes recalculés")
+
+
+@hbnb_cli.command('diagnostics')
+def diagnostics():
+    """Affiche la configuration de la base : URI, fichier SQLite et tables"""
+    db_uri = current_app.config.get('SQLALCHEMY_DATABASE_URI', '')
+    click.echo(f"📊 SQLALCHEMY_DATABASE_URI: {db_uri}")
+    click.echo(f"📂 Répertoire de l'app: {current_app.instance_path}")
+
+    if db_uri.startswith('sqlite:///'):
+        db_path = db_uri.replace('sqlite:///', '')
+        if not os.path.isabs(db_path):
+            db_path = os.path.join(current_app.instance_path, db_path)
+        click.echo(f"📍 Chemin absolu de la base: {db_path}")
+        click.echo(f"💾 Fichier existe: {os.path.exists(db_path)}")
+        if os.path.exists(db_path):
+            click.echo(f"📏 Taille du fichier: {os.path.getsize(db_path)} bytes")
+
+    try:
+        tables = db.inspect(db.engine).get_table_names()
+        click.echo(f"📋 Tables disponibles: {tables}")
+    except Exception as e:
+        click.echo(f"❌ Erreur récupération tables: {e}", err=True)
+
+    if db.engine.dialect.name == 'sqlite':
+        from app.services.sqlite_pragmas import current_pragmas
+        names = ['journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout']
+        with db.engine.connect() as conn:
+            click.echo(f"⚙️ PRAGMA effectifs: {current_pragmas(conn, names)}")
+        click.echo(f"🏊 Pool: {db.engine.pool.status()}")
+
+    try:
+        from app.services.migrations import migration_status
+        pending = [m['version'] for m in migration_status() if m['applied_at'] is None]
+        click.echo(f"🧱 Migrations en attente: {pending or 'aucune'}")
+    except Exception as e:
+        click.echo(f"❌ Erreur lecture des migrations: {e}", err=True)
+
+
+@hbnb_cli.command('migrate')
+@click.option('--status', is_flag=True, help="Lister les migrations sans rien appliquer")
+@click.option('--to', 'target', type=int, help="Version à atteindre (défaut : la dernière)")
+def migrate(status, target):
+    """Applique les migrations versionnées du schéma (colonnes, index)
+
+    À lancer au déploiement, après db.create_all() pour une base neuve :
+    les étapes déjà présentes sont sautées.
+    """
+    from app.services.migrations import migration_status, upgrade
+
+    if status:
+        for m in migration_status():
+            state = m['applied_at'].isoformat(sep=' ', timespec='seconds') if m['applied_at'] else 'en attente'
+            click.echo(f"{m['version']:>4}  {state:<19}  {m['description']}")
+        return
+    done = upgrade(target)
+    for m in done:
+        click.echo(f"Migration {m['version']} appliquée en {m['duration_ms']:.0f} ms : {m['description']}")
+    if not done:
+        click.echo("Schéma à jour")
+
+
+@hbnb_cli.command('rekey-ids')
+@click.option('--users', is_flag=True, help="Réattribuer aussi les ids des utilisateurs (jetons JWT invalidés)")
+@click.option('--batch-size', type=int, default=None, help="Lignes copiées par requête")
+@click.confirmation_option(prompt="Les identifiants vont changer (URL, références externes). Continuer ?")
+def rekey_ids(users, batch_size):
+    """Réécrit les ids en UUIDv7 et dans le stockage HBNB_ID_STORAGE
+
+    Migration des bases existantes vers des clés ordonnées dans le temps,
+    ou d'un stockage à l'autre (HBNB_ID_STORAGE=binary : 16 octets).
+    """
+    from app.services.migrations import REKEY_BATCH_SIZE, rekey_ids as rekey
+
+    try:
+        report = rekey(users=users, batch_size=batch_size or REKEY_BATCH_SIZE)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for table, rows in report['rows'].items():
+        click.echo(f"{table:<15} {rows:>10} lignes")
+    click.echo(f"Stockage {report['storage']}, terminé en {report['seconds']} s")
+
+
+@hbnb_cli.command('purge-user')
+@click.argument('user_id')
+@click.option('--chunk-size', type=int, default=None, help="Lieux par transaction (défaut : PURGE_CHUNK_SIZE)")
+def purge_user(user_id, chunk_size):
+    """Supprime un utilisateur et son inventaire par lots, au premier plan
+
+    Reprend le job en cours de cet utilisateur s'il en existe un (worker
+    redémarré pendant une purge lancée depuis l'API).
+    """
+    from app.services.purge import run_purge, start_purge
+
+    def progress(job):
+        click.echo(f"  {job.places_deleted}/{job.places_total} lieux, "
+                   f"{job.reviews_deleted}/{job.reviews_total} avis")
+
+    try:
+        job = start_purge(user_id, background=False)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    job = run_purge(job.id, chunk_size, progress)
+    if job.status != 'done':
+        raise click.ClickException(f"Purge {job.id} en échec : {job.error}")
+    click.echo(f"Utilisateur {user_id} supprimé (purge {job.id})")
+
+
+@hbnb_cli.command('export-swagger')
+@click.argument('path', required=False)
+def export_swagger(path):
+    """Pré-génère la spec Swagger (SWAGGER_SPEC_FILE, instance/swagger.json par défaut)
+
+    À lancer au déploiement : les workers relisent le fichier au lieu de
+    reconstruire la spec à leur premier accès à /swagger.json.
+    """
+    from app.api.swagger import export_spec, spec_path
+
+    path = path or spec_path(current_app) or os.path.join(current_app.instance_path, 'swagger.json')
+    schema = export_spec(current_app.extensions['hbnb_api'], path)
+    click.echo(f"Spec Swagger écrite : {path} ({len(schema.get('paths', {}))} chemins)")
+
+
+@hbnb_cli.command('import')
+@click.argument('kind', type=click.Choice(['users', 'amenities', 'places', 'reviews']))
+@click.argument('path', type=click.Path(allow_dash=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']),
+              help="Format du fichier (déduit de l'extension .csv, .ndjson ou .jsonl)")
+@click.option('--batch-size', default=10000, show_default=True, help="Lignes par executemany")
+@click.option('--transaction-rows', default=200000, show_default=True, help="Lignes par transaction")
+@click.option('--workers', type=int, help="Processus de hachage des mots de passe (défaut : nombre de CPU)")
+@click.option('--hash-method', help="Méthode werkzeug de hachage (défaut : celle de l'application)")
+@click.option('--defer-indexes/--keep-indexes', default=True, show_default=True,
+              help="Reconstruire les index secondaires après le chargement")
+def import_data(kind, path, fmt, batch_size, transaction_rows, workers, hash_method, defer_indexes):
+    """Importe en masse des users, amenities, places ou reviews (CSV ou NDJSON)
+
+    \b
+    users     : first_name, last_name, email, password (ou password_hash), is_admin
+    amenities : name
+    places    : title, description, price, latitude, longitude, owner_email,
+                amenities (noms ; liste JSON ou 'Wi-Fi|Parking' en CSV)
+    reviews   : text, rating, user_email, place_id (ou place_owner_email + place_title)
+    Colonnes facultatives : id, created_at (ISO 8601). Importer dans l'ordre
+    users, amenities, places puis reviews.
+    """
+    from app.services.importer import BulkImporter, detect_format, read_rows
+
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.UsageError("Format inconnu : préciser --format csv|ndjson")
+    importer = BulkImporter(
+        batch_size=batch_size,
+        transaction_rows=transaction_rows,
+        workers=workers,
+        hash_method=hash_method,
+        defer_indexes=defer_indexes,
+    )
+    db.create_all()
+    stream = nullcontext(sys.stdin) if path == '-' else open(path, encoding='utf-8', newline='')
+    with stream as stream:
+        report = importer.run(kind, read_rows(stream, fmt))
+
+    rate = report.read / report.seconds if report.seconds else 0
+    click.echo(
+        f"{kind} : {report.imported} importés, {report.skipped} déjà présents, "
+        f"{report.rejected} rejetés en {report.seconds:.1f}s ({rate:.0f} lignes/s)"
+    )
+    for line, error in sorted(report.errors):
+        click.echo(f"  ligne {line} : {error}", err=True)
+    if report.rejected > len(report.errors):
+        click.echo(f"  ... et {report.rejected - len(report.errors)} autres", err=True)
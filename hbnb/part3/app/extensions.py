@@ -1,5 +1,19 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from app.services.cache import ResponseCache
+from app.services.query_stats import QueryStats
+from app.services.metrics import Metrics
+from app.services.profiling import Profiler
+from app.services.slow_queries import SlowQueryLog
+from app.services.sqlite_pragmas import SqlitePragmas
+from app.services.write_queue import BatchSession, WriteQueue
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': BatchSession})
+sqlite_pragmas = SqlitePragmas()
 jwt = JWTManager()
+cache = ResponseCache()
+query_stats = QueryStats()
+metrics = Metrics()
+profiler = Profiler()
+slow_queries = SlowQueryLog()
+write_queue = WriteQueue()
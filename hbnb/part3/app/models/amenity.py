@@ -1,11 +1,11 @@
-import uuid
 from app.extensions import db
+from app.services.ids import Id, new_id
 from app.models.base_model import BaseModel
 
 class Amenity(BaseModel, db.Model):
     __tablename__ = 'amenities'
 
-    id = db.Column(db.String(60), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     name = db.Column(db.String(50), nullable=False, unique=True)
 
     # Relation vers PlaceAmenity
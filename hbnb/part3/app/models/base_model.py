@@ -1,11 +1,11 @@
-import uuid
 from datetime import datetime
 from app.extensions import db  # ou `from app import db` selon ton architecture
+from app.services.ids import Id, new_id
 
 class BaseModel(db.Model):
     __abstract__ = True
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
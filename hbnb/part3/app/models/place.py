@@ -1,17 +1,38 @@
-import uuid
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Session
 from app.extensions import db
+from app.services.ids import Id, new_id
 from app.models.base_model import BaseModel
+from app.services.geo import CELLS_PER_QUERY, cell_of
 
 class Place(BaseModel, db.Model):
     __tablename__ = 'places'
+    __table_args__ = (
+        # Clé de tri stable de la pagination par curseur
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        # Filtres et tris de la liste des lieux
+        db.Index('ix_places_price_id', 'price', 'id'),
+        db.Index('ix_places_owner_id_created_at', 'owner_id', 'created_at'),
+        db.Index('ix_places_rating_avg_id', 'rating_avg', 'id'),
+    )
 
-    id = db.Column(db.String(60), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(Id, db.ForeignKey('users.id'), nullable=False)
+
+    # Agrégats des avis, tenus à jour par HBnBFacade (voir rating_delta)
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_avg = db.Column(db.Float, nullable=False, default=0.0, server_default='0')
+    rating_1 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_2 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_3 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_4 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_5 = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relations
     reviews = db.relationship(
@@ -28,6 +49,15 @@ class Place(BaseModel, db.Model):
         lazy="select"
     )
 
+    # Entrée de l'index spatial (grille), tenue à jour par sync_place_cells
+    cell = db.relationship(
+        'PlaceCell',
+        back_populates='place',
+        uselist=False,
+        cascade="all, delete-orphan",
+        lazy="select"
+    )
+
     @staticmethod
     def validate_data(data):
         if not data.get('title') or len(data['title']) > 100:
@@ -41,14 +71,124 @@ class Place(BaseModel, db.Model):
         if not data.get('owner_id'):
             raise ValueError("Owner (owner_id) is required")
 
+    @property
+    def rating_histogram(self):
+        """Nombre d'avis par note, de 1 à 5 étoiles"""
+        return {str(n): getattr(self, f'rating_{n}') for n in range(1, 6)}
+
+    @classmethod
+    def rating_delta(cls, rating, delta):
+        """Valeurs SQL d'un UPDATE ajoutant (delta=1) ou retirant (delta=-1) une note
+
+        Les expressions s'appuient sur les valeurs de la ligne : deux avis
+        concurrents ne peuvent pas s'écraser mutuellement.
+        """
+        rating = int(rating)
+        count = cls.review_count + delta
+        total = cls.rating_sum + delta * rating
+        histogram = getattr(cls, f'rating_{rating}')
+        return {
+            'review_count': count,
+            'rating_sum': total,
+            f'rating_{rating}': histogram + delta,
+            'rating_avg': db.case((count > 0, db.cast(total, db.Float) / count), else_=0.0),
+        }
+
+    def sync_cell(self):
+        """Recalcule la cellule de grille à partir de latitude/longitude"""
+        cell_lat, cell_lon = cell_of(self.latitude, self.longitude)
+        if self.cell is None:
+            self.cell = PlaceCell(cell_lat=cell_lat, cell_lon=cell_lon)
+        else:
+            self.cell.cell_lat = cell_lat
+            self.cell.cell_lon = cell_lon
+
     def __repr__(self):
         return f"<Place {self.title} - {self.latitude}, {self.longitude}>"
 
 class PlaceAmenity(db.Model):
     __tablename__ = 'place_amenity'
 
-    place_id = db.Column(db.String(60), db.ForeignKey('places.id'), primary_key=True)
-    amenity_id = db.Column(db.String(60), db.ForeignKey('amenities.id'), primary_key=True)
+    place_id = db.Column(Id, db.ForeignKey('places.id'), primary_key=True)
+    amenity_id = db.Column(Id, db.ForeignKey('amenities.id'), primary_key=True, index=True)
 
     place = db.relationship('Place', back_populates='amenities')
     amenity = db.relationship('Amenity', back_populates='places')
+
+class PlaceCell(db.Model):
+    """Index spatial : cellule de grille de chaque lieu (voir app/services/geo.py)"""
+    __tablename__ = 'place_cells'
+    __table_args__ = (
+        db.Index('ix_place_cells_cell', 'cell_lat', 'cell_lon', 'place_id'),
+    )
+
+    place_id = db.Column(Id, db.ForeignKey('places.id'), primary_key=True)
+    cell_lat = db.Column(db.Integer, nullable=False)
+    cell_lon = db.Column(db.Integer, nullable=False)
+
+    place = db.relationship('Place', back_populates='cell')
+
+    @staticmethod
+    def locations_in(connection, cells):
+        """Coordonnées des lieux déjà en base dans ces cellules : {cellule: [(lat, lon), ...]}
+
+        connection est une Connection ou la session : la transaction en cours est vue.
+        """
+        cells = list(cells)
+        taken = {}
+        for start in range(0, len(cells), CELLS_PER_QUERY):
+            rows = connection.execute(db.select(
+                PlaceCell.cell_lat, PlaceCell.cell_lon, Place.latitude, Place.longitude
+            ).join(Place, Place.id == PlaceCell.place_id).where(
+                db.tuple_(PlaceCell.cell_lat, PlaceCell.cell_lon).in_(cells[start:start + CELLS_PER_QUERY])
+            ))
+            for cell_lat, cell_lon, latitude, longitude in rows:
+                taken.setdefault((cell_lat, cell_lon), []).append((latitude, longitude))
+        return taken
+
+
+@event.listens_for(Session, 'before_flush')
+def sync_place_cells(session, flush_context, instances):
+    """Garde place_cells synchronisée avec les coordonnées des lieux"""
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Place) or obj in session.deleted:
+            continue
+        if obj.latitude is None or obj.longitude is None:
+            continue
+        state = db.inspect(obj)
+        moved = (
+            state.attrs.latitude.history.has_changes()
+            or state.attrs.longitude.history.has_changes()
+        )
+        if obj in session.new or moved:
+            obj.sync_cell()
+
+
+# Index plein texte FTS5 (SQLite) sur title/description, en contenu externe :
+# places_fts ne stocke que l'index, les triggers le tiennent à jour.
+# Le rowid de places n'étant pas un alias de clé primaire, un VACUUM peut le
+# renuméroter : relancer alors `flask hbnb rebuild-search-index`.
+PLACES_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+        title, description,
+        content='places', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_au AFTER UPDATE OF title, description ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO places_fts(rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END""",
+]
+
+for _statement in PLACES_FTS_DDL:
+    event.listen(Place.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
@@ -0,0 +1,40 @@
+from app.extensions import db
+from app.services.ids import Id
+from app.models.base_model import BaseModel
+
+class PurgeJob(BaseModel, db.Model):
+    """Suppression par lots d'un utilisateur et de son inventaire (voir app/services/purge.py)
+
+    L'état est en base : n'importe quel worker peut en suivre la progression.
+    """
+    __tablename__ = 'purge_jobs'
+
+    STATUSES = ('pending', 'running', 'done', 'failed')
+
+    # Pas de clé étrangère : la ligne survit à l'utilisateur supprimé
+    user_id = db.Column(Id, nullable=False, index=True)
+    status = db.Column(db.String(10), nullable=False, default='pending')
+    places_total = db.Column(db.Integer, nullable=False, default=0)
+    reviews_total = db.Column(db.Integer, nullable=False, default=0)
+    places_deleted = db.Column(db.Integer, nullable=False, default=0)
+    reviews_deleted = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        done = self.places_deleted + self.reviews_deleted
+        total = self.places_total + self.reviews_total
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'status': self.status,
+            'places_total': self.places_total,
+            'places_deleted': self.places_deleted,
+            'reviews_total': self.reviews_total,
+            'reviews_deleted': self.reviews_deleted,
+            'progress': round(done / total, 3) if total else (1.0 if self.status == 'done' else 0.0),
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -1,15 +1,22 @@
-import uuid
 from app.extensions import db
+from app.services.ids import Id, new_id
 from app.models.base_model import BaseModel
 
 class Review(BaseModel, db.Model):
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # Clés de tri de la pagination des avis d'un lieu
+        db.Index('ix_reviews_place_id_created_at_id', 'place_id', 'created_at', 'id'),
+        db.Index('ix_reviews_place_id_rating_created_at', 'place_id', 'rating', 'created_at', 'id'),
+        # Avis d'un auteur (profil, suppression d'un utilisateur)
+        db.Index('ix_reviews_user_id_created_at', 'user_id', 'created_at'),
+    )
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    place_id = db.Column(db.String(36), db.ForeignKey('places.id'), nullable=False)
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    place_id = db.Column(Id, db.ForeignKey('places.id'), nullable=False)
+    user_id = db.Column(Id, db.ForeignKey('users.id'), nullable=False)
 
     # Relations
     place = db.relationship('Place', back_populates='reviews', lazy="select")
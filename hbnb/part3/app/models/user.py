@@ -1,13 +1,13 @@
-import uuid
 import re
 from app.extensions import db
+from app.services.ids import Id, new_id
 from werkzeug.security import generate_password_hash, check_password_hash
 from app.models.base_model import BaseModel
 
 class User(BaseModel, db.Model):
     __tablename__ = 'users'
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(Id, primary_key=True, default=new_id)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
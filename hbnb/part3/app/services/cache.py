@@ -0,0 +1,170 @@
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from flask import request
+from app.services.write_queue import after_commit
+
+
+class CacheBackend(ABC):
+    """Interface d'un stockage clé/valeur du cache (mémoire, Redis...)"""
+
+    @abstractmethod
+    def get(self, key):
+        pass
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        pass
+
+    @abstractmethod
+    def delete(self, *keys):
+        pass
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    @abstractmethod
+    def stats(self):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """LRU en mémoire du processus, avec expiration (TTL) par entrée"""
+
+    def __init__(self, max_entries=10000, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._counters['expirations'] += 1
+                self._counters['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                if self._entries.pop(key, None) is not None:
+                    self._counters['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), max_entries=self.max_entries)
+
+
+class NullCache(CacheBackend):
+    """Backend désactivé : rien n'est jamais mis en cache"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {}
+
+
+CACHE_BACKENDS = {
+    'memory': MemoryCache,
+    'null': NullCache,
+}
+
+
+class ResponseCache:
+    """Cache des réponses GET, invalidé par clés de ressource
+
+    Une réponse dépend de clés de ressource ('places', 'place:<id>',
+    'amenities'...). Chaque clé a une génération stockée dans le backend ;
+    les réponses sont rangées sous ces générations. Invalider une clé
+    supprime uniquement sa génération : les variantes (query strings)
+    associées deviennent orphelines et sortent par LRU/TTL, et une réponse
+    calculée avant l'invalidation ne peut plus être servie.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullCache()
+        self.ttl = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('CACHE_ENABLED', False):
+            self.backend = NullCache()
+            return
+        backend = app.config.get('CACHE_BACKEND', 'memory')
+        backend_class = CACHE_BACKENDS[backend] if isinstance(backend, str) else backend
+        self.ttl = app.config.get('CACHE_DEFAULT_TTL', 60)
+        self.backend = backend_class(**app.config.get('CACHE_BACKEND_OPTIONS', {}))
+
+    def _generation(self, key):
+        gen_key = f"gen:{key}"
+        generation = self.backend.get(gen_key)
+        if generation is None:
+            generation = uuid.uuid4().hex[:12]
+            self.backend.set(gen_key, generation, ttl=0)
+        return generation
+
+    def invalidate(self, *keys):
+        """Publie les clés de ressource modifiées par une écriture (après son commit)"""
+        after_commit(self.backend.delete, *(f"gen:{key}" for key in keys))
+
+    def cached(self, keys):
+        """Décorateur de GET : met en cache les réponses 200 selon keys(*args)"""
+        def decorator(method):
+            @wraps(method)
+            def wrapper(resource, *args, **kwargs):
+                if isinstance(self.backend, NullCache):
+                    return method(resource, *args, **kwargs)
+                resource_keys = keys(*args, **kwargs)
+                generations = ','.join(f"{k}@{self._generation(k)}" for k in resource_keys)
+                variant = f"resp:{generations}:{request.full_path}"
+                body = self.backend.get(variant)
+                if body is not None:
+                    return body, 200
+                result = method(resource, *args, **kwargs)
+                if isinstance(result, tuple) and len(result) == 2 and result[1] == 200:
+                    self.backend.set(variant, result[0], ttl=self.ttl)
+                return result
+            return wrapper
+        return decorator
+
+    def stats(self):
+        return self.backend.stats()
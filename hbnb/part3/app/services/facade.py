@@ -1,22 +1,64 @@
-from app.extensions import db
+from app.extensions import db, cache, profiler, slow_queries
 from app.models.user import User
-from app.models.place import Place, PlaceAmenity
+from app.models.place import Place, PlaceAmenity, PlaceCell, PLACES_FTS_DDL
 from app.models.amenity import Amenity
 from app.models.review import Review
+from app.models.purge_job import PurgeJob
+from app.services.pagination import DEFAULT_LIMIT, encode_cursor, decode_cursor
+from app.services.slow_queries import SLOW_QUERY_SORTS
+from app.services.write_queue import queued
+from app.services.ids import Id, new_id
+from app.services.geo import (
+    CELL_SIZE_DEG, SAME_LOCATION_DELTA, cell_of, cells_around, location_taken, bounding_box, haversine_km
+)
+from app.services.search import (
+    HIGHLIGHT_OPEN, HIGHLIGHT_CLOSE, SNIPPET_TOKENS, TITLE_WEIGHT, DESCRIPTION_WEIGHT, to_fts_query
+)
+from app.services.tiles import (
+    CLUSTER_MAX_ZOOM, CLUSTERS_PER_TILE_SIDE, MAX_PLACES_PER_TILE, tile_bounds, tile_cache
+)
 from werkzeug.security import generate_password_hash
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from datetime import datetime
 import logging
 
-# Configuration du logging pour debug
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Tris disponibles pour la liste des lieux : clé -> (colonne, décroissant)
+PLACE_SORTS = {
+    None: (Place.created_at, False),
+    'newest': (Place.created_at, True),
+    'price': (Place.price, False),
+    '-price': (Place.price, True),
+    'rating': (Place.rating_avg, False),
+    '-rating': (Place.rating_avg, True),
+}
+
+# Tris des avis d'un lieu : clé -> (colonnes avant l'id, décroissant)
+REVIEW_SORTS = {
+    None: ((Review.created_at,), True),
+    'newest': ((Review.created_at,), True),
+    'highest': ((Review.rating, Review.created_at), True),
+    'lowest': ((Review.rating, Review.created_at), False),
+}
+
+# Relations qu'un lieu / un avis peut embarquer dans sa réponse
+PLACE_RELATIONS = ('owner', 'amenities', 'reviews')
+REVIEW_RELATIONS = ('user', 'place')
+
+# Création en masse : lieux par transaction, cellules par requête de sonde
+BULK_CHUNK_SIZE = 5000
+
+# Suppressions : au-delà, tout le cache de tuiles est vidé plutôt que point par point
+TILE_INVALIDATE_MAX_POINTS = 1000
+
 
 class HBnBFacade:
 
     # ---------- USER ----------
     def create_user(self, data):
         """Création d'utilisateur avec gestion complète des rôles"""
-        logger.info(f"🔧 Création utilisateur: {data.get('email', 'Unknown')}")
+        logger.info("🔧 Création utilisateur: %s", data.get('email', 'Unknown'))
         
         try:
             # ✅ Validation des données avec username et role
@@ -46,11 +88,11 @@ class HBnBFacade:
             db.session.add(user)
             db.session.commit()
             
-            logger.info(f"✅ Utilisateur créé: {user.email} - Rôle: {user.role}")
+            logger.info("✅ Utilisateur créé: %s - Rôle: %s", user.email, user.role)
             return user
             
         except Exception as e:
-            logger.error(f"❌ Erreur création utilisateur: {str(e)}")
+            logger.error("❌ Erreur création utilisateur: %s", e)
             db.session.rollback()
             raise e
 
@@ -59,7 +101,7 @@ class HBnBFacade:
         try:
             return db.session.get(User, user_id)
         except Exception as e:
-            logger.error(f"❌ Erreur récupération user {user_id}: {str(e)}")
+            logger.error("❌ Erreur récupération user %s: %s", user_id, e)
             return None
 
     def get_user_by_email(self, email):
@@ -69,7 +111,7 @@ class HBnBFacade:
                 return None
             return User.query.filter_by(email=email.lower().strip()).first()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération user par email: {str(e)}")
+            logger.error("❌ Erreur récupération user par email: %s", e)
             return None
 
     def get_user_by_username(self, username):
@@ -79,7 +121,7 @@ class HBnBFacade:
                 return None
             return User.query.filter_by(username=username.strip()).first()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération user par username: {str(e)}")
+            logger.error("❌ Erreur récupération user par username: %s", e)
             return None
 
     def get_user_by_credentials(self, identifier):
@@ -96,7 +138,7 @@ class HBnBFacade:
             
             return user
         except Exception as e:
-            logger.error(f"❌ Erreur récupération credentials: {str(e)}")
+            logger.error("❌ Erreur récupération credentials: %s", e)
             return None
 
     def get_all_users(self):
@@ -104,9 +146,10 @@ class HBnBFacade:
         try:
             return User.query.all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération users: {str(e)}")
+            logger.error("❌ Erreur récupération users: %s", e)
             return []
 
+    @queued
     def update_user(self, user_id, data):
         """Mise à jour d'un utilisateur avec gestion du rôle"""
         try:
@@ -136,42 +179,100 @@ class HBnBFacade:
                 user.set_password(data['password'])
                 
             db.session.commit()
-            logger.info(f"✅ Utilisateur {user_id} mis à jour")
+            # Le nom du propriétaire apparaît dans ses lieux (host_name, owner)
+            cache.invalidate('places', *self._place_keys(Place.owner_id == user_id))
+            logger.info("✅ Utilisateur %s mis à jour", user_id)
             return user
             
         except Exception as e:
-            logger.error(f"❌ Erreur update user: {str(e)}")
+            logger.error("❌ Erreur update user: %s", e)
             db.session.rollback()
             raise e
 
     def delete_user(self, user_id):
-        """Supprimer un utilisateur (avec ses lieux et avis)"""
+        """Supprimer un utilisateur avec ses lieux et avis, en une transaction
+
+        Nombre fixe de DELETE ... WHERE ... IN (sous-requête), quelle que soit
+        la taille de l'inventaire ; pour un très gros inventaire, la purge
+        par lots (app/services/purge.py) vide d'abord les lieux.
+        """
         try:
-            user = self.get_user(user_id)
-            if not user:
+            if not db.session.query(db.exists().where(User.id == user_id)).scalar():
                 raise ValueError("User not found")
-            
-            # Supprimer les lieux de l'utilisateur (et leurs relations)
-            user_places = Place.query.filter_by(owner_id=user_id).all()
-            for place in user_places:
-                self.delete_place(place.id)
-            
-            # Supprimer les avis de l'utilisateur
-            Review.query.filter_by(user_id=user_id).delete()
-            
-            # Supprimer l'utilisateur
-            db.session.delete(user)
+            owned = db.select(Place.id).where(Place.owner_id == user_id)
+            reviewed = db.select(Review.place_id).where(Review.user_id == user_id).distinct()
+            keys = self._place_keys(Place.id.in_(owned)) + self._place_keys(Place.id.in_(reviewed))
+            locations = db.session.query(Place.latitude, Place.longitude).filter(Place.owner_id == user_id).all()
+            reviewed_ids = [place_id for (place_id,) in db.session.execute(reviewed)]
+
+            # Lieux de l'utilisateur et leurs dépendances, puis ses avis ailleurs
+            self._delete_places(owned)
+            db.session.execute(db.delete(Review).where(Review.user_id == user_id)
+                               .execution_options(synchronize_session=False))
+            self._recompute_ratings(reviewed_ids)
+            db.session.execute(db.delete(User).where(User.id == user_id)
+                               .execution_options(synchronize_session=False))
             db.session.commit()
-            
-            logger.info(f"✅ Utilisateur {user_id} supprimé")
+            self._invalidate_locations(locations)
+            cache.invalidate('places', *keys)
+
+            logger.info("✅ Utilisateur %s supprimé", user_id)
             return True
-            
+
         except Exception as e:
-            logger.error(f"❌ Erreur delete user: {str(e)}")
+            logger.error("❌ Erreur delete user: %s", e)
+            db.session.rollback()
+            raise e
+
+    def get_user_inventory(self, user_id):
+        """Lignes à supprimer avec un utilisateur ({'places', 'reviews'}), None s'il n'existe pas"""
+        if not db.session.query(db.exists().where(User.id == user_id)).scalar():
+            return None
+        owned = db.select(Place.id).where(Place.owner_id == user_id)
+        return {
+            'places': db.session.scalar(db.select(db.func.count()).select_from(owned.subquery())),
+            'reviews': db.session.scalar(db.select(db.func.count()).select_from(Review).where(
+                db.or_(Review.place_id.in_(owned), Review.user_id == user_id))),
+        }
+
+    def purge_user_step(self, user_id, chunk_size):
+        """Une transaction de la purge par lots d'un utilisateur
+
+        Supprime jusqu'à chunk_size de ses lieux (avec leurs dépendances),
+        sinon ses avis sur jusqu'à chunk_size lieux. Renvoie les lignes
+        supprimées ({'places', 'reviews'}) ou None s'il ne reste que
+        l'utilisateur, à supprimer ensuite par delete_user.
+        """
+        try:
+            place_ids = [place_id for (place_id,) in db.session.execute(
+                db.select(Place.id).where(Place.owner_id == user_id).limit(chunk_size))]
+            if place_ids:
+                keys = [f"place:{place_id}" for place_id in place_ids]
+                locations = db.session.query(Place.latitude, Place.longitude).filter(Place.id.in_(place_ids)).all()
+                deleted = self._delete_places(place_ids)
+            else:
+                place_ids = [place_id for (place_id,) in db.session.execute(
+                    db.select(Review.place_id).where(Review.user_id == user_id).distinct().limit(chunk_size))]
+                if not place_ids:
+                    return None
+                keys, locations = [f"place:{place_id}" for place_id in place_ids], []
+                result = db.session.execute(
+                    db.delete(Review).where(Review.user_id == user_id, Review.place_id.in_(place_ids))
+                    .execution_options(synchronize_session=False))
+                self._recompute_ratings(place_ids)
+                deleted = {'places': 0, 'reviews': result.rowcount}
+            db.session.commit()
+            self._invalidate_locations(locations)
+            cache.invalidate('places', *keys)
+            return deleted
+
+        except Exception as e:
+            logger.error("❌ Erreur purge user: %s", e)
             db.session.rollback()
             raise e
 
     # ---------- AMENITY ----------
+    @queued
     def create_amenity(self, data):
         """Création d'une amenité"""
         try:
@@ -182,12 +283,13 @@ class HBnBFacade:
             amenity = Amenity(name=data['name'])
             db.session.add(amenity)
             db.session.commit()
+            cache.invalidate('amenities')
             
-            logger.info(f"✅ Amenity créée: {amenity.name}")
+            logger.info("✅ Amenity créée: %s", amenity.name)
             return amenity
             
         except Exception as e:
-            logger.error(f"❌ Erreur création amenity: {str(e)}")
+            logger.error("❌ Erreur création amenity: %s", e)
             db.session.rollback()
             raise e
 
@@ -196,7 +298,7 @@ class HBnBFacade:
         try:
             return db.session.get(Amenity, amenity_id)
         except Exception as e:
-            logger.error(f"❌ Erreur récupération amenity: {str(e)}")
+            logger.error("❌ Erreur récupération amenity: %s", e)
             return None
 
     def get_all_amenities(self):
@@ -204,9 +306,10 @@ class HBnBFacade:
         try:
             return Amenity.query.all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération amenities: {str(e)}")
+            logger.error("❌ Erreur récupération amenities: %s", e)
             return []
 
+    @queued
     def update_amenity(self, amenity_id, data):
         """Mise à jour d'une amenité"""
         try:
@@ -225,10 +328,12 @@ class HBnBFacade:
                 amenity.name = data['name']
                 
             db.session.commit()
+            cache.invalidate('amenities', 'places', *self._place_keys(Place.id.in_(
+                db.select(PlaceAmenity.place_id).where(PlaceAmenity.amenity_id == amenity_id))))
             return amenity
             
         except Exception as e:
-            logger.error(f"❌ Erreur update amenity: {str(e)}")
+            logger.error("❌ Erreur update amenity: %s", e)
             db.session.rollback()
             raise e
 
@@ -238,6 +343,8 @@ class HBnBFacade:
             amenity = self.get_amenity(amenity_id)
             if not amenity:
                 raise ValueError("Amenity not found")
+            linked = self._place_keys(Place.id.in_(
+                db.select(PlaceAmenity.place_id).where(PlaceAmenity.amenity_id == amenity_id)))
             
             # Supprimer les relations avec les lieux
             PlaceAmenity.query.filter_by(amenity_id=amenity_id).delete()
@@ -245,19 +352,20 @@ class HBnBFacade:
             # Supprimer l'équipement
             db.session.delete(amenity)
             db.session.commit()
+            cache.invalidate('amenities', 'places', *linked)
             
-            logger.info(f"✅ Amenity {amenity_id} supprimée")
+            logger.info("✅ Amenity %s supprimée", amenity_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Erreur delete amenity: {str(e)}")
+            logger.error("❌ Erreur delete amenity: %s", e)
             db.session.rollback()
             raise e
 
     # ---------- PLACE ----------
     def create_place(self, data):
         """Création d'un lieu avec validation du rôle propriétaire"""
-        logger.info(f"🔧 Création place: {data.get('title', 'Unknown')}")
+        logger.info("🔧 Création place: %s", data.get('title', 'Unknown'))
         
         try:
             Place.validate_data(data)
@@ -304,21 +412,162 @@ class HBnBFacade:
                 db.session.add(pa)
                 
             db.session.commit()
+            tile_cache.invalidate_point(place.latitude, place.longitude)
+            cache.invalidate('places')
             
-            logger.info(f"✅ Place créée: {place.title} par {owner.email}")
+            logger.info("✅ Place créée: %s par %s", place.title, owner.email)
             return place
             
         except Exception as e:
-            logger.error(f"❌ Erreur création place: {str(e)}")
+            logger.error("❌ Erreur création place: %s", e)
             db.session.rollback()
             raise e
 
-    def get_place(self, place_id):
-        """Récupération d'un lieu par ID"""
+    def create_places_bulk(self, items, owner_id, chunk_size=BULK_CHUNK_SIZE, delta=SAME_LOCATION_DELTA):
+        """Création en masse de lieux pour un propriétaire
+
+        items : liste de dicts au format de create_place (None pour une ligne
+        illisible). Les amenities sont validées par une seule requête IN, les
+        emplacements déjà pris par une sonde de place_cells, puis les lieux,
+        cellules et liens PlaceAmenity sont insérés par executemany, en
+        transactions de chunk_size lieux. Renvoie un résultat par élément.
+        """
+        logger.info("🔧 Création en masse: %s places", len(items))
+
+        owner = db.session.get(User, owner_id)
+        if not owner:
+            raise ValueError(f"Owner not found: {owner_id}")
+        if getattr(owner, 'role', None) != 'owner':
+            raise ValueError(f"User must have 'owner' role to create places. Current role: {getattr(owner, 'role', 'undefined')}")
+
+        referenced = {
+            amenity_id
+            for item in items if isinstance(item, dict) and isinstance(item.get('amenities'), list)
+            for amenity_id in item['amenities'] if isinstance(amenity_id, str)
+        }
+        known = set(db.session.scalars(
+            db.select(Amenity.id).where(Amenity.id.in_(referenced))
+        )) if referenced else set()
+
+        results = [None] * len(items)
+        pending = []
+        now = datetime.utcnow()
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Invalid item: a JSON object is expected")
+                data = dict(item, owner_id=owner.id)
+                Place.validate_data(data)
+                amenity_ids = data.get('amenities') or []
+                if not isinstance(amenity_ids, list):
+                    raise ValueError("amenities must be a list of IDs")
+                for amenity_id in amenity_ids:
+                    if not amenity_id:
+                        raise ValueError("Amenity ID cannot be empty")
+                    if amenity_id not in known:
+                        raise ValueError(f"Amenity not found: {amenity_id}")
+                pending.append((index, {
+                    'id': new_id(),
+                    'title': data['title'],
+                    'description': data.get('description', ''),
+                    'price': float(data['price']),
+                    'latitude': float(data['latitude']),
+                    'longitude': float(data['longitude']),
+                    'owner_id': owner.id,
+                    'created_at': now,
+                    'updated_at': now,
+                }, list(dict.fromkeys(amenity_ids))))
+            except (ValueError, TypeError) as e:
+                results[index] = {'index': index, 'status': 'error', 'error': str(e)}
+
+        # Unicité de l'emplacement, contre la base puis à l'intérieur du lot
+        taken = PlaceCell.locations_in(db.session, {
+            cell for _, row, _ in pending for cell in cells_around(row['latitude'], row['longitude'], delta)
+        })
+        accepted = []
+        for index, row, amenity_ids in pending:
+            latitude, longitude = row['latitude'], row['longitude']
+            if location_taken(taken, latitude, longitude, delta):
+                results[index] = {'index': index, 'status': 'error',
+                                  'error': 'A place already exists at this location'}
+                continue
+            cell = cell_of(latitude, longitude)
+            taken.setdefault(cell, []).append((latitude, longitude))
+            accepted.append((index, row, amenity_ids, cell))
+
+        created = 0
+        for start in range(0, len(accepted), chunk_size):
+            chunk = accepted[start:start + chunk_size]
+            try:
+                db.session.execute(db.insert(Place.__table__), [row for _, row, _, _ in chunk])
+                db.session.execute(db.insert(PlaceCell.__table__), [
+                    {'place_id': row['id'], 'cell_lat': cell[0], 'cell_lon': cell[1]}
+                    for _, row, _, cell in chunk
+                ])
+                links = [
+                    {'place_id': row['id'], 'amenity_id': amenity_id}
+                    for _, row, amenity_ids, _ in chunk for amenity_id in amenity_ids
+                ]
+                if links:
+                    db.session.execute(db.insert(PlaceAmenity.__table__), links)
+                db.session.commit()
+            except Exception as e:
+                logger.error("❌ Erreur création en masse (lot %s): %s", start // chunk_size, e)
+                db.session.rollback()
+                for index, _, _, _ in chunk:
+                    results[index] = {'index': index, 'status': 'error', 'error': 'Batch rejected by the database'}
+                continue
+            for index, row, _, _ in chunk:
+                results[index] = {'index': index, 'status': 'created', 'id': row['id']}
+            created += len(chunk)
+
+        if created:
+            tile_cache.clear()
+            cache.invalidate('places')
+        logger.info("✅ Création en masse: %s créées, %s rejetées", created, len(items) - created)
+        return results
+
+    def place_loader_options(self, columns=None, relations=PLACE_RELATIONS):
+        """Options de chargement d'un lieu dérivées de la forme de la réponse
+
+        columns : attributs de Place à charger (None = tous, les autres sont différés)
+        relations : relations à charger en requêtes fixes, les autres ne sont jamais lues
+        """
+        options = []
+        if columns is not None:
+            options.append(load_only(*(getattr(Place, c) for c in columns)))
+        if 'owner' in relations:
+            options.append(joinedload(Place.owner))
+        if 'amenities' in relations:
+            options.append(selectinload(Place.amenities).joinedload(PlaceAmenity.amenity))
+        if 'reviews' in relations:
+            options.append(selectinload(Place.reviews))
+        options.append(raiseload('*'))
+        return options
+
+    def review_loader_options(self, columns=None, relations=()):
+        """Options de chargement d'un avis dérivées de la forme de la réponse"""
+        options = []
+        if columns is not None:
+            options.append(load_only(*(getattr(Review, c) for c in columns)))
+        if 'user' in relations:
+            # Un même auteur revient sur plusieurs avis : une requête IN dédoublonnée
+            options.append(selectinload(Review.user))
+        if 'place' in relations:
+            options.append(joinedload(Review.place))
+        options.append(raiseload('*'))
+        return options
+
+    def get_place(self, place_id, columns=None, relations=None):
+        """Récupération d'un lieu par ID (forme de chargement optionnelle)"""
         try:
+            if relations is not None:
+                return Place.query.options(
+                    *self.place_loader_options(columns, relations)
+                ).filter_by(id=place_id).first()
             return db.session.get(Place, place_id)
         except Exception as e:
-            logger.error(f"❌ Erreur récupération place: {str(e)}")
+            logger.error("❌ Erreur récupération place: %s", e)
             return None
 
     def get_all_places(self):
@@ -326,15 +575,69 @@ class HBnBFacade:
         try:
             return Place.query.all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération places: {str(e)}")
+            logger.error("❌ Erreur récupération places: %s", e)
             return []
 
+    def get_places_page(self, limit=DEFAULT_LIMIT, after=None, min_price=None,
+                        max_price=None, amenity_ids=None, owner_id=None, sort=None,
+                        columns=None, relations=PLACE_RELATIONS):
+        """Page de lieux filtrée et triée, relations chargées en requêtes fixes"""
+        if sort not in PLACE_SORTS:
+            raise ValueError(f"Invalid sort: {sort}")
+        sort_column, descending = PLACE_SORTS[sort]
+
+        if columns is not None:
+            # La colonne de tri sert à construire le curseur
+            columns = set(columns) | {sort_column.key}
+        query = Place.query.options(*self.place_loader_options(columns, relations))
+
+        # Filtres
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if owner_id:
+            query = query.filter(Place.owner_id == owner_id)
+        if amenity_ids:
+            # Sémantique ET : le lieu doit posséder toutes les amenities demandées
+            wanted = set(amenity_ids)
+            matching = (
+                db.select(PlaceAmenity.place_id)
+                .where(PlaceAmenity.amenity_id.in_(wanted))
+                .group_by(PlaceAmenity.place_id)
+                .having(db.func.count() == len(wanted))
+            )
+            query = query.filter(Place.id.in_(matching))
+
+        # Pagination par curseur sur (colonne de tri, id)
+        sort_key = db.tuple_(sort_column, Place.id)
+        if after:
+            value_type = datetime if sort_column.key == 'created_at' else float
+            # Valeurs liées au type de leur colonne (ids en texte ou en binaire)
+            cursor_key = db.tuple_(*(
+                db.literal(value, column.type)
+                for value, column in zip(decode_cursor(after, value_type, str), (sort_column, Place.id))
+            ))
+            query = query.filter(sort_key < cursor_key if descending else sort_key > cursor_key)
+        if descending:
+            query = query.order_by(sort_column.desc(), Place.id.desc())
+        else:
+            query = query.order_by(sort_column, Place.id)
+        rows = query.limit(limit + 1).all()
+
+        places = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = places[-1]
+            next_cursor = encode_cursor(getattr(last, sort_column.key), last.id)
+        return places, next_cursor
+
     def get_places_by_owner(self, owner_id):
         """Récupération des lieux par propriétaire"""
         try:
             return Place.query.filter_by(owner_id=owner_id).all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération places owner: {str(e)}")
+            logger.error("❌ Erreur récupération places owner: %s", e)
             return []
 
     def update_place(self, place_id, data):
@@ -343,6 +646,7 @@ class HBnBFacade:
             place = self.get_place(place_id)
             if not place:
                 return None
+            old_location = (place.latitude, place.longitude)
                 
             # Mise à jour des champs simples
             updatable = ['title', 'description', 'price', 'latitude', 'longitude']
@@ -370,55 +674,266 @@ class HBnBFacade:
                         raise ValueError(f"Amenity not found: {amenity_id}")
                     pa = PlaceAmenity(place_id=place.id, amenity_id=amenity.id)
                     db.session.add(pa)
+                # Les liens n'ont pas de date : on date le lieu (validateurs HTTP)
+                place.updated_at = datetime.utcnow()
                     
             db.session.commit()
-            logger.info(f"✅ Place {place_id} mise à jour")
+            tile_cache.invalidate_point(*old_location)
+            tile_cache.invalidate_point(place.latitude, place.longitude)
+            cache.invalidate('places', f"place:{place_id}")
+            logger.info("✅ Place %s mise à jour", place_id)
             return place
             
         except Exception as e:
-            logger.error(f"❌ Erreur update place: {str(e)}")
+            logger.error("❌ Erreur update place: %s", e)
             db.session.rollback()
             raise e
 
     def delete_place(self, place_id):
         """Supprimer un lieu par son ID avec toutes ses relations"""
         try:
-            place = self.get_place(place_id)
-            if not place:
+            location = db.session.query(Place.latitude, Place.longitude).filter(Place.id == place_id).first()
+            if not location:
                 raise ValueError("Place not found")
-            
-            # 1. Supprimer les relations avec les équipements
-            PlaceAmenity.query.filter_by(place_id=place_id).delete()
-            
-            # 2. Supprimer les avis du lieu
-            Review.query.filter_by(place_id=place_id).delete()
-            
-            # 3. Supprimer le lieu lui-même
-            db.session.delete(place)
-            
-            # 4. Confirmer toutes les suppressions
+
+            # Liens, cellule, avis puis le lieu : une seule transaction
+            self._delete_places([place_id])
             db.session.commit()
-            
-            logger.info(f"✅ Place {place_id} supprimée")
+            self._invalidate_locations([location])
+            cache.invalidate('places', f"place:{place_id}")
+
+            logger.info("✅ Place %s supprimée", place_id)
             return True
-            
+
         except Exception as e:
-            logger.error(f"❌ Erreur delete place: {str(e)}")
+            logger.error("❌ Erreur delete place: %s", e)
             db.session.rollback()
             raise e
 
-    def find_place_by_location(self, latitude, longitude, delta=1e-7):
-        """Recherche d'un lieu par coordonnées géographiques"""
+    def _delete_places(self, place_ids):
+        """DELETE ensemblistes des lieux (liste ou sous-requête) et de leurs dépendances
+
+        Dans la transaction en cours ; renvoie les lignes supprimées.
+        """
+        deleted = {}
+        for name, model, column in (
+            ('amenity_links', PlaceAmenity, PlaceAmenity.place_id),
+            ('cells', PlaceCell, PlaceCell.place_id),
+            ('reviews', Review, Review.place_id),
+            ('places', Place, Place.id),
+        ):
+            result = db.session.execute(
+                db.delete(model).where(column.in_(place_ids)).execution_options(synchronize_session=False)
+            )
+            deleted[name] = result.rowcount
+        # Objets éventuellement chargés : ils n'existent plus
+        db.session.expire_all()
+        return deleted
+
+    def _invalidate_locations(self, locations):
+        """Tuiles des emplacements supprimés (toutes au-delà de TILE_INVALIDATE_MAX_POINTS)"""
+        if len(locations) > TILE_INVALIDATE_MAX_POINTS:
+            tile_cache.clear()
+            return
+        for latitude, longitude in locations:
+            tile_cache.invalidate_point(latitude, longitude)
+
+    def find_place_by_location(self, latitude, longitude, delta=SAME_LOCATION_DELTA):
+        """Recherche d'un lieu par coordonnées (sonde de l'index spatial)"""
         try:
-            return Place.query.filter(
+            latitude, longitude = float(latitude), float(longitude)
+            min_lat, min_lon = cell_of(latitude - delta, longitude - delta)
+            max_lat, max_lon = cell_of(latitude + delta, longitude + delta)
+            return Place.query.join(PlaceCell).filter(
+                PlaceCell.cell_lat.between(min_lat, max_lat),
+                PlaceCell.cell_lon.between(min_lon, max_lon),
                 db.func.abs(Place.latitude - latitude) < delta,
                 db.func.abs(Place.longitude - longitude) < delta
             ).first()
         except Exception as e:
-            logger.error(f"❌ Erreur recherche par location: {str(e)}")
+            logger.error("❌ Erreur recherche par location: %s", e)
             return None
 
+    def find_places_nearby(self, latitude, longitude, radius_km, limit=DEFAULT_LIMIT):
+        """Lieux dans un rayon donné, triés par distance (haversine)
+
+        Seules les cellules de la grille couvrant le cercle sont lues ;
+        renvoie une liste de couples (place, distance_km).
+        """
+        min_lat, max_lat, lon_ranges = bounding_box(latitude, longitude, radius_km)
+        cell_min_lat, _ = cell_of(min_lat, 0)
+        cell_max_lat, _ = cell_of(max_lat, 0)
+
+        in_cells = []
+        in_box = []
+        for min_lon, max_lon in lon_ranges:
+            _, cell_min_lon = cell_of(0, min_lon)
+            _, cell_max_lon = cell_of(0, max_lon)
+            in_cells.append(PlaceCell.cell_lon.between(cell_min_lon, cell_max_lon))
+            in_box.append(Place.longitude.between(min_lon, max_lon))
+
+        candidates = Place.query.join(PlaceCell).options(raiseload('*')).filter(
+            PlaceCell.cell_lat.between(cell_min_lat, cell_max_lat),
+            db.or_(*in_cells),
+            Place.latitude.between(min_lat, max_lat),
+            db.or_(*in_box)
+        ).all()
+
+        results = []
+        for place in candidates:
+            distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                results.append((place, distance))
+        results.sort(key=lambda item: (item[1], item[0].id))
+        return results[:limit]
+
+    def get_tile(self, zoom, x, y):
+        """Contenu d'une tuile de carte : clusters ou lieux, mis en cache par tuile"""
+        key = (zoom, x, y)
+        tile = tile_cache.get(key)
+        if tile is not None:
+            return tile
+
+        min_lat, max_lat, min_lon, max_lon = tile_bounds(zoom, x, y)
+        cell_min_lat, cell_min_lon = cell_of(min_lat, min_lon)
+        cell_max_lat, cell_max_lon = cell_of(max_lat, max_lon)
+        in_tile = (
+            PlaceCell.cell_lat.between(cell_min_lat, cell_max_lat),
+            PlaceCell.cell_lon.between(cell_min_lon, cell_max_lon),
+            Place.latitude >= min_lat,
+            Place.latitude < max_lat,
+            Place.longitude >= min_lon,
+            Place.longitude < max_lon,
+        )
+
+        tile = {'tile': f"{zoom}/{x}/{y}"}
+        if zoom <= CLUSTER_MAX_ZOOM:
+            # Regroupement SQL par blocs de cellules de la grille spatiale
+            cluster_deg = 360.0 / 2 ** zoom / CLUSTERS_PER_TILE_SIDE
+            block = max(1, int(cluster_deg / CELL_SIZE_DEG))
+            lat_offset, lon_offset = (-c for c in cell_of(-90.0, -180.0))
+            block_lat = (PlaceCell.cell_lat + lat_offset) // block
+            block_lon = (PlaceCell.cell_lon + lon_offset) // block
+            rows = db.session.query(
+                db.func.avg(Place.latitude),
+                db.func.avg(Place.longitude),
+                db.func.count(Place.id),
+                db.func.min(Place.price)
+            ).join(PlaceCell).filter(*in_tile).group_by(block_lat, block_lon).all()
+            tile['clusters'] = [
+                {'latitude': lat, 'longitude': lon, 'count': count, 'min_price': min_price}
+                for lat, lon, count, min_price in rows
+            ]
+        else:
+            rows = db.session.query(
+                Place.id, Place.title, Place.price, Place.latitude, Place.longitude
+            ).join(PlaceCell).filter(*in_tile).order_by(Place.price, Place.id).limit(MAX_PLACES_PER_TILE).all()
+            tile['places'] = [
+                {'id': str(place_id), 'name': title, 'price_by_night': price,
+                 'latitude': lat, 'longitude': lon}
+                for place_id, title, price, lat, lon in rows
+            ]
+
+        tile_cache.set(key, tile)
+        return tile
+
+    def search_places(self, text, limit=DEFAULT_LIMIT, after=None, min_price=None,
+                      max_price=None, owner_id=None):
+        """Recherche plein texte (FTS5) classée par bm25, paginée par curseur
+
+        Renvoie (liste de (place, score, extrait), next_cursor).
+        """
+        params = {
+            'match': to_fts_query(text),
+            'limit': limit + 1,
+            'open': HIGHLIGHT_OPEN,
+            'close': HIGHLIGHT_CLOSE,
+            'tokens': SNIPPET_TOKENS,
+            'title_weight': TITLE_WEIGHT,
+            'description_weight': DESCRIPTION_WEIGHT,
+        }
+        filters = ''
+        if min_price is not None:
+            filters += ' AND p.price >= :min_price'
+            params['min_price'] = min_price
+        if max_price is not None:
+            filters += ' AND p.price <= :max_price'
+            params['max_price'] = max_price
+        if owner_id:
+            filters += ' AND p.owner_id = :owner_id'
+            params['owner_id'] = owner_id
+        keyset = ''
+        if after:
+            params['after_rank'], params['after_id'] = decode_cursor(after, float, str)
+            keyset = 'WHERE (rank, id) > (:after_rank, :after_id)'
+
+        statement = db.text(f"""
+            SELECT id, rank, snippet FROM (
+                SELECT p.id AS id,
+                       bm25(places_fts, :title_weight, :description_weight) AS rank,
+                       snippet(places_fts, -1, :open, :close, '…', :tokens) AS snippet
+                FROM places_fts JOIN places p ON p.rowid = places_fts.rowid
+                WHERE places_fts MATCH :match{filters}
+            ) {keyset}
+            ORDER BY rank, id
+            LIMIT :limit
+        """)
+        # Identifiants passés par leur type de colonne (stockage texte ou binaire)
+        statement = statement.bindparams(
+            *(db.bindparam(name, type_=Id()) for name in ('owner_id', 'after_id') if name in params)
+        ).columns(id=Id(), rank=db.Float, snippet=db.Text)
+        rows = db.session.execute(statement, params).all()
+
+        page = rows[:limit]
+        places = {
+            place.id: place
+            for place in Place.query.options(raiseload('*')).filter(
+                Place.id.in_([row.id for row in page]))
+        }
+        results = [
+            (places[row.id], -row.rank, row.snippet)
+            for row in page if row.id in places
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1].rank, page[-1].id)
+        return results, next_cursor
+
+    def rebuild_search_index(self):
+        """Crée (si besoin) et reconstruit l'index plein texte places_fts"""
+        try:
+            for statement in PLACES_FTS_DDL:
+                db.session.execute(db.text(statement))
+            db.session.execute(db.text("INSERT INTO places_fts(places_fts) VALUES ('rebuild')"))
+            db.session.commit()
+            logger.info("✅ Index plein texte reconstruit")
+        except Exception as e:
+            logger.error("❌ Erreur reconstruction index plein texte: %s", e)
+            db.session.rollback()
+            raise e
+
+    def rebuild_place_cells(self):
+        """Reconstruit l'index spatial place_cells pour tous les lieux"""
+        try:
+            PlaceCell.query.delete()
+            rows = []
+            for place_id, latitude, longitude in db.session.query(
+                    Place.id, Place.latitude, Place.longitude):
+                cell_lat, cell_lon = cell_of(latitude, longitude)
+                rows.append({'place_id': place_id, 'cell_lat': cell_lat, 'cell_lon': cell_lon})
+            if rows:
+                db.session.execute(db.insert(PlaceCell), rows)
+            db.session.commit()
+            tile_cache.clear()
+            logger.info("✅ Index spatial reconstruit: %s lieux", len(rows))
+            return len(rows)
+        except Exception as e:
+            logger.error("❌ Erreur reconstruction index spatial: %s", e)
+            db.session.rollback()
+            raise e
+
     # ---------- REVIEW ----------
+    @queued
     def create_review(self, data):
         """Création d'un avis avec validations"""
         try:
@@ -444,51 +959,108 @@ class HBnBFacade:
             )
             
             db.session.add(review)
+            self._apply_rating(place.id, review.rating, 1)
             db.session.commit()
+            cache.invalidate('places', f"place:{place.id}")
             
-            logger.info(f"✅ Review créée pour place {place.id}")
+            logger.info("✅ Review créée pour place %s", place.id)
             return review
             
         except Exception as e:
-            logger.error(f"❌ Erreur création review: {str(e)}")
+            logger.error("❌ Erreur création review: %s", e)
             db.session.rollback()
             raise e
 
-    def get_review(self, review_id):
-        """Récupération d'un avis par ID"""
+    def get_review(self, review_id, columns=None, relations=None):
+        """Récupération d'un avis par ID (forme de chargement optionnelle)"""
         try:
+            if relations is not None:
+                return Review.query.options(
+                    *self.review_loader_options(columns, relations)
+                ).filter_by(id=review_id).first()
             return db.session.get(Review, review_id)
         except Exception as e:
-            logger.error(f"❌ Erreur récupération review: {str(e)}")
+            logger.error("❌ Erreur récupération review: %s", e)
             return None
 
-    def get_all_reviews(self):
+    def get_all_reviews(self, columns=None, relations=None):
         """Récupération de tous les avis"""
         try:
+            if relations is not None:
+                return Review.query.options(*self.review_loader_options(columns, relations)).all()
             return Review.query.all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération reviews: {str(e)}")
+            logger.error("❌ Erreur récupération reviews: %s", e)
             return []
 
-    def get_reviews_by_place(self, place_id):
+    def get_reviews_by_place(self, place_id, columns=None, relations=None):
         """Récupération des avis par lieu"""
         try:
             place = db.session.get(Place, place_id)
             if not place:
                 return None
+            if relations is not None:
+                return Review.query.options(
+                    *self.review_loader_options(columns, relations)
+                ).filter_by(place_id=place_id).all()
             return list(place.reviews)
         except Exception as e:
-            logger.error(f"❌ Erreur récupération reviews place: {str(e)}")
+            logger.error("❌ Erreur récupération reviews place: %s", e)
             return []
 
+    def get_reviews_page(self, place_id, limit=DEFAULT_LIMIT, after=None, sort=None,
+                         columns=None, relations=()):
+        """Page d'avis d'un lieu, par curseur (keyset sur la clé de tri + id)
+
+        sort : newest (défaut), highest ou lowest (note puis date).
+        Renvoie (place, reviews, next_cursor), place ne chargeant que ses
+        agrégats de notes ; None si le lieu n'existe pas.
+        """
+        if sort not in REVIEW_SORTS:
+            raise ValueError(f"Invalid sort: {sort}")
+        sort_columns, descending = REVIEW_SORTS[sort]
+        key = sort_columns + (Review.id,)
+
+        place = Place.query.options(load_only(
+            Place.id, Place.review_count, Place.rating_avg,
+            *(getattr(Place, f'rating_{n}') for n in range(1, 6))
+        )).filter_by(id=place_id).first()
+        if place is None:
+            return None
+
+        if columns is not None:
+            columns = set(columns) | {c.key for c in key}
+        query = Review.query.options(
+            *self.review_loader_options(columns, relations)
+        ).filter(Review.place_id == place_id)
+
+        if after:
+            types = tuple({'created_at': datetime, 'rating': int}.get(c.key, str) for c in key)
+            cursor = db.tuple_(*key)
+            values = db.tuple_(*(
+                db.literal(value, column.type) for value, column in zip(decode_cursor(after, *types), key)
+            ))
+            query = query.filter(cursor < values if descending else cursor > values)
+
+        order = [c.desc() if descending else c.asc() for c in key]
+        reviews = query.order_by(*order).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            last = reviews[-1]
+            next_cursor = encode_cursor(*(getattr(last, c.key) for c in key))
+        return place, reviews, next_cursor
+
     def get_reviews_by_user(self, user_id):
         """Récupération des avis par utilisateur"""
         try:
             return Review.query.filter_by(user_id=user_id).all()
         except Exception as e:
-            logger.error(f"❌ Erreur récupération reviews user: {str(e)}")
+            logger.error("❌ Erreur récupération reviews user: %s", e)
             return []
 
+    @queued
     def update_review(self, review_id, data):
         """Mise à jour d'un avis"""
         try:
@@ -503,16 +1075,21 @@ class HBnBFacade:
                 rating = data['rating']
                 if not (1 <= int(rating) <= 5):
                     raise ValueError("Rating must be between 1 and 5")
+                if int(rating) != review.rating:
+                    self._apply_rating(review.place_id, review.rating, -1)
+                    self._apply_rating(review.place_id, rating, 1)
                 review.rating = int(rating)
                 
             db.session.commit()
+            cache.invalidate('places', f"place:{review.place_id}")
             return review
             
         except Exception as e:
-            logger.error(f"❌ Erreur update review: {str(e)}")
+            logger.error("❌ Erreur update review: %s", e)
             db.session.rollback()
             raise e
 
+    @queued
     def delete_review(self, review_id):
         """Supprimer un avis par son ID"""
         try:
@@ -520,17 +1097,208 @@ class HBnBFacade:
             if not review:
                 raise ValueError("Review not found")
             
+            place_id = review.place_id
             db.session.delete(review)
+            self._apply_rating(place_id, review.rating, -1)
             db.session.commit()
+            cache.invalidate('places', f"place:{place_id}")
             
-            logger.info(f"✅ Review {review_id} supprimée")
+            logger.info("✅ Review %s supprimée", review_id)
             return True
             
         except Exception as e:
-            logger.error(f"❌ Erreur delete review: {str(e)}")
+            logger.error("❌ Erreur delete review: %s", e)
             db.session.rollback()
             raise e
 
+    # ---------- AGRÉGATS DES NOTES ----------
+    def _apply_rating(self, place_id, rating, delta):
+        """Ajoute/retire une note aux agrégats d'un lieu (dans la transaction en cours)"""
+        db.session.execute(
+            db.update(Place).where(Place.id == place_id).values(**Place.rating_delta(rating, delta))
+        )
+
+    def _recompute_ratings(self, place_ids=None):
+        """Recalcule les agrégats depuis reviews (tous les lieux si place_ids est None)
+
+        Une remise à zéro puis un seul UPDATE ... FROM sur l'agrégat groupé par lieu.
+        """
+        if place_ids is not None and not place_ids:
+            return
+        target = Place.id.in_(place_ids) if place_ids is not None else db.true()
+        zero = {'review_count': 0, 'rating_sum': 0, 'rating_avg': 0.0}
+        zero.update({f'rating_{n}': 0 for n in range(1, 6)})
+        db.session.execute(
+            db.update(Place).where(target).values(**zero)
+            .execution_options(synchronize_session=False)
+        )
+
+        columns = [
+            Review.place_id,
+            db.func.count(Review.id).label('review_count'),
+            db.func.sum(Review.rating).label('rating_sum'),
+        ] + [
+            db.func.sum(db.case((Review.rating == n, 1), else_=0)).label(f'rating_{n}')
+            for n in range(1, 6)
+        ]
+        aggregate = db.select(*columns).group_by(Review.place_id)
+        if place_ids is not None:
+            aggregate = aggregate.where(Review.place_id.in_(place_ids))
+        aggregate = aggregate.subquery()
+
+        values = {name: aggregate.c[name] for name in zero if name != 'rating_avg'}
+        values['rating_avg'] = db.cast(aggregate.c.rating_sum, db.Float) / aggregate.c.review_count
+        db.session.execute(
+            db.update(Place).where(Place.id == aggregate.c.place_id).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.expire_all()
+
+    def repair_rating_aggregates(self, place_ids=None):
+        """Tâche de réparation : recalcule en masse les agrégats des notes"""
+        try:
+            self._recompute_ratings(place_ids)
+            db.session.commit()
+            cache.invalidate('places', *self._place_keys(
+                Place.id.in_(place_ids) if place_ids is not None else db.true()))
+            logger.info("✅ Agrégats des notes recalculés")
+        except Exception as e:
+            logger.error("❌ Erreur recalcul des notes: %s", e)
+            db.session.rollback()
+            raise e
+
+    # ---------- LECTURES PAR LOTS (DataLoader) ----------
+    def get_users_by_ids(self, user_ids):
+        """Utilisateurs par ID en une requête IN : {id: user}"""
+        if not user_ids:
+            return {}
+        users = User.query.options(raiseload('*')).filter(User.id.in_(user_ids))
+        return {user.id: user for user in users}
+
+    def get_places_by_ids(self, place_ids):
+        """Lieux par ID en une requête IN : {id: place}"""
+        if not place_ids:
+            return {}
+        places = Place.query.options(raiseload('*')).filter(Place.id.in_(place_ids))
+        return {place.id: place for place in places}
+
+    def get_amenities_by_places(self, place_ids):
+        """Amenities de plusieurs lieux en une requête : {place_id: [amenity, ...]}"""
+        result = {place_id: [] for place_id in place_ids}
+        if not place_ids:
+            return result
+        rows = db.session.query(PlaceAmenity.place_id, Amenity).join(
+            Amenity, Amenity.id == PlaceAmenity.amenity_id
+        ).filter(PlaceAmenity.place_id.in_(place_ids))
+        for place_id, amenity in rows:
+            result[place_id].append(amenity)
+        return result
+
+    def get_reviews_by_places(self, place_ids):
+        """Avis de plusieurs lieux en une requête : {place_id: [review, ...]}"""
+        result = {place_id: [] for place_id in place_ids}
+        if not place_ids:
+            return result
+        reviews = Review.query.options(raiseload('*')).filter(
+            Review.place_id.in_(place_ids)
+        ).order_by(Review.created_at, Review.id)
+        for review in reviews:
+            result[review.place_id].append(review)
+        return result
+
+    # ---------- CACHE ----------
+    def _place_keys(self, condition):
+        """Clés de cache 'place:<id>' des lieux vérifiant une condition"""
+        return [f"place:{place_id}" for (place_id,) in
+                db.session.query(Place.id).filter(condition)]
+
+    def get_cache_stats(self):
+        """Compteurs du cache de réponses (hits, misses, évictions...)"""
+        return cache.stats()
+
+    def get_profiles(self, limit=50):
+        """Profils cProfile enregistrés, du plus récent au plus ancien"""
+        return profiler.list_profiles(limit)
+
+    def get_profile(self, profile_id):
+        """Détail d'un profil (fonctions les plus coûteuses), ou None"""
+        return profiler.get_profile(profile_id)
+
+    def get_profile_file(self, profile_id, extension):
+        """Chemin du fichier .prof ou .collapsed d'un profil, ou None"""
+        return profiler.profile_path(profile_id, extension)
+
+    def get_slow_queries(self, limit=20, sort='total'):
+        """Requêtes lentes regroupées par forme (fingerprint)"""
+        if sort not in SLOW_QUERY_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(SLOW_QUERY_SORTS)}")
+        return {
+            'threshold_ms': round(slow_queries.threshold * 1000, 3),
+            'queries': slow_queries.aggregate(limit, sort),
+        }
+
+    def start_user_purge(self, user_id):
+        """Lance (ou retrouve, s'il est en cours) la purge en arrière-plan d'un utilisateur"""
+        from app.services.purge import start_purge
+        return start_purge(user_id).to_dict()
+
+    def get_purge_job(self, job_id):
+        """Progression d'une purge, ou None"""
+        job = db.session.get(PurgeJob, job_id)
+        return job.to_dict() if job else None
+
+    # ---------- VERSIONS (validateurs HTTP) ----------
+    def _collection_version(self, relations, place_id=None):
+        """Sous-requêtes (nombre, dernière modification) des relations d'un ou de tous les lieux"""
+        columns = []
+        if 'owner' in relations:
+            owners = db.select(db.func.max(User.updated_at))
+            if place_id is not None:
+                owners = owners.where(User.id == Place.owner_id)
+            columns.append(owners.scalar_subquery())
+        if 'reviews' in relations:
+            for aggregate in (db.func.count(Review.id), db.func.max(Review.updated_at)):
+                reviews = db.select(aggregate)
+                if place_id is not None:
+                    reviews = reviews.where(Review.place_id == Place.id)
+                columns.append(reviews.scalar_subquery())
+        if 'amenities' in relations:
+            for aggregate in (db.func.count(PlaceAmenity.amenity_id), db.func.max(Amenity.updated_at)):
+                links = db.select(aggregate).select_from(PlaceAmenity).join(
+                    Amenity, Amenity.id == PlaceAmenity.amenity_id)
+                if place_id is not None:
+                    links = links.where(PlaceAmenity.place_id == Place.id)
+                columns.append(links.scalar_subquery())
+        return columns
+
+    def get_places_version(self, relations=()):
+        """(nombre, dernière modification) des lieux et des relations embarquées"""
+        columns = [db.func.count(Place.id), db.func.max(Place.updated_at)]
+        columns += self._collection_version(relations)
+        return tuple(db.session.execute(db.select(*columns)).one())
+
+    def get_place_version(self, place_id, relations=()):
+        """updated_at d'un lieu et versions de ses relations embarquées (None si absent)"""
+        columns = [Place.updated_at] + self._collection_version(relations, place_id=place_id)
+        row = db.session.execute(db.select(*columns).where(Place.id == place_id)).first()
+        return tuple(row) if row else None
+
+    def get_amenities_version(self):
+        """(nombre, dernière modification) des amenities"""
+        return tuple(db.session.execute(
+            db.select(db.func.count(Amenity.id), db.func.max(Amenity.updated_at))
+        ).one())
+
+    def get_review_version(self, review_id):
+        """updated_at d'un avis, de son auteur et de son lieu (None si absent)"""
+        row = db.session.execute(
+            db.select(Review.updated_at, User.updated_at, Place.updated_at)
+            .outerjoin(User, User.id == Review.user_id)
+            .outerjoin(Place, Place.id == Review.place_id)
+            .where(Review.id == review_id)
+        ).first()
+        return tuple(row) if row else None
+
     # ---------- MÉTHODES UTILITAIRES ----------
     def validate_owner_permissions(self, user_id, place_id):
         """Validation des permissions propriétaire"""
@@ -544,7 +1312,7 @@ class HBnBFacade:
             
             return True
         except Exception as e:
-            logger.error(f"❌ Erreur validation permissions: {str(e)}")
+            logger.error("❌ Erreur validation permissions: %s", e)
             raise e
 
     def get_user_statistics(self, user_id):
@@ -564,5 +1332,5 @@ class HBnBFacade:
                 'user_role': getattr(user, 'role', 'undefined')
             }
         except Exception as e:
-            logger.error(f"❌ Erreur statistiques user: {str(e)}")
+            logger.error("❌ Erreur statistiques user: %s", e)
             return None
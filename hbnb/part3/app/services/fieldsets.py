@@ -0,0 +1,24 @@
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_fields(value, allowed):
+    """Champs demandés via ?fields= (None = tous les champs)"""
+    if value is None:
+        return None
+    fields = _split(value)
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return set(fields) | {'id'}
+
+
+def parse_expand(value, allowed, default=()):
+    """Relations à embarquer via ?expand= (None = expansion par défaut)"""
+    if value is None:
+        return set(default)
+    expand = _split(value)
+    unknown = [e for e in expand if e not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown expansion(s): {', '.join(unknown)}")
+    return set(expand)
@@ -0,0 +1,65 @@
+import math
+
+# Taille d'une cellule de la grille spatiale (en degrés, ~11 km de latitude)
+CELL_SIZE_DEG = 0.1
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEG_LAT = 111.32
+# Deux lieux plus proches que cet écart (en degrés) sont au même emplacement
+SAME_LOCATION_DELTA = 1e-7
+# Cellules par requête IN lors de la lecture des lieux d'une zone
+CELLS_PER_QUERY = 1000
+
+
+def cell_of(latitude, longitude):
+    """Cellule (cell_lat, cell_lon) de la grille contenant un point"""
+    return (
+        math.floor(float(latitude) / CELL_SIZE_DEG),
+        math.floor(float(longitude) / CELL_SIZE_DEG),
+    )
+
+
+def cells_around(latitude, longitude, delta=SAME_LOCATION_DELTA):
+    """Cellules de la grille touchées par le carré de côté 2*delta autour d'un point"""
+    min_lat, min_lon = cell_of(latitude - delta, longitude - delta)
+    max_lat, max_lon = cell_of(latitude + delta, longitude + delta)
+    return [(a, b) for a in range(min_lat, max_lat + 1) for b in range(min_lon, max_lon + 1)]
+
+
+def location_taken(taken, latitude, longitude, delta=SAME_LOCATION_DELTA):
+    """Vrai si taken ({cellule: [(lat, lon), ...]}) a déjà un lieu au même emplacement"""
+    return any(abs(lat - latitude) < delta and abs(lon - longitude) < delta
+               for cell in cells_around(latitude, longitude, delta) for lat, lon in taken.get(cell, ()))
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distance orthodromique entre deux points, en kilomètres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Boîte (min_lat, max_lat, [(min_lon, max_lon), ...]) couvrant un cercle
+
+    La boîte est découpée en deux intervalles de longitude quand elle
+    traverse l'antiméridien, et couvre toutes les longitudes près des pôles.
+    """
+    dlat = radius_km / KM_PER_DEG_LAT
+    min_lat = max(-90.0, latitude - dlat)
+    max_lat = min(90.0, latitude + dlat)
+
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat <= 1e-9 or max_lat >= 90.0 or min_lat <= -90.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+    dlon = radius_km / (KM_PER_DEG_LAT * cos_lat)
+    if dlon >= 180.0:
+        return min_lat, max_lat, [(-180.0, 180.0)]
+
+    min_lon, max_lon = longitude - dlon, longitude + dlon
+    if min_lon < -180.0:
+        return min_lat, max_lat, [(min_lon + 360.0, 180.0), (-180.0, max_lon)]
+    if max_lon > 180.0:
+        return min_lat, max_lat, [(min_lon, 180.0), (-180.0, max_lon - 360.0)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
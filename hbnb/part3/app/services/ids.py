@@ -0,0 +1,95 @@
+import os
+import secrets
+import threading
+import time
+import uuid
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+# Stockage des identifiants, fixé au démarrage du processus (schéma des tables) :
+# 'string' (texte de 36 caractères) ou 'binary' (16 octets, UUID natif sur PostgreSQL).
+# Changer de stockage sur une base existante : `HBNB_ID_STORAGE=binary flask hbnb rekey-ids`
+ID_STORAGE = os.environ.get('HBNB_ID_STORAGE', 'string')
+ID_STORAGES = ('string', 'binary')
+if ID_STORAGE not in ID_STORAGES:
+    raise ValueError(f"Invalid HBNB_ID_STORAGE: {ID_STORAGE}")
+
+_MAX_COUNTER = 0xFFF
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def uuid7(timestamp_ms=None, counter=None):
+    """UUID version 7 (RFC 9562) : 48 bits d'horodatage Unix en ms, 12 bits de
+    compteur, 62 bits aléatoires
+
+    Les ids suivent l'ordre de création : les insertions tombent en fin de
+    B-tree (clé primaire et index qui la référencent) au lieu de pages
+    aléatoires. Sans argument, le compteur est monotone dans la milliseconde
+    (ids strictement croissants dans un processus) ; timestamp_ms et counter
+    fixent ces champs pour réattribuer des ids existants dans l'ordre de
+    leur created_at.
+    """
+    global _last_ms, _counter
+    if timestamp_ms is None:
+        with _lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > _last_ms:
+                # Départ aléatoire sur 11 bits : garde de la marge avant débordement
+                _last_ms, _counter = now_ms, secrets.randbits(11)
+            else:
+                _counter += 1
+                if _counter > _MAX_COUNTER:
+                    # Plus de 4096 ids dans la milliseconde : on emprunte la suivante
+                    _last_ms, _counter = _last_ms + 1, 0
+            timestamp_ms, counter = _last_ms, _counter
+    elif counter is None:
+        counter = secrets.randbits(12)
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | (counter & _MAX_COUNTER) << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+    return uuid.UUID(int=value)
+
+
+def new_id():
+    """Identifiant par défaut des modèles : UUIDv7 au format texte"""
+    return str(uuid7())
+
+
+class Id(TypeDecorator):
+    """Colonne d'identifiant (clé primaire ou étrangère) selon ID_STORAGE
+
+    L'application manipule toujours des chaînes ; en stockage binaire, elles
+    sont converties en 16 octets à l'écriture et reconverties à la lecture.
+    Une chaîne qui n'est pas un UUID est passée telle quelle (encodée) :
+    elle ne correspond à aucune ligne.
+    """
+
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if ID_STORAGE == 'binary':
+            if dialect.name == 'postgresql':
+                return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+            return dialect.type_descriptor(LargeBinary(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or ID_STORAGE != 'binary' or dialect.name == 'postgresql':
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            return str(value).encode('utf-8')
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            return str(uuid.UUID(bytes=value))
+        return value
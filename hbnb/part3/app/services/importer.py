@@ -0,0 +1,425 @@
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from werkzeug.security import generate_password_hash
+from app.extensions import db, cache
+from app.models.user import User
+from app.models.place import Place, PlaceAmenity, PlaceCell
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.services.geo import cell_of, cells_around, location_taken
+from app.services.ids import new_id
+from app.services.tiles import tile_cache
+
+logger = logging.getLogger(__name__)
+
+# Ordre de chargement : chaque type référence les précédents par clé naturelle
+IMPORT_KINDS = ('users', 'amenities', 'places', 'reviews')
+IMPORT_FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+IMPORT_BATCH_SIZE = 10000
+# Lignes par transaction : peu de commits, mais un échec ne perd qu'un lot
+IMPORT_TRANSACTION_ROWS = 200000
+IMPORT_IDS_PER_QUERY = 1000
+# Cache de pages SQLite pendant l'import (Kio) : les ids générés (UUIDv7)
+# s'ajoutent en fin de B-tree, mais les index des clés étrangères et les ids
+# fournis par le fichier s'insèrent partout, le cache par défaut (2 Mio) ne suffit pas
+IMPORT_SQLITE_CACHE_KIB = 262144
+# Au-delà, les agrégats des notes sont recalculés pour tous les lieux
+RATING_REPAIR_MAX_PLACES = 5000
+TRUE_VALUES = {'1', 'true', 'yes', 'oui', 'y'}
+
+
+class ImportReport:
+    """Compteurs d'un import et premières lignes rejetées"""
+
+    MAX_ERRORS = 20
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.read = 0
+        self.imported = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.errors = []
+        self.started_at = time.perf_counter()
+        self.seconds = 0.0
+
+    def reject(self, line, error):
+        self.rejected += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append((line, error))
+
+    def to_dict(self):
+        return {
+            'kind': self.kind,
+            'read': self.read,
+            'imported': self.imported,
+            'skipped': self.skipped,
+            'rejected': self.rejected,
+            'errors': [{'line': line, 'error': error} for line, error in self.errors],
+            'seconds': round(self.seconds, 3),
+        }
+
+
+def detect_format(path):
+    """Format d'un fichier d'après son extension (csv ou ndjson), ou None"""
+    return IMPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def read_rows(stream, fmt):
+    """Lignes (numéro, dict) d'un flux CSV (avec en-tête) ou NDJSON
+
+    Les cellules CSV vides sont traitées comme absentes ; une ligne NDJSON
+    illisible donne None, rejeté ensuite avec son numéro.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if key and value != ''}
+        return
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+class BulkImporter:
+    """Import en masse hors ORM : validation, INSERT Core en executemany
+
+    Les règles validate_data des modèles s'appliquent à chaque ligne, les
+    clés étrangères sont résolues par clé naturelle (email du propriétaire
+    ou de l'auteur, nom d'amenity, lieu par id ou par propriétaire + titre),
+    les mots de passe sont hachés dans un pool de processus, et les lignes
+    sont insérées par lots de batch_size dans des transactions de
+    transaction_rows lignes. Avec defer_indexes, les index secondaires de
+    la table cible (et le trigger FTS des lieux) sont supprimés pendant le
+    chargement puis reconstruits en une passe.
+    """
+
+    def __init__(self, batch_size=IMPORT_BATCH_SIZE, transaction_rows=IMPORT_TRANSACTION_ROWS,
+                 workers=None, hash_method=None, defer_indexes=True):
+        self.batch_size = batch_size
+        self.transaction_rows = transaction_rows
+        self.workers = workers or os.cpu_count() or 1
+        self.hash_method = hash_method
+        self.defer_indexes = defer_indexes
+
+    def run(self, kind, rows):
+        """Importe les lignes (numéro, dict) d'un type ; renvoie un ImportReport"""
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Unknown import kind: {kind}")
+        report = ImportReport(kind)
+        prepare = getattr(self, f'_prepare_{kind}')
+        logger.info("🔧 Import %s", kind)
+
+        committed = False
+        with db.engine.connect() as conn:
+            cache_size = None
+            if conn.dialect.name == 'sqlite':
+                cache_size = conn.exec_driver_sql('PRAGMA cache_size').scalar()
+                conn.exec_driver_sql(f'PRAGMA cache_size = -{IMPORT_SQLITE_CACHE_KIB}')
+            self._load_keys(conn, kind)
+            deferred = self._drop_deferred(conn, kind) if self.defer_indexes else ([], [])
+            conn.commit()
+            self._hasher = self._start_hasher() if kind == 'users' else None
+            try:
+                pending = 0
+                iterator = iter(rows)
+                while True:
+                    batch = list(islice(iterator, self.batch_size))
+                    if not batch:
+                        break
+                    report.read += len(batch)
+                    for table, values in prepare(conn, batch, report):
+                        if values:
+                            conn.execute(db.insert(table), values)
+                    pending += len(batch)
+                    if pending >= self.transaction_rows:
+                        conn.commit()
+                        committed = True
+                        pending = 0
+                conn.commit()
+                committed = True
+            except Exception as e:
+                logger.error("❌ Erreur import %s: %s", kind, e)
+                conn.rollback()
+                raise e
+            finally:
+                if self._hasher is not None:
+                    self._hasher.shutdown()
+                self._restore_deferred(conn, *deferred)
+                if cache_size is not None:
+                    # La connexion retourne au pool : rendre son réglage d'origine
+                    conn.exec_driver_sql(f'PRAGMA cache_size = {int(cache_size)}')
+                if committed:
+                    # Aussi après un échec : les transactions déjà validées restent en base
+                    self._finish(kind)
+
+        report.seconds = time.perf_counter() - report.started_at
+        logger.info("✅ Import %s: %s importés, %s ignorés, %s rejetés en %.1fs",
+                    kind, report.imported, report.skipped, report.rejected, report.seconds)
+        return report
+
+    # ---------- Clés naturelles ----------
+    def _load_keys(self, conn, kind):
+        """Charge une fois les correspondances clé naturelle -> id utiles au type"""
+        if kind in ('users', 'places', 'reviews'):
+            self.users = dict(conn.execute(db.select(User.email, User.id)).all())
+            self.user_ids = set(self.users.values())
+        if kind in ('amenities', 'places'):
+            self.amenities = dict(conn.execute(db.select(Amenity.name, Amenity.id)).all())
+        if kind == 'amenities':
+            self.amenity_ids = set(self.amenities.values())
+        if kind == 'places':
+            self.place_ids = set(conn.execute(db.select(Place.id)).scalars())
+        if kind == 'reviews':
+            self.place_owners = dict(conn.execute(db.select(Place.id, Place.owner_id)).all())
+            # (email du propriétaire, titre) -> id, None si plusieurs lieux correspondent
+            self.place_keys = {}
+            for place_id, title, email in conn.execute(
+                    db.select(Place.id, Place.title, User.email).join(User, User.id == Place.owner_id)):
+                key = (email, title)
+                self.place_keys[key] = None if key in self.place_keys else place_id
+            self.touched_places = set()
+
+    # ---------- Index différés ----------
+    def _drop_deferred(self, conn, kind):
+        table = {'users': User, 'amenities': Amenity, 'places': Place, 'reviews': Review}[kind].__table__
+        # Les index uniques restent : ils portent des contraintes (email, nom)
+        indexes = [index for index in table.indexes if not index.unique]
+        triggers = []
+        if kind == 'places' and conn.dialect.name == 'sqlite':
+            triggers = ['places_fts_ai']
+        for index in indexes:
+            index.drop(conn, checkfirst=True)
+        for trigger in triggers:
+            conn.execute(db.text(f'DROP TRIGGER IF EXISTS {trigger}'))
+        return indexes, triggers
+
+    def _restore_deferred(self, conn, indexes, triggers):
+        if not indexes and not triggers:
+            return
+        started_at = time.perf_counter()
+        for index in indexes:
+            index.create(conn, checkfirst=True)
+        conn.commit()
+        if triggers:
+            # Le trigger est recréé et l'index plein texte reconstruit en une passe
+            from app.services.facade import HBnBFacade
+            HBnBFacade().rebuild_search_index()
+        logger.info("✅ Index reconstruits en %.1fs", time.perf_counter() - started_at)
+
+    # ---------- Préparation des lots ----------
+    def _prepare_users(self, conn, batch, report):
+        accepted = []
+        for line, row in batch:
+            try:
+                data = _require_row(row)
+                if data.get('password_hash'):
+                    # Mot de passe déjà haché : seules les autres règles s'appliquent
+                    User.validate_data(dict(data, password=data.get('password') or '-' * 6))
+                else:
+                    User.validate_data(data)
+                if data['email'] in self.users:
+                    report.skipped += 1
+                    continue
+                user = _base_row(data)
+                if user['id'] in self.user_ids:
+                    raise ValueError(f"Duplicate user id: {user['id']}")
+            except (ValueError, TypeError) as e:
+                report.reject(line, str(e))
+                continue
+            user.update(
+                first_name=data['first_name'],
+                last_name=data['last_name'],
+                email=data['email'],
+                password_hash=data.get('password_hash'),
+                is_admin=_as_bool(data.get('is_admin')),
+            )
+            self.users[user['email']] = user['id']
+            self.user_ids.add(user['id'])
+            accepted.append((user, data.get('password')))
+
+        to_hash = [password for user, password in accepted if not user['password_hash']]
+        hashes = iter(self._hash_all(to_hash))
+        for user, _ in accepted:
+            if not user['password_hash']:
+                user['password_hash'] = next(hashes)
+        report.imported += len(accepted)
+        return [(User.__table__, [user for user, _ in accepted])]
+
+    def _prepare_amenities(self, conn, batch, report):
+        amenities = []
+        for line, row in batch:
+            try:
+                data = _require_row(row)
+                Amenity.validate_data(data)
+                if data['name'] in self.amenities:
+                    report.skipped += 1
+                    continue
+                amenity = _base_row(data)
+                if amenity['id'] in self.amenity_ids:
+                    raise ValueError(f"Duplicate amenity id: {amenity['id']}")
+            except (ValueError, TypeError) as e:
+                report.reject(line, str(e))
+                continue
+            amenity['name'] = data['name']
+            self.amenities[amenity['name']] = amenity['id']
+            self.amenity_ids.add(amenity['id'])
+            amenities.append(amenity)
+        report.imported += len(amenities)
+        return [(Amenity.__table__, amenities)]
+
+    def _prepare_places(self, conn, batch, report):
+        pending = []
+        for line, row in batch:
+            try:
+                data = _require_row(row)
+                owner_id = data.get('owner_id') or self.users.get(data.get('owner_email'))
+                if (owner_id or data.get('owner_email')) and owner_id not in self.user_ids:
+                    raise ValueError(f"Owner not found: {data.get('owner_email') or owner_id}")
+                data['owner_id'] = owner_id
+                Place.validate_data(data)
+                names = data.get('amenities') or []
+                if isinstance(names, str):
+                    names = [name.strip() for name in names.split('|') if name.strip()]
+                if not isinstance(names, list):
+                    raise ValueError("amenities must be a list of names")
+                amenity_ids = []
+                for name in dict.fromkeys(names):
+                    if name not in self.amenities:
+                        raise ValueError(f"Amenity not found: {name}")
+                    amenity_ids.append(self.amenities[name])
+                place = _base_row(data)
+                if place['id'] in self.place_ids:
+                    raise ValueError(f"Duplicate place id: {place['id']}")
+                place.update(
+                    title=data['title'],
+                    description=data.get('description', ''),
+                    price=float(data['price']),
+                    latitude=float(data['latitude']),
+                    longitude=float(data['longitude']),
+                    owner_id=owner_id,
+                )
+            except (ValueError, TypeError) as e:
+                report.reject(line, str(e))
+                continue
+            pending.append((line, place, amenity_ids))
+
+        # Unicité de l'emplacement, contre la base puis à l'intérieur du lot
+        taken = PlaceCell.locations_in(conn, {
+            cell for _, p, _ in pending for cell in cells_around(p['latitude'], p['longitude'])
+        })
+        places, cells, links = [], [], []
+        for line, place, amenity_ids in pending:
+            latitude, longitude = place['latitude'], place['longitude']
+            if location_taken(taken, latitude, longitude):
+                report.reject(line, 'A place already exists at this location')
+                continue
+            cell = cell_of(latitude, longitude)
+            taken.setdefault(cell, []).append((latitude, longitude))
+            self.place_ids.add(place['id'])
+            places.append(place)
+            cells.append({'place_id': place['id'], 'cell_lat': cell[0], 'cell_lon': cell[1]})
+            links.extend({'place_id': place['id'], 'amenity_id': a} for a in amenity_ids)
+        report.imported += len(places)
+        return [(Place.__table__, places), (PlaceCell.__table__, cells), (PlaceAmenity.__table__, links)]
+
+    def _prepare_reviews(self, conn, batch, report):
+        # Pas de table des ids d'avis en mémoire : seuls les ids fournis par le lot sont cherchés
+        review_ids = self._existing_review_ids(conn, {
+            str(row['id']) for _, row in batch if isinstance(row, dict) and row.get('id')
+        })
+        reviews = []
+        for line, row in batch:
+            try:
+                data = _require_row(row)
+                user_id = data.get('user_id') or self.users.get(data.get('user_email'))
+                if user_id not in self.user_ids:
+                    raise ValueError(f"User not found: {data.get('user_email') or data.get('user_id')}")
+                place_id = data.get('place_id')
+                if not place_id and data.get('place_title'):
+                    key = (data.get('place_owner_email'), data['place_title'])
+                    if key not in self.place_keys:
+                        raise ValueError(f"Place not found: {key[1]} ({key[0]})")
+                    place_id = self.place_keys[key]
+                    if place_id is None:
+                        raise ValueError(f"Ambiguous place: {key[1]} ({key[0]})")
+                data.update(user_id=user_id, place_id=place_id)
+                Review.validate_data(data)
+                if place_id not in self.place_owners:
+                    raise ValueError(f"Place not found: {place_id}")
+                if self.place_owners[place_id] == user_id:
+                    raise ValueError("Owner cannot review their own place")
+                review = _base_row(data)
+                if review['id'] in review_ids:
+                    raise ValueError(f"Duplicate review id: {review['id']}")
+                review.update(text=data['text'], rating=int(data['rating']),
+                              user_id=user_id, place_id=place_id)
+            except (ValueError, TypeError) as e:
+                report.reject(line, str(e))
+                continue
+            self.touched_places.add(place_id)
+            review_ids.add(review['id'])
+            reviews.append(review)
+        report.imported += len(reviews)
+        return [(Review.__table__, reviews)]
+
+    def _existing_review_ids(self, conn, ids):
+        """Ids déjà en base (transaction courante comprise) parmi ceux fournis"""
+        ids = list(ids)
+        existing = set()
+        for start in range(0, len(ids), IMPORT_IDS_PER_QUERY):
+            existing.update(conn.execute(db.select(Review.id).where(
+                Review.id.in_(ids[start:start + IMPORT_IDS_PER_QUERY])
+            )).scalars())
+        return existing
+
+    def _finish(self, kind):
+        if kind == 'amenities':
+            cache.invalidate('amenities')
+        elif kind == 'places':
+            tile_cache.clear()
+            cache.invalidate('places')
+        elif kind == 'reviews' and self.touched_places:
+            from app.services.facade import HBnBFacade
+            touched = self.touched_places
+            HBnBFacade().repair_rating_aggregates(
+                list(touched) if len(touched) <= RATING_REPAIR_MAX_PLACES else None
+            )
+            cache.invalidate('places', *(f"place:{place_id}" for place_id in touched))
+
+
+def _require_row(row):
+    if not isinstance(row, dict):
+        raise ValueError("Invalid row: a JSON object is expected")
+    return dict(row)
+
+
+def _base_row(data):
+    """id (fourni ou généré) et horodatage (created_at ISO 8601 fourni ou maintenant)"""
+    created_at = data.get('created_at')
+    created_at = datetime.fromisoformat(created_at) if created_at else datetime.utcnow()
+    return {
+        'id': str(data.get('id') or new_id()),
+        'created_at': created_at,
+        'updated_at': created_at,
+    }
+
+
+def _as_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in TRUE_VALUES
+    return bool(value)
+
@@ -0,0 +1,99 @@
+import itertools
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+# Attributs standards d'un LogRecord : tout le reste vient de extra={...}
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par évènement ; les champs passés dans extra={...}
+    sont ajoutés tels quels à l'objet"""
+
+    def format(self, record):
+        data = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Ne laisse passer qu'un évènement DEBUG/INFO sur `rate`
+
+    Les WARNING et au-delà passent toujours : seul le volume des évènements
+    de routine (une ligne par requête...) est réduit.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self._counter = itertools.count()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._counter) % self.rate == 0
+
+
+class _HbnbHandler(logging.StreamHandler):
+    """Handler posé par configure_logging (remplacé à chaque appel)"""
+
+
+# Loggers réglés par configure_logging (remis à zéro à chaque appel)
+_leveled = set()
+_sampled = set()
+
+
+def configure_logging(app):
+    """Configure les logs du processus depuis la config de l'application
+
+    LOG_LEVEL      niveau par défaut (logger racine)
+    LOG_LEVELS     niveaux par module : {'app.services.facade': 'DEBUG', ...}
+    LOG_FORMAT     'json' (une ligne JSON par évènement) ou 'text'
+    LOG_SAMPLING   1 évènement DEBUG/INFO gardé sur N, par logger :
+                   {'app.services.query_stats': 10}
+    """
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, _HbnbHandler)]:
+        root.removeHandler(handler)
+
+    handler = _HbnbHandler(sys.stderr)
+    if app.config.get('LOG_FORMAT', 'json') == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+
+    for name in _leveled:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    _leveled.clear()
+    for name, level in app.config.get('LOG_LEVELS', {}).items():
+        logging.getLogger(name).setLevel(level)
+        _leveled.add(name)
+
+    for name in _sampled:
+        logger = logging.getLogger(name)
+        for existing in [f for f in logger.filters if isinstance(f, SamplingFilter)]:
+            logger.removeFilter(existing)
+    _sampled.clear()
+    for name, rate in app.config.get('LOG_SAMPLING', {}).items():
+        if rate > 1:
+            logging.getLogger(name).addFilter(SamplingFilter(rate))
+            _sampled.add(name)
+
+    # Le logger de l'application ('app') remonte au handler racine : sans
+    # cela Flask lui ajoute son propre handler et chaque ligne sort deux fois
+    from flask.logging import default_handler
+    app.logger.removeHandler(default_handler)
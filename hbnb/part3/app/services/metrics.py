@@ -0,0 +1,298 @@
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import Response, g, request
+
+# Bornes (secondes) de l'histogramme des durées de requête
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Route des requêtes sans règle (404) : évite une série par URL inconnue
+UNMATCHED_ROUTE = 'unmatched'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+ROUTE_KEY = 'hbnb.metrics.route'
+QUERIES_KEY = 'hbnb.metrics.queries'
+
+
+class _ThreadStore:
+    """Compteurs d'un thread : seul ce thread écrit, sans verrou"""
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.requests = {}   # (method, route, status) -> nombre
+        self.latency = {}    # (method, route) -> [compteurs par borne..., +Inf, somme, nombre]
+        self.db = {}         # (method, route) -> [secondes, requêtes SQL]
+        self.in_flight = {}  # route -> requêtes en cours
+
+    def merge(self, other):
+        """Ajoute les compteurs d'un autre store (lecture ou thread terminé)"""
+        for key, count in list(other.requests.items()):
+            self.requests[key] = self.requests.get(key, 0) + count
+        for key, values in list(other.latency.items()):
+            total = self.latency.setdefault(key, [0] * len(values))
+            for i, value in enumerate(list(values)):
+                total[i] += value
+        for key, (seconds, count) in list(other.db.items()):
+            total = self.db.setdefault(key, [0.0, 0])
+            total[0] += seconds
+            total[1] += count
+        for route, count in list(other.in_flight.items()):
+            self.in_flight[route] = self.in_flight.get(route, 0) + count
+
+
+class Metrics:
+    """Métriques HTTP au format texte Prometheus, servies sur /metrics
+
+    Chaque thread accumule dans son propre _ThreadStore ; la lecture
+    additionne les stores. Le store d'un thread terminé (serveur à un
+    thread par requête) est versé dans un total commun puis oublié. Avec METRICS_MULTIPROC_DIR, chaque processus
+    (worker gunicorn...) écrit régulièrement un instantané JSON dans ce
+    dossier et /metrics agrège ceux de tous les processus.
+
+    La mesure se fait dans un middleware WSGI : un seul hook Flask
+    (before_request) lit la route, pour rester sous ~10 µs par requête.
+    """
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        self._stores = []
+        self._retired = _ThreadStore()  # threads terminés, modifié sous self._lock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.multiproc_dir = None
+        self.flush_interval = 5.0
+        self._next_flush = 0.0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('METRICS_ENABLED', True):
+            return
+        self.multiproc_dir = app.config.get('METRICS_MULTIPROC_DIR')
+        self.flush_interval = app.config.get('METRICS_FLUSH_INTERVAL', 5.0)
+        if self.multiproc_dir:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            atexit.register(self.flush)
+
+        app.wsgi_app = _MetricsMiddleware(app.wsgi_app, self)
+        app.before_request(self._route_request)
+        app.add_url_rule(app.config.get('METRICS_PATH', '/metrics'), 'metrics', self.view)
+
+    # ---------- Enregistrement ----------
+    def _store(self):
+        store = getattr(self._local, 'store', None)
+        if store is None:
+            store = self._local.store = _ThreadStore(threading.current_thread())
+            with self._lock:
+                self._retire_finished()
+                self._stores.append(store)
+        return store
+
+    def _retire_finished(self):
+        """Verse les stores des threads terminés dans self._retired (sous self._lock)"""
+        alive = []
+        for store in self._stores:
+            if store.thread.is_alive():
+                alive.append(store)
+            else:
+                self._retired.merge(store)
+        self._stores = alive
+
+    def _route_request(self):
+        # Seul accès aux proxys Flask : le reste passe par l'environ WSGI
+        req = request._get_current_object()
+        route = req.url_rule.rule if req.url_rule else UNMATCHED_ROUTE
+        req.environ[ROUTE_KEY] = route
+        req.environ[QUERIES_KEY] = g.get('query_stats')
+        in_flight = self._store().in_flight
+        in_flight[route] = in_flight.get(route, 0) + 1
+
+    def record(self, environ, status, duration):
+        store = self._store()
+        route = environ.get(ROUTE_KEY)
+        if route is None:
+            route = UNMATCHED_ROUTE
+        else:
+            store.in_flight[route] -= 1
+        method = environ['REQUEST_METHOD']
+
+        key = (method, route, status)
+        store.requests[key] = store.requests.get(key, 0) + 1
+
+        key = (method, route)
+        latency = store.latency.get(key)
+        if latency is None:
+            latency = store.latency[key] = [0] * (len(LATENCY_BUCKETS) + 3)
+        latency[bisect_left(LATENCY_BUCKETS, duration)] += 1
+        latency[-2] += duration
+        latency[-1] += 1
+
+        queries = environ.get(QUERIES_KEY)
+        if queries is not None:
+            db = store.db.get(key)
+            if db is None:
+                db = store.db[key] = [0.0, 0]
+            db[0] += queries.db_time
+            db[1] += queries.count
+
+        if self.multiproc_dir and time.monotonic() >= self._next_flush:
+            self.flush()
+
+    # ---------- Agrégation ----------
+    def snapshot(self):
+        """Somme des stores des threads de ce processus, sérialisable en JSON"""
+        total = _ThreadStore()
+        with self._lock:
+            self._retire_finished()
+            stores = list(self._stores)
+            total.merge(self._retired)
+        for store in stores:
+            total.merge(store)
+        return {
+            'requests': [list(k) + [v] for k, v in total.requests.items()],
+            'latency': [list(k) + [v] for k, v in total.latency.items()],
+            'db': [list(k) + [v] for k, v in total.db.items()],
+            'in_flight': [[k, v] for k, v in total.in_flight.items()],
+        }
+
+    def _snapshot_path(self, pid):
+        return os.path.join(self.multiproc_dir, f'hbnb_metrics_{pid}.json')
+
+    def flush(self):
+        """Écrit l'instantané de ce processus dans METRICS_MULTIPROC_DIR"""
+        if not self.multiproc_dir or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_flush = time.monotonic() + self.flush_interval
+            path = self._snapshot_path(os.getpid())
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        finally:
+            self._flush_lock.release()
+
+    def collect(self):
+        """Instantanés de tous les processus (le nôtre lu en direct)"""
+        snapshots = [self.snapshot()]
+        if not self.multiproc_dir:
+            return snapshots
+        own = self._snapshot_path(os.getpid())
+        for path in glob.glob(os.path.join(self.multiproc_dir, 'hbnb_metrics_*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            # Les compteurs d'un worker arrêté restent acquis, pas ses requêtes en cours
+            pid = int(os.path.basename(path)[len('hbnb_metrics_'):-len('.json')])
+            if not _is_alive(pid):
+                snapshot['in_flight'] = []
+            snapshots.append(snapshot)
+        return snapshots
+
+    def render(self):
+        """Texte d'exposition Prometheus (format 0.0.4)"""
+        requests, latency, db, in_flight = {}, {}, {}, {}
+        for snapshot in self.collect():
+            for method, route, status, count in snapshot['requests']:
+                key = (method, route, str(status))
+                requests[key] = requests.get(key, 0) + count
+            for method, route, values in snapshot['latency']:
+                total = latency.setdefault((method, route), [0] * len(values))
+                for i, value in enumerate(values):
+                    total[i] += value
+            for method, route, (seconds, count) in snapshot['db']:
+                total = db.setdefault((method, route), [0.0, 0])
+                total[0] += seconds
+                total[1] += count
+            for route, count in snapshot['in_flight']:
+                in_flight[route] = in_flight.get(route, 0) + count
+
+        lines = [
+            '# HELP hbnb_http_requests_total HTTP requests handled, by route and status.',
+            '# TYPE hbnb_http_requests_total counter',
+        ]
+        for (method, route, status), count in sorted(requests.items()):
+            lines.append(f'hbnb_http_requests_total{_labels(method=method, route=route, status=status)} {count}')
+
+        lines += [
+            '# HELP hbnb_http_request_duration_seconds HTTP request latency.',
+            '# TYPE hbnb_http_request_duration_seconds histogram',
+        ]
+        for (method, route), values in sorted(latency.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), values):
+                cumulative += count
+                labels = _labels(method=method, route=route, le=str(bound))
+                lines.append(f'hbnb_http_request_duration_seconds_bucket{labels} {cumulative}')
+            labels = _labels(method=method, route=route)
+            lines.append(f'hbnb_http_request_duration_seconds_sum{labels} {values[-2]:.6f}')
+            lines.append(f'hbnb_http_request_duration_seconds_count{labels} {values[-1]}')
+
+        lines += [
+            '# HELP hbnb_http_requests_in_flight HTTP requests being handled.',
+            '# TYPE hbnb_http_requests_in_flight gauge',
+        ]
+        for route, count in sorted(in_flight.items()):
+            lines.append(f'hbnb_http_requests_in_flight{_labels(route=route)} {count}')
+
+        lines += [
+            '# HELP hbnb_db_seconds_total Time spent in SQL statements.',
+            '# TYPE hbnb_db_seconds_total counter',
+        ]
+        for (method, route), (seconds, _) in sorted(db.items()):
+            lines.append(f'hbnb_db_seconds_total{_labels(method=method, route=route)} {seconds:.6f}')
+        lines += [
+            '# HELP hbnb_db_queries_total SQL statements executed.',
+            '# TYPE hbnb_db_queries_total counter',
+        ]
+        for (method, route), (_, count) in sorted(db.items()):
+            lines.append(f'hbnb_db_queries_total{_labels(method=method, route=route)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def view(self):
+        return Response(self.render(), content_type=CONTENT_TYPE)
+
+
+class _MetricsMiddleware:
+    """Mesure chaque requête autour de l'application WSGI (statut final compris)"""
+
+    def __init__(self, wsgi_app, metrics):
+        self.wsgi_app = wsgi_app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        started_at = time.perf_counter()
+        status = [500]
+
+        def capture(status_line, headers, exc_info=None):
+            status[0] = int(status_line[:3])
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            return self.wsgi_app(environ, capture)
+        finally:
+            self.metrics.record(environ, status[0], time.perf_counter() - started_at)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _is_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,331 @@
+import logging
+import time
+from datetime import datetime, timezone
+from sqlalchemy import MetaData
+from sqlalchemy.schema import CreateTable
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place, PlaceAmenity, PlaceCell, PLACES_FTS_DDL
+from app.models.review import Review
+from app.models.purge_job import PurgeJob
+from app.services.geo import cell_of
+from app.services.ids import ID_STORAGE, uuid7
+
+logger = logging.getLogger(__name__)
+
+# Versions appliquées : une ligne par migration
+schema_migrations = db.Table(
+    'schema_migrations',
+    db.Column('version', db.Integer, primary_key=True),
+    db.Column('description', db.String(200), nullable=False),
+    db.Column('applied_at', db.DateTime, nullable=False),
+    db.Column('duration_ms', db.Float, nullable=False),
+)
+
+MIGRATIONS = []
+
+
+class Migration:
+    """Étape versionnée du schéma
+
+    upgrade(conn) reçoit une connexion hors transaction et committe
+    elle-même : une migration peut ainsi découper son travail (un index
+    par transaction) pour ne bloquer les écritures que brièvement. Chaque
+    étape est idempotente (IF NOT EXISTS, colonnes déjà présentes) : elle
+    amène au même schéma une base créée par db.create_all() ou une base
+    plus ancienne.
+    """
+
+    def __init__(self, version, description, upgrade):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+
+
+def migration(version, description):
+    def decorator(upgrade):
+        if any(m.version == version for m in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version: {version}")
+        MIGRATIONS.append(Migration(version, description, upgrade))
+        MIGRATIONS.sort(key=lambda m: m.version)
+        return upgrade
+    return decorator
+
+
+# ---------- Exécution ----------
+def applied_versions(conn):
+    schema_migrations.create(conn, checkfirst=True)
+    versions = dict(conn.execute(db.select(schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+    conn.commit()
+    return versions
+
+
+def migration_status():
+    """[{version, description, applied_at}] de toutes les migrations connues"""
+    with db.engine.connect() as conn:
+        applied = applied_versions(conn)
+    return [
+        {'version': m.version, 'description': m.description, 'applied_at': applied.get(m.version)}
+        for m in MIGRATIONS
+    ]
+
+
+def upgrade(target=None):
+    """Applique dans l'ordre les migrations en attente (jusqu'à target inclus)"""
+    done = []
+    with db.engine.connect() as conn:
+        applied = applied_versions(conn)
+        for step in MIGRATIONS:
+            if step.version in applied or (target is not None and step.version > target):
+                continue
+            logger.info("🔧 Migration %s: %s", step.version, step.description)
+            started_at = time.perf_counter()
+            try:
+                step.upgrade(conn)
+                conn.commit()
+                duration_ms = (time.perf_counter() - started_at) * 1000
+                conn.execute(db.insert(schema_migrations).values(
+                    version=step.version, description=step.description,
+                    applied_at=datetime.utcnow(), duration_ms=duration_ms,
+                ))
+                conn.commit()
+            except Exception as e:
+                logger.error("❌ Erreur migration %s: %s", step.version, e)
+                conn.rollback()
+                raise e
+            logger.info("✅ Migration %s appliquée en %.0f ms", step.version, duration_ms)
+            done.append({'version': step.version, 'description': step.description,
+                         'duration_ms': round(duration_ms, 1)})
+    return done
+
+
+# ---------- Outils des migrations ----------
+def create_indexes(conn, names):
+    """Crée les index nommés (définis sur les modèles) s'ils manquent
+
+    Un index par transaction : SQLite ne bloque les écritures que le temps
+    d'une construction, les lectures continuent (WAL). Sur PostgreSQL,
+    CREATE INDEX CONCURRENTLY ne bloque pas du tout les écritures.
+    """
+    indexes = {index.name: index for table in db.metadata.tables.values() for index in table.indexes}
+    for name in names:
+        index = indexes[name]
+        started_at = time.perf_counter()
+        if conn.dialect.name == 'postgresql':
+            columns = ', '.join(column.name for column in index.columns)
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as autocommit:
+                autocommit.exec_driver_sql(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {index.table.name} ({columns})'
+                )
+        else:
+            index.create(conn, checkfirst=True)
+            conn.commit()
+        logger.info("✅ Index %s prêt en %.0f ms", name, (time.perf_counter() - started_at) * 1000)
+
+
+def _columns(conn, table):
+    return {column['name'] for column in db.inspect(conn).get_columns(table)}
+
+
+# ---------- Réattribution des identifiants ----------
+REKEY_BATCH_SIZE = 10000
+FTS_TRIGGERS = ('places_fts_ai', 'places_fts_ad', 'places_fts_au')
+
+
+def rekey_ids(users=False, batch_size=REKEY_BATCH_SIZE):
+    """Réécrit les identifiants en UUIDv7 et dans le stockage ID_STORAGE (SQLite)
+
+    Pas une migration versionnée : les ids changent, donc les URL et les
+    références externes aussi. À lancer en maintenance, après `migrate`.
+    Chaque table est renommée, recréée selon le schéma courant (texte ou
+    16 octets), puis remplie dans l'ordre des created_at avec des UUIDv7
+    tirés de ces dates : les B-tree sont reconstruits pleins et dans l'ordre.
+    Les clés étrangères suivent la correspondance ancien -> nouvel id.
+    Les ids des utilisateurs ne changent qu'avec users=True (les jetons JWT
+    portent l'id : tous les utilisateurs devront se reconnecter) ; ils sont
+    de toute façon convertis au stockage courant. Tout se fait dans une
+    seule transaction, suivie d'un VACUUM.
+    """
+    tables = [User.__table__, Amenity.__table__, Place.__table__,
+              PlaceAmenity.__table__, PlaceCell.__table__, Review.__table__]
+    started_at = time.perf_counter()
+    report = {'storage': ID_STORAGE, 'users_rekeyed': users, 'rows': {}}
+    with db.engine.connect() as conn:
+        if conn.dialect.name != 'sqlite':
+            raise ValueError("rekey-ids only supports SQLite")
+        pending = [version for version in (m.version for m in MIGRATIONS) if version not in applied_versions(conn)]
+        if pending:
+            raise ValueError(f"Apply pending migrations first: {pending}")
+        logger.info("🔧 Réattribution des identifiants (stockage %s)", ID_STORAGE)
+        try:
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+            for trigger in FTS_TRIGGERS:
+                conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {trigger}')
+            old_tables = {}
+            for table in tables:
+                for index in table.indexes:
+                    conn.exec_driver_sql(f'DROP INDEX IF EXISTS {index.name}')
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} RENAME TO {table.name}__old')
+                old_tables[table.name] = table.to_metadata(MetaData(), name=f'{table.name}__old')
+                # Sans index : ils sont construits une fois la table remplie
+                conn.execute(CreateTable(table))
+
+            keys = {
+                'users': _copy_entities(conn, User.__table__, old_tables['users'], {}, batch_size, rekey=users),
+                'amenities': _copy_entities(conn, Amenity.__table__, old_tables['amenities'], {}, batch_size),
+            }
+            keys['places'] = _copy_entities(conn, Place.__table__, old_tables['places'],
+                                            {'owner_id': keys['users']}, batch_size)
+            _copy_entities(conn, Review.__table__, old_tables['reviews'],
+                           {'place_id': keys['places'], 'user_id': keys['users']}, batch_size, keep_keys=False)
+            _copy_links(conn, PlaceAmenity.__table__, old_tables['place_amenity'],
+                        {'place_id': keys['places'], 'amenity_id': keys['amenities']})
+            _copy_links(conn, PlaceCell.__table__, old_tables['place_cells'], {'place_id': keys['places']})
+
+            for table in tables:
+                report['rows'][table.name] = conn.execute(
+                    db.select(db.func.count()).select_from(table)).scalar()
+                conn.exec_driver_sql(f'DROP TABLE {table.name}__old')
+                for index in table.indexes:
+                    index.create(conn)
+            for statement in PLACES_FTS_DDL:
+                conn.exec_driver_sql(statement)
+            conn.exec_driver_sql("INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+            conn.commit()
+        except Exception as e:
+            logger.error("❌ Erreur réattribution des identifiants: %s", e)
+            conn.rollback()
+            raise e
+        conn.exec_driver_sql('VACUUM')
+    report['seconds'] = round(time.perf_counter() - started_at, 2)
+    logger.info("✅ Identifiants réattribués en %.1f s", report['seconds'])
+    return report
+
+
+def _time_ordered_ids():
+    """Générateur d'UUIDv7 à partir des created_at, croissant sur des dates triées"""
+    last = {'ms': None, 'counter': 0}
+
+    def next_id(created_at):
+        ms = int(created_at.replace(tzinfo=timezone.utc).timestamp() * 1000)
+        if last['ms'] is not None and ms <= last['ms']:
+            ms, counter = last['ms'], last['counter'] + 1
+            if counter > 0xFFF:
+                ms, counter = ms + 1, 0
+        else:
+            counter = 0
+        last['ms'], last['counter'] = ms, counter
+        return str(uuid7(ms, counter))
+    return next_id
+
+
+def _copy_entities(conn, table, old, foreign, batch_size, rekey=True, keep_keys=True):
+    """Copie old -> table par lots, dans l'ordre des created_at (ancien -> nouvel id si keep_keys)"""
+    keys = {}
+    next_id = _time_ordered_ids()
+    result = conn.execution_options(stream_results=True).execute(
+        db.select(old).order_by(old.c.created_at, old.c.id))
+    for rows in result.mappings().partitions(batch_size):
+        values = []
+        for row in rows:
+            row = dict(row)
+            new = next_id(row['created_at']) if rekey else row['id']
+            if keep_keys:
+                keys[row['id']] = new
+            row['id'] = new
+            for column, mapping in foreign.items():
+                row[column] = mapping.get(row[column], row[column])
+            values.append(row)
+        conn.execute(db.insert(table), values)
+    return keys
+
+
+def _copy_links(conn, table, old, foreign):
+    """Copie une table de liens, triée sur ses nouvelles clés"""
+    values = []
+    for row in conn.execute(db.select(old)).mappings():
+        row = dict(row)
+        for column, mapping in foreign.items():
+            row[column] = mapping.get(row[column], row[column])
+        values.append(row)
+    values.sort(key=lambda row: tuple(row[column.name] for column in table.primary_key.columns))
+    if values:
+        conn.execute(db.insert(table), values)
+
+
+# ---------- Migrations ----------
+@migration(1, "Agrégats des notes sur places (review_count, rating_sum, rating_avg, rating_1..5)")
+def add_rating_aggregates(conn):
+    existing = _columns(conn, 'places')
+    names = ['review_count', 'rating_sum', 'rating_avg'] + [f'rating_{n}' for n in range(1, 6)]
+    missing = [name for name in names if name not in existing]
+    for name in missing:
+        column = Place.__table__.c[name]
+        column_type = column.type.compile(dialect=conn.dialect)
+        conn.exec_driver_sql(
+            f'ALTER TABLE places ADD COLUMN {name} {column_type} NOT NULL DEFAULT {column.server_default.arg}'
+        )
+    conn.commit()
+    if missing:
+        from app.services.facade import HBnBFacade
+        HBnBFacade().repair_rating_aggregates()
+
+
+@migration(2, "Index spatial place_cells")
+def add_place_cells(conn):
+    PlaceCell.__table__.create(conn, checkfirst=True)
+    indexed = conn.execute(db.select(db.func.count()).select_from(PlaceCell)).scalar()
+    places = conn.execute(db.select(db.func.count()).select_from(Place)).scalar()
+    if indexed != places:
+        conn.execute(db.delete(PlaceCell))
+        rows = [
+            {'place_id': place_id, 'cell_lat': cell[0], 'cell_lon': cell[1]}
+            for place_id, cell in (
+                (place_id, cell_of(latitude, longitude))
+                for place_id, latitude, longitude in conn.execute(
+                    db.select(Place.id, Place.latitude, Place.longitude))
+            )
+        ]
+        if rows:
+            conn.execute(db.insert(PlaceCell), rows)
+    conn.commit()
+
+
+@migration(3, "Index plein texte places_fts (SQLite)")
+def add_places_fts(conn):
+    if conn.dialect.name != 'sqlite':
+        return
+    exists = conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'places_fts'"
+    ).first()
+    for statement in PLACES_FTS_DDL:
+        conn.exec_driver_sql(statement)
+    if not exists:
+        conn.exec_driver_sql("INSERT INTO places_fts(places_fts) VALUES ('rebuild')")
+    conn.commit()
+
+
+@migration(4, "Index des clés étrangères et index composites de pagination")
+def add_foreign_key_indexes(conn):
+    create_indexes(conn, [
+        # Avis d'un auteur (get_reviews_by_user, delete_user)
+        'ix_reviews_user_id_created_at',
+        # Avis d'un lieu, page par date puis par note (préfixe place_id : clé étrangère)
+        'ix_reviews_place_id_created_at_id',
+        'ix_reviews_place_id_rating_created_at',
+        # Lieux d'un propriétaire (tableau de bord, get_places_by_owner, delete_user)
+        'ix_places_owner_id_created_at',
+        # Lieux d'une amenity (delete_amenity, filtre amenity=)
+        'ix_place_amenity_amenity_id',
+        # Liste des lieux : pagination et tris
+        'ix_places_created_at_id',
+        'ix_places_price_id',
+        'ix_places_rating_avg_id',
+    ])
+
+
+@migration(5, "Table purge_jobs (suppression d'utilisateurs par lots)")
+def add_purge_jobs(conn):
+    PurgeJob.__table__.create(conn, checkfirst=True)
+    conn.commit()
@@ -0,0 +1,231 @@
+import cProfile
+import glob
+import itertools
+import json
+import logging
+import os
+import pstats
+import re
+import time
+import uuid
+from datetime import datetime, timezone
+from flask import g, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID = re.compile(r'^\d{10}-[0-9a-f]{8}$')
+# Chemins de pile plus courts que ce temps (secondes) absents du fichier replié
+MIN_STACK_TIME = 1e-6
+MAX_STACK_DEPTH = 200
+
+
+class Profiler:
+    """Profilage cProfile de requêtes choisies
+
+    Une requête est profilée si un admin (claim is_admin) envoie l'en-tête
+    X-Profile: 1, ou par échantillonnage : 1 requête sur
+    PROFILE_SAMPLE_RATE par route. Chaque profil est rangé dans
+    PROFILE_DIR (instance/profiles par défaut) sous trois formes :
+    <id>.prof (pstats), <id>.collapsed (piles repliées pour flamegraph.pl
+    ou speedscope) et <id>.json (requête, statut, durée). L'identifiant
+    est renvoyé dans l'en-tête X-Profile-Id.
+    """
+
+    def __init__(self, app=None):
+        self.directory = None
+        self.sample_rate = 0
+        self.max_profiles = 200
+        self._counters = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED', True):
+            return
+        self.directory = app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+        self.sample_rate = app.config.get('PROFILE_SAMPLE_RATE', 0)
+        self.max_profiles = app.config.get('PROFILE_MAX_FILES', 200)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._teardown)
+
+    # ---------- Déclenchement ----------
+    def _trigger(self):
+        if request.headers.get('X-Profile') == '1' and _is_admin():
+            return 'header'
+        if self.sample_rate > 0:
+            route = request.url_rule.rule if request.url_rule else None
+            counter = self._counters.setdefault(route, itertools.count())
+            if next(counter) % self.sample_rate == 0:
+                return 'sample'
+        return None
+
+    def _start(self):
+        trigger = self._trigger()
+        if trigger is None:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Un autre profileur est déjà actif sur ce thread
+            return
+        g.profile = (profile, trigger, time.perf_counter())
+
+    def _finish(self, response):
+        current = g.pop('profile', None)
+        if current is None:
+            return response
+        profile, trigger, started_at = current
+        profile.disable()
+        duration = time.perf_counter() - started_at
+
+        profile_id = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+        meta = {
+            'id': profile_id,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'trigger': trigger,
+            'method': request.method,
+            'path': request.full_path.rstrip('?'),
+            'route': request.url_rule.rule if request.url_rule else None,
+            'status': response.status_code,
+            'duration_ms': round(duration * 1000, 2),
+        }
+        try:
+            self._save(profile_id, profile, meta)
+        except OSError as e:
+            logger.error("❌ Erreur enregistrement profil: %s", e)
+            return response
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    def _teardown(self, exc):
+        # Requête interrompue avant after_request : ne pas laisser le profileur actif
+        current = g.pop('profile', None)
+        if current is not None:
+            current[0].disable()
+
+    # ---------- Stockage ----------
+    def _path(self, profile_id, extension):
+        return os.path.join(self.directory, f'{profile_id}.{extension}')
+
+    def _save(self, profile_id, profile, meta):
+        os.makedirs(self.directory, exist_ok=True)
+        stats = pstats.Stats(profile)
+        stats.dump_stats(self._path(profile_id, 'prof'))
+        with open(self._path(profile_id, 'collapsed'), 'w') as f:
+            for stack, seconds in collapsed_stacks(stats):
+                f.write(f'{stack} {round(seconds * 1e6)}\n')
+        with open(self._path(profile_id, 'json'), 'w') as f:
+            json.dump(meta, f)
+        self._prune()
+
+    def _prune(self):
+        """Ne garde que les PROFILE_MAX_FILES profils les plus récents"""
+        metas = sorted(glob.glob(os.path.join(self.directory, '*.json')))
+        for path in metas[:max(len(metas) - self.max_profiles, 0)]:
+            profile_id = os.path.basename(path)[:-len('.json')]
+            for extension in ('json', 'prof', 'collapsed'):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass
+
+    # ---------- Lecture ----------
+    def list_profiles(self, limit=50):
+        """Métadonnées des profils, du plus récent au plus ancien"""
+        if not self.directory:
+            return []
+        metas = []
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.json')), reverse=True)[:limit]:
+            try:
+                with open(path) as f:
+                    metas.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return metas
+
+    def profile_path(self, profile_id, extension):
+        """Chemin d'un fichier de profil existant, ou None"""
+        if not self.directory or not PROFILE_ID.match(profile_id):
+            return None
+        path = self._path(profile_id, extension)
+        return path if os.path.exists(path) else None
+
+    def get_profile(self, profile_id, top=30):
+        """Métadonnées et fonctions les plus coûteuses (temps cumulé)"""
+        meta_path = self.profile_path(profile_id, 'json')
+        stats_path = self.profile_path(profile_id, 'prof')
+        if meta_path is None or stats_path is None:
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        stats = pstats.Stats(stats_path).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        meta['functions'] = [
+            {
+                'function': _frame_name(func),
+                'calls': nc,
+                'primitive_calls': cc,
+                'tottime_ms': round(tt * 1000, 3),
+                'cumtime_ms': round(ct * 1000, 3),
+            }
+            for func, (cc, nc, tt, ct, _) in rows
+        ]
+        return meta
+
+
+def collapsed_stacks(stats):
+    """Piles repliées ('a;b;c', secondes) reconstruites depuis un pstats
+
+    cProfile ne garde que les arcs appelant -> appelé : le temps d'une
+    fonction appelée depuis plusieurs endroits est réparti entre ses
+    appelants au prorata du temps de chaque arc, ce qui suffit pour un
+    flamegraph.
+    """
+    entries = stats.stats
+    callees = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, entry in entries.items() if not any(c in entries for c in entry[4])]
+
+    results = []
+
+    def walk(func, stack, names, share):
+        _, _, tottime, cumtime, _ = entries[func]
+        names.append(_frame_name(func).replace(';', ','))
+        stack.add(func)
+        own = tottime * share
+        if own >= MIN_STACK_TIME:
+            results.append((';'.join(names), own))
+        if len(names) < MAX_STACK_DEPTH:
+            for callee, edge_cumtime in callees.get(func, ()):
+                callee_cumtime = entries[callee][3]
+                if callee in stack or not callee_cumtime:
+                    continue
+                callee_share = share * edge_cumtime / callee_cumtime
+                if callee_cumtime * callee_share >= MIN_STACK_TIME:
+                    walk(callee, stack, names, callee_share)
+        stack.discard(func)
+        names.pop()
+
+    for root in roots:
+        walk(root, set(), [], 1.0)
+    return results
+
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f'{os.path.basename(filename)}:{name}:{line}'
+
+
+def _is_admin():
+    try:
+        verify_jwt_in_request(optional=True)
+        return bool(get_jwt().get('is_admin'))
+    except Exception:
+        return False
@@ -0,0 +1,101 @@
+import logging
+import threading
+from datetime import datetime
+from flask import current_app
+from app.extensions import db
+from app.models.purge_job import PurgeJob
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+def start_purge(user_id, background=True):
+    """Crée le job de purge d'un utilisateur et le lance dans un thread
+
+    Un job encore actif pour cet utilisateur est renvoyé tel quel : un
+    second DELETE ne lance pas de purge concurrente. Lève ValueError si
+    l'utilisateur n'existe pas. background=False : l'appelant exécute
+    lui-même run_purge (commande CLI).
+    """
+    from app.services.facade import HBnBFacade
+
+    job = PurgeJob.query.filter(PurgeJob.user_id == user_id, PurgeJob.status.in_(ACTIVE_STATUSES)).first()
+    if job is not None:
+        return job
+    inventory = HBnBFacade().get_user_inventory(user_id)
+    if inventory is None:
+        raise ValueError("User not found")
+    try:
+        job = PurgeJob(user_id=user_id, places_total=inventory['places'], reviews_total=inventory['reviews'])
+        db.session.add(job)
+        db.session.commit()
+    except Exception as e:
+        logger.error("❌ Erreur création purge: %s", e)
+        db.session.rollback()
+        raise e
+    logger.info("🔧 Purge %s : utilisateur %s, %s lieux, %s avis",
+                job.id, user_id, job.places_total, job.reviews_total)
+
+    if background:
+        app = current_app._get_current_object()
+        threading.Thread(target=_run_in_thread, args=(app, job.id),
+                         name=f'hbnb-purge-{job.id[-12:]}', daemon=True).start()
+    return job
+
+
+def run_purge(job_id, chunk_size=None, progress=None):
+    """Exécute (ou reprend) un job : une transaction par lot de chunk_size lieux
+
+    Chaque étape est idempotente : un job interrompu (redémarrage,
+    erreur) reprend là où il en était. progress(job) est appelé après
+    chaque lot. Renvoie le job ; en cas d'échec, son statut est 'failed'
+    et son champ error renseigné.
+    """
+    from app.services.facade import HBnBFacade
+
+    facade = HBnBFacade()
+    chunk_size = chunk_size or current_app.config.get('PURGE_CHUNK_SIZE', 200)
+    job = db.session.get(PurgeJob, job_id)
+    if job is None:
+        raise ValueError("Purge job not found")
+    job.status, job.error, job.finished_at = 'running', None, None
+    db.session.commit()
+
+    try:
+        while True:
+            deleted = facade.purge_user_step(job.user_id, chunk_size)
+            if deleted is None:
+                break
+            job.places_deleted += deleted['places']
+            job.reviews_deleted += deleted['reviews']
+            db.session.commit()
+            if progress:
+                progress(job)
+        # Il ne reste que l'utilisateur (et ses éventuels ajouts de dernière minute)
+        try:
+            facade.delete_user(job.user_id)
+        except ValueError:
+            pass  # déjà supprimé
+        job.status, job.finished_at = 'done', datetime.utcnow()
+        db.session.commit()
+        logger.info("✅ Purge %s terminée : %s lieux, %s avis",
+                    job.id, job.places_deleted, job.reviews_deleted)
+
+    except Exception as e:
+        logger.error("❌ Erreur purge %s: %s", job_id, e)
+        db.session.rollback()
+        job = db.session.get(PurgeJob, job_id)
+        job.status, job.error, job.finished_at = 'failed', str(e), datetime.utcnow()
+        db.session.commit()
+    return job
+
+
+def _run_in_thread(app, job_id):
+    with app.app_context():
+        try:
+            run_purge(job_id)
+        except Exception as e:
+            logger.error("❌ Erreur purge %s: %s", job_id, e)
+        finally:
+            db.session.remove()
@@ -0,0 +1,153 @@
+import logging
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_SPACES = re.compile(r'\s+')
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PARAM_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_REPEATED_LISTS = re.compile(r'\(\?\)(?:\s*,\s*\(\?\))+')
+
+
+def fingerprint(statement):
+    """Forme normalisée d'une requête SQL : littéraux et listes IN réduits à ?
+
+    Deux requêtes ne différant que par leurs valeurs (ou le nombre d'IDs
+    d'un IN) ont la même forme.
+    """
+    shape = _SPACES.sub(' ', statement).strip()
+    shape = _STRINGS.sub('?', shape)
+    shape = _NUMBERS.sub('?', shape)
+    shape = _PARAM_LIST.sub('(?)', shape)
+    return _REPEATED_LISTS.sub('(?)', shape)
+
+
+class RepeatedQueryError(RuntimeError):
+    """Une requête HTTP a répété la même forme de requête SQL (N+1 probable)"""
+
+
+class RequestQueries:
+    """Requêtes SQL exécutées pendant une requête HTTP"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.count = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.db_time += duration
+        self.shapes[fingerprint(statement)] += 1
+
+    def most_repeated(self):
+        """(forme, nombre) de la requête la plus répétée, ou (None, 0)"""
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+
+class QueryStats:
+    """Compte les requêtes SQL et leur durée par requête HTTP
+
+    Les totaux sont exposés dans l'en-tête Server-Timing et dans un
+    évènement de log 'request' (voir app/services/logs.py). En mode strict
+    (QUERY_STRICT, activé par TestingConfig), une requête HTTP qui répète
+    la même forme de requête plus de QUERY_REPEAT_LIMIT fois lève
+    RepeatedQueryError.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('QUERY_STATS_ENABLED', True)
+        app.config.setdefault('QUERY_STATS_SERVER_TIMING', True)
+        app.config.setdefault('QUERY_STRICT', False)
+        app.config.setdefault('QUERY_REPEAT_LIMIT', 10)
+        if not app.config['QUERY_STATS_ENABLED']:
+            return
+
+        if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+
+
+def current_queries():
+    """Compteurs de la requête HTTP en cours, ou None hors requête"""
+    if not has_app_context():
+        return None
+    return g.get('query_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started_at', []).append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _, started_at = conn.info['query_started_at'].pop()
+    queries = current_queries()
+    if queries is not None:
+        queries.record(statement, time.perf_counter() - started_at)
+
+
+def _handle_error(exception_context):
+    # Une requête en échec ne passe pas par after_cursor_execute : retirer
+    # son départ, sinon la pile dérive sur cette connexion du pool
+    conn = exception_context.connection
+    started = conn.info.get('query_started_at') if conn is not None else None
+    if started and started[-1][0] is exception_context.execution_context:
+        started.pop()
+
+
+def _start_request():
+    g.query_stats = RequestQueries()
+
+
+def _finish_request(response):
+    queries = g.get('query_stats')
+    if queries is None:
+        return response
+
+    total_ms = (time.perf_counter() - queries.started_at) * 1000
+    db_ms = queries.db_time * 1000
+    shape, repeats = queries.most_repeated()
+
+    if current_app.config['QUERY_STATS_SERVER_TIMING']:
+        response.headers.add(
+            'Server-Timing', f'db;dur={db_ms:.2f};desc="{queries.count} queries", app;dur={total_ms:.2f}'
+        )
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            '%s %s %s %.2fms %d queries', request.method, request.path, response.status_code,
+            total_ms, queries.count,
+            extra={
+                'event': 'request',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': round(total_ms, 2),
+                'db_queries': queries.count,
+                'db_time_ms': round(db_ms, 2),
+                'max_repeats': repeats,
+            },
+        )
+
+    limit = current_app.config['QUERY_REPEAT_LIMIT']
+    if current_app.config['QUERY_STRICT'] and repeats > limit:
+        raise RepeatedQueryError(
+            f"{request.method} {request.path} ran the same query {repeats} times "
+            f"(limit {limit}): {shape}"
+        )
+    return response
@@ -0,0 +1,23 @@
+import re
+
+# Marqueurs de mise en évidence des extraits renvoyés par la recherche
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+SNIPPET_TOKENS = 12
+# Poids bm25 des colonnes (title, description) de places_fts
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_WORD_REGEX = re.compile(r"\w+", re.UNICODE)
+
+
+def to_fts_query(text):
+    """Transforme une saisie libre en requête FTS5 sûre
+
+    Chaque mot devient un terme entre guillemets avec recherche par préfixe,
+    combinés en ET : la syntaxe FTS5 de l'utilisateur n'est jamais interprétée.
+    """
+    words = _WORD_REGEX.findall(text or '')
+    if not words:
+        raise ValueError("Search query must contain at least one word")
+    return ' '.join(f'"{word}"*' for word in words)
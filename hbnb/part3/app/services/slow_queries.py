@@ -0,0 +1,223 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.query_stats import fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Plans déjà calculés, par forme de requête (bornés : les formes sont peu nombreuses)
+MAX_CACHED_PLANS = 512
+# Tris de aggregate() : critère -> champ du groupe
+SLOW_QUERY_SORTS = {'total': 'total_ms', 'count': 'count', 'max': 'max_ms', 'recent': 'last_seen'}
+# Parcours complet d'une table : 'SCAN places' (sans index, hors table virtuelle FTS)
+_FULL_SCAN = re.compile(r'^SCAN (?!CONSTANT ROW)([^\s(]+)(?: AS \S+)?$')
+
+
+class SlowQueryLog:
+    """Journal des requêtes SQL plus lentes que SLOW_QUERY_THRESHOLD_MS
+
+    Chaque requête lente est écrite en JSON dans un fichier tournant
+    (SLOW_QUERY_FILE, instance/slow_queries.log par défaut) avec sa forme
+    (fingerprint), la forme de ses paramètres, sa durée, la route HTTP et,
+    sur SQLite, son EXPLAIN QUERY PLAN et les tables parcourues en entier.
+    aggregate() relit les fichiers et regroupe les entrées par forme : tous
+    les processus qui écrivent dans le même fichier sont couverts.
+    """
+
+    def __init__(self, app=None):
+        self.threshold = 0.1
+        self.explain = True
+        self.path = None
+        self._plans = {}
+        self._plans_lock = threading.Lock()
+        self._file_logger = logging.getLogger(f'{__name__}.file')
+        self._file_logger.propagate = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if not app.config.get('SLOW_QUERY_ENABLED', True):
+            return
+        self.threshold = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+        self.explain = app.config.get('SLOW_QUERY_EXPLAIN', True)
+        self.path = app.config.get('SLOW_QUERY_FILE') or os.path.join(app.instance_path, 'slow_queries.log')
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        for handler in list(self._file_logger.handlers):
+            self._file_logger.removeHandler(handler)
+            handler.close()
+        handler = RotatingFileHandler(
+            self.path,
+            maxBytes=app.config.get('SLOW_QUERY_FILE_MAX_BYTES', 5 * 1024 * 1024),
+            backupCount=app.config.get('SLOW_QUERY_BACKUP_COUNT', 3),
+            encoding='utf-8',
+            delay=True,
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._file_logger.addHandler(handler)
+        self._file_logger.setLevel(logging.INFO)
+
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+            event.listen(Engine, 'handle_error', self._handle_error)
+
+    # ---------- Mesure ----------
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_started_at', []).append((context, time.perf_counter()))
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('slow_query_started_at')
+        if not started:
+            return
+        duration = time.perf_counter() - started.pop()[1]
+        if duration < self.threshold:
+            return
+        try:
+            self.record(conn, cursor, statement, parameters, executemany, duration)
+        except Exception as e:
+            logger.error("❌ Erreur journal des requêtes lentes: %s", e)
+
+    def _handle_error(self, exception_context):
+        # Requête en échec : pas d'after_cursor_execute, on retire son départ
+        conn = exception_context.connection
+        started = conn.info.get('slow_query_started_at') if conn is not None else None
+        if started and started[-1][0] is exception_context.execution_context:
+            started.pop()
+
+    def record(self, conn, cursor, statement, parameters, executemany, duration):
+        shape = fingerprint(statement)
+        plan = None
+        if self.explain and conn.dialect.name == 'sqlite':
+            plan = self._plan(cursor, shape, statement, parameters[0] if executemany and parameters else parameters)
+        entry = {
+            'ts': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'fingerprint': shape,
+            'statement': statement,
+            'params': params_shape(parameters, executemany),
+            'duration_ms': round(duration * 1000, 3),
+            'endpoint': request.endpoint if has_request_context() else None,
+            'plan': plan,
+            'full_scans': full_scans(plan),
+        }
+        self._file_logger.info(json.dumps(entry, default=str))
+        logger.warning("🐢 Requête lente (%.1f ms): %s", duration * 1000, shape[:200])
+
+    def _plan(self, cursor, shape, statement, parameters):
+        """EXPLAIN QUERY PLAN, exécuté sur la connexion DBAPI (hors événements)"""
+        with self._plans_lock:
+            if shape in self._plans:
+                return self._plans[shape]
+        try:
+            rows = cursor.connection.execute(f'EXPLAIN QUERY PLAN {statement}', parameters or ()).fetchall()
+        except Exception:
+            return None
+        plan = format_plan(rows)
+        with self._plans_lock:
+            if len(self._plans) >= MAX_CACHED_PLANS:
+                self._plans.pop(next(iter(self._plans)))
+            self._plans[shape] = plan
+        return plan
+
+    # ---------- Lecture ----------
+    def _files(self):
+        if not self.path:
+            return []
+        directory, name = os.path.split(self.path)
+        if not os.path.isdir(directory):
+            return []
+        return [
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f == name or (f.startswith(f'{name}.') and f[len(name) + 1:].isdigit())
+        ]
+
+    def aggregate(self, limit=20, sort='total'):
+        """Entrées du journal regroupées par forme de requête"""
+        groups = {}
+        for path in self._files():
+            try:
+                with open(path, encoding='utf-8') as f:
+                    lines = f.readlines()
+            except OSError:
+                continue
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                group = groups.get(entry['fingerprint'])
+                if group is None:
+                    group = groups[entry['fingerprint']] = {
+                        'fingerprint': entry['fingerprint'],
+                        'count': 0,
+                        'total_ms': 0.0,
+                        'max_ms': 0.0,
+                        'last_seen': None,
+                        'endpoints': {},
+                    }
+                group['count'] += 1
+                group['total_ms'] += entry['duration_ms']
+                endpoint = entry['endpoint'] or '(hors requête)'
+                group['endpoints'][endpoint] = group['endpoints'].get(endpoint, 0) + 1
+                if entry['duration_ms'] >= group['max_ms']:
+                    group['max_ms'] = entry['duration_ms']
+                if group['last_seen'] is None or entry['ts'] >= group['last_seen']:
+                    # L'entrée la plus récente donne l'exemple et le plan courant
+                    group.update(
+                        last_seen=entry['ts'], statement=entry['statement'], params=entry['params'],
+                        plan=entry['plan'], full_scans=entry['full_scans'],
+                    )
+
+        for group in groups.values():
+            group['total_ms'] = round(group['total_ms'], 3)
+            group['avg_ms'] = round(group['total_ms'] / group['count'], 3)
+        key = SLOW_QUERY_SORTS[sort]
+        return sorted(groups.values(), key=lambda g: g[key], reverse=True)[:limit]
+
+
+def params_shape(parameters, executemany=False):
+    """Types des paramètres, sans leurs valeurs : ['str', 'int*3'] ou
+    {'rows': n, 'row': [...]} pour un executemany"""
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'row': params_shape(rows[0]) if rows else []}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    shape = []
+    for value in parameters or ():
+        name = type(value).__name__
+        if shape and shape[-1][0] == name:
+            shape[-1][1] += 1
+        else:
+            shape.append([name, 1])
+    return [name if count == 1 else f'{name}*{count}' for name, count in shape]
+
+
+def format_plan(rows):
+    """Lignes (id, parent, _, détail) d'EXPLAIN QUERY PLAN, indentées par niveau"""
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append('  ' * depth[node_id] + detail)
+    return lines
+
+
+def full_scans(plan):
+    """Tables parcourues en entier (sans index) d'après un plan formaté"""
+    if not plan:
+        return []
+    tables = []
+    for line in plan:
+        match = _FULL_SCAN.match(line.strip())
+        if match and match.group(1) not in tables:
+            tables.append(match.group(1))
+    return tables
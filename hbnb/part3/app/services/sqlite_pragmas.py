@@ -0,0 +1,52 @@
+import logging
+import re
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Nom et valeur d'un PRAGMA interpolés dans le SQL : formes simples uniquement
+_PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+_PRAGMA_VALUE = re.compile(r'^-?[A-Za-z0-9_]+$')
+
+
+class SqlitePragmas:
+    """PRAGMA appliqués à chaque nouvelle connexion SQLite (SQLITE_PRAGMAS)
+
+    Un hook 'connect' sur le moteur de l'application exécute les PRAGMA
+    dans l'ordre de la configuration, une fois par connexion : le pool
+    garde ensuite la connexion ouverte avec ses réglages et son cache de
+    pages. Sans effet sur un autre SGBD ou si SQLITE_PRAGMAS est vide.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app.extensions import db
+
+        pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+        for name, value in pragmas.items():
+            if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid SQLite pragma: {name}={value}")
+        with app.app_context():
+            engine = db.engine
+        if engine.dialect.name != 'sqlite' or not pragmas:
+            return
+        statements = [f'PRAGMA {name} = {value}' for name, value in pragmas.items()]
+
+        @event.listens_for(engine, 'connect')
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for statement in statements:
+                    cursor.execute(statement)
+            finally:
+                cursor.close()
+
+        logger.debug("🔧 PRAGMA SQLite: %s", pragmas)
+
+
+def current_pragmas(connection, names):
+    """Valeurs effectives des PRAGMA sur une connexion SQLAlchemy"""
+    return {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
@@ -0,0 +1,83 @@
+import math
+import threading
+from collections import OrderedDict
+from app.services.write_queue import after_commit
+
+# Tuiles XYZ (Web Mercator) comme Leaflet / OpenStreetMap
+MAX_ZOOM = 18
+# Jusqu'à ce zoom inclus, les lieux sont regroupés en clusters
+CLUSTER_MAX_ZOOM = 12
+# Nombre de clusters par côté de tuile (au plus)
+CLUSTERS_PER_TILE_SIDE = 8
+MAX_TILES_PER_REQUEST = 64
+# Nombre maximum de lieux renvoyés par tuile hors clustering
+MAX_PLACES_PER_TILE = 500
+MERCATOR_MAX_LAT = 85.05112878
+
+
+def tile_of(latitude, longitude, zoom):
+    """Tuile (x, y) contenant un point au zoom donné"""
+    n = 2 ** zoom
+    lat = max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, float(latitude)))
+    x = int((float(longitude) + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_bounds(zoom, x, y):
+    """Bornes (min_lat, max_lat, min_lon, max_lon) d'une tuile"""
+    n = 2 ** zoom
+
+    def lat_of(row):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lat_of(y + 1), lat_of(y), x / n * 360.0 - 180.0, (x + 1) / n * 360.0 - 180.0
+
+
+def tiles_for_bbox(min_lon, min_lat, max_lon, max_lat, zoom):
+    """Liste des tuiles (x, y) couvrant une bbox au zoom donné"""
+    min_x, max_y = tile_of(min_lat, min_lon, zoom)
+    max_x, min_y = tile_of(max_lat, max_lon, zoom)
+    return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+
+class TileCache:
+    """Cache LRU en mémoire des tuiles calculées, clé (zoom, x, y)"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_point(self, latitude, longitude):
+        """Supprime, à chaque zoom, la tuile contenant ce point (après le commit)"""
+        if latitude is None or longitude is None:
+            return
+        after_commit(self._drop_point, latitude, longitude)
+
+    def _drop_point(self, latitude, longitude):
+        with self._lock:
+            for zoom in range(MAX_ZOOM + 1):
+                x, y = tile_of(latitude, longitude, zoom)
+                self._entries.pop((zoom, x, y), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+tile_cache = TileCache()
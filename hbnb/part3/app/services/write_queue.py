@@ -0,0 +1,251 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from functools import wraps
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# État du thread writer : lot en cours (callbacks après commit)
+_local = threading.local()
+
+
+class BatchSession(Session):
+    """Session Flask-SQLAlchemy compatible avec le commit groupé
+
+    Hors d'un lot du writer, rien ne change. Dans un lot, chaque écriture
+    tourne dans son savepoint : commit() se limite à un flush (le writer
+    committe le lot entier) et rollback() n'annule que ce savepoint, sans
+    toucher aux écritures voisines du même lot.
+    """
+
+    def commit(self):
+        if self.info.get('write_savepoint') is None:
+            return super().commit()
+        self.flush()
+
+    def rollback(self):
+        savepoint = self.info.get('write_savepoint')
+        if savepoint is None:
+            return super().rollback()
+        if savepoint.is_active:
+            savepoint.rollback()
+
+
+def after_commit(callback, *args):
+    """Exécute callback(*args) une fois le lot en cours committé (tout de suite hors lot)
+
+    Invalider un cache avant le commit laisserait un lecteur concurrent y
+    remettre l'ancienne version.
+    """
+    pending = getattr(_local, 'after_commit', None)
+    if pending is None:
+        callback(*args)
+    else:
+        pending.append((callback, args))
+
+
+def queued(method):
+    """Fait passer une méthode d'écriture du facade par le writer de l'application
+
+    Sans writer (WRITE_QUEUE_ENABLED à False, hors contexte d'application)
+    ou depuis le writer lui-même, la méthode s'exécute directement.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        writer = None
+        if has_app_context() and getattr(_local, 'after_commit', None) is None:
+            writer = current_app.extensions.get('write_queue')
+        if writer is None:
+            return method(*args, **kwargs)
+        return writer.submit(method, args, kwargs)
+    return wrapper
+
+
+class WriteQueue:
+    """File d'écritures SQLite servie par un thread writer unique
+
+    Les méthodes @queued du facade déposent leur appel dans la file et
+    attendent leur résultat. Le writer prend le premier appel, accumule
+    ceux qui arrivent pendant WRITE_QUEUE_WINDOW_MS (au plus
+    WRITE_QUEUE_MAX_BATCH), les exécute chacun dans un savepoint d'une même
+    transaction BEGIN IMMEDIATE puis committe une seule fois : un fsync par
+    lot au lieu d'un par écriture, et plus de concurrence entre écrivains
+    sur le verrou de la base. Chaque appelant reçoit son propre résultat
+    ou sa propre exception. Si le commit du lot échoue, les écritures
+    réussies sont rejouées une par une.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app.extensions import db
+
+        app.extensions.pop('write_queue', None)
+        if not app.config.get('WRITE_QUEUE_ENABLED', False):
+            return
+        with app.app_context():
+            engine = db.engine
+        if engine.dialect.name == 'sqlite':
+            if engine.url.database in (None, '', ':memory:'):
+                logger.warning("⚠️ File d'écritures ignorée : base SQLite en mémoire (une base par connexion)")
+                return
+
+            @event.listens_for(engine, 'begin')
+            def begin_immediate(conn):
+                # Le writer prend le verrou d'écriture dès le début du lot
+                if getattr(_local, 'after_commit', None) is not None:
+                    conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+        app.extensions['write_queue'] = _Writer(
+            app,
+            max_batch=app.config.get('WRITE_QUEUE_MAX_BATCH', 64),
+            window=app.config.get('WRITE_QUEUE_WINDOW_MS', 2) / 1000,
+            timeout=app.config.get('WRITE_QUEUE_TIMEOUT', 30),
+        )
+        logger.debug("🔧 File d'écritures activée")
+
+    def stats(self):
+        writer = current_app.extensions.get('write_queue')
+        return writer.stats() if writer else {'enabled': False}
+
+
+class _Writer:
+    """Thread writer d'une application (démarré au premier appel, par processus)"""
+
+    def __init__(self, app, max_batch, window, timeout):
+        self.app = app
+        self.max_batch = max(1, max_batch)
+        self.window = window
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._pid = None
+        self._jobs = None
+        self._counters = {'writes': 0, 'batches': 0, 'largest_batch': 0, 'replays': 0}
+
+    def submit(self, method, args, kwargs):
+        future = Future()
+        self._ensure_started().put((method, args, kwargs, future))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise RuntimeError("Write queue timeout") from None
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters['mean_batch'] = round(counters['writes'] / counters['batches'], 2) if counters['batches'] else None
+        counters['pending'] = self._jobs.qsize() if self._jobs is not None else 0
+        return {'enabled': True, **counters}
+
+    def _ensure_started(self):
+        # Après un fork (workers gunicorn), le thread du parent n'existe plus
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._jobs = queue.Queue()
+                threading.Thread(target=self._run, args=(self._jobs,), name='hbnb-writer', daemon=True).start()
+            return self._jobs
+
+    def _run(self, jobs):
+        from app.extensions import db
+
+        with self.app.app_context():
+            # Résultats rendus détachés aux appelants : attributs chargés, non expirés
+            db.session().expire_on_commit = False
+            while True:
+                batch = [jobs.get()]
+                deadline = time.monotonic() + self.window
+                while len(batch) < self.max_batch:
+                    try:
+                        remaining = deadline - time.monotonic()
+                        batch.append(jobs.get(timeout=remaining) if remaining > 0 else jobs.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    self._execute(batch)
+                except Exception as e:
+                    logger.error("❌ Erreur du writer: %s", e)
+                    for *_, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                finally:
+                    db.session.close()
+
+    def _execute(self, batch):
+        from app.extensions import db
+
+        session = db.session()
+        _local.after_commit = callbacks = []
+        outcomes = []
+        try:
+            for method, args, kwargs, future in batch:
+                session.info['write_savepoint'] = savepoint = session.begin_nested()
+                try:
+                    result = method(*args, **kwargs)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                    outcomes.append((True, result))
+                except Exception as e:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    outcomes.append((False, e))
+                finally:
+                    session.info['write_savepoint'] = None
+            session.commit()
+        except Exception as e:
+            logger.error("❌ Commit du lot (%d écritures) échoué, rejeu une par une: %s", len(batch), e)
+            session.rollback()
+            session.info['write_savepoint'] = None
+            # Callbacks du lot annulé : abandonnés, chaque rejeu a les siens
+            _local.after_commit = None
+            self._replay(batch, outcomes)
+            return
+        finally:
+            _local.after_commit = None
+
+        for callback, args in callbacks:
+            callback(*args)
+        with self._lock:
+            self._counters['writes'] += len(batch)
+            self._counters['batches'] += 1
+            self._counters['largest_batch'] = max(self._counters['largest_batch'], len(batch))
+        for (method, args, kwargs, future), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _replay(self, batch, outcomes):
+        """Chaque écriture dans sa propre transaction (échecs déjà connus renvoyés tels quels)
+
+        Les callbacks after_commit d'une écriture rejouée sont exécutés
+        après son propre commit, et abandonnés si elle échoue.
+        """
+        from app.extensions import db
+
+        with self._lock:
+            self._counters['replays'] += 1
+        for index, (method, args, kwargs, future) in enumerate(batch):
+            if index < len(outcomes) and not outcomes[index][0]:
+                future.set_exception(outcomes[index][1])
+                continue
+            _local.after_commit = callbacks = []
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                db.session.rollback()
+                future.set_exception(e)
+                continue
+            finally:
+                _local.after_commit = None
+            for callback, callback_args in callbacks:
+                callback(*callback_args)
+            future.set_result(result)
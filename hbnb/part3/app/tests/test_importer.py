@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from app import create_app, db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services.importer import BulkImporter
+
+@pytest.fixture
+def app(tmp_path):
+    # Base sur disque : l'import passe par sa propre connexion
+    app = create_app('testing', overrides={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'import.db'}",
+    })
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Olivia', last_name='Owner', email='owner@example.com')
+        guest = User(first_name='Gabin', last_name='Guest', email='guest@example.com')
+        for user in (owner, guest):
+            user.set_password('password')
+        db.session.add_all([owner, guest])
+        db.session.flush()
+        db.session.add(Place(title='Loft', price=80.0, latitude=48.85, longitude=2.35, owner_id=owner.id))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def review(rating, **fields):
+    return {'text': 'Très bien', 'rating': rating, 'user_email': 'guest@example.com',
+            'place_owner_email': 'owner@example.com', 'place_title': 'Loft', **fields}
+
+def importer():
+    """Un lot et une transaction par ligne"""
+    return BulkImporter(batch_size=1, transaction_rows=1, workers=1)
+
+def test_failed_import_keeps_aggregates_of_committed_rows(app, monkeypatch):
+    original = BulkImporter._prepare_reviews
+    calls = []
+
+    def prepare(self, conn, batch, report):
+        calls.append(batch)
+        if len(calls) == 2:
+            raise RuntimeError("lot refusé")
+        return original(self, conn, batch, report)
+
+    monkeypatch.setattr(BulkImporter, '_prepare_reviews', prepare)
+    with pytest.raises(RuntimeError):
+        importer().run('reviews', enumerate([review(4), review(2)], start=1))
+
+    place = Place.query.one()
+    db.session.refresh(place)
+    assert Review.query.count() == 1
+    assert (place.review_count, place.rating_sum, place.rating_avg, place.rating_4) == (1, 4, 4.0, 1)
+
+def test_duplicate_amenity_id_is_rejected(app):
+    report = importer().run('amenities', enumerate([
+        {'id': 'wifi', 'name': 'Wifi'}, {'id': 'wifi', 'name': 'Piscine'},
+    ], start=1))
+    assert (report.imported, report.rejected) == (1, 1)
+    assert report.errors == [(2, 'Duplicate amenity id: wifi')]
+
+def test_duplicate_review_id_is_rejected(app):
+    rows = [review(4, id='r1'), review(5, id='r1')]
+    report = BulkImporter(batch_size=10, workers=1).run('reviews', enumerate(rows, start=1))
+    # Contre la base cette fois : l'id existe depuis l'import précédent
+    again = importer().run('reviews', enumerate([review(3, id='r1')], start=1))
+
+    assert (report.imported, report.rejected) == (1, 1)
+    assert report.errors == [(2, 'Duplicate review id: r1')]
+    assert (again.imported, again.errors) == (0, [(1, 'Duplicate review id: r1')])
+    assert Review.query.count() == 1
+
+def test_place_at_taken_location_is_rejected(app):
+    rows = [
+        {'title': 'Studio', 'price': 60.0, 'latitude': 48.85, 'longitude': 2.35, 'owner_email': 'owner@example.com'},
+        {'title': 'Duplex', 'price': 90.0, 'latitude': 48.86, 'longitude': 2.35, 'owner_email': 'owner@example.com'},
+        {'title': 'Chambre', 'price': 40.0, 'latitude': 48.86, 'longitude': 2.35, 'owner_email': 'owner@example.com'},
+    ]
+    report = importer().run('places', enumerate(rows, start=1))
+    # Le Loft occupe déjà le premier emplacement ; le troisième reprend celui du deuxième
+    assert report.imported == 1
+    assert [line for line, _ in report.errors] == [1, 3]
+    assert {error for _, error in report.errors} == {'A place already exists at this location'}
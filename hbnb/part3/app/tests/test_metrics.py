@@ -0,0 +1,34 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import threading
+from app.services.metrics import Metrics, UNMATCHED_ROUTE
+
+def record_in_threads(metrics, count, duration=0.02):
+    """Une requête par thread, comme le serveur threadé de run.py"""
+    for _ in range(count):
+        thread = threading.Thread(target=metrics.record, args=({'REQUEST_METHOD': 'GET'}, 200, duration))
+        thread.start()
+        thread.join()
+
+def test_finished_threads_are_folded():
+    metrics = Metrics()
+    record_in_threads(metrics, 200)
+
+    snapshot = metrics.snapshot()
+    assert snapshot['requests'] == [['GET', UNMATCHED_ROUTE, 200, 200]]
+    (method, route, latency), = snapshot['latency']
+    assert latency[-1] == 200
+    assert abs(latency[-2] - 4.0) < 1e-9
+    # Les stores des threads terminés ne sont plus gardés
+    assert len(metrics._stores) <= 1
+
+def test_live_thread_store_is_kept():
+    metrics = Metrics()
+    metrics.record({'REQUEST_METHOD': 'POST'}, 201, 0.01)
+    record_in_threads(metrics, 5)
+
+    requests = {tuple(row[:3]): row[3] for row in metrics.snapshot()['requests']}
+    assert [store.thread for store in metrics._stores] == [threading.current_thread()]
+    assert requests == {('POST', UNMATCHED_ROUTE, 201): 1, ('GET', UNMATCHED_ROUTE, 200): 5}
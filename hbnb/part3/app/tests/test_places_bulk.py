@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import json
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+
+@pytest.fixture
+def app(monkeypatch):
+    # Pas de colonne role sur User : le facade lit owner.role, on en fait un propriétaire
+    monkeypatch.setattr(User, 'role', 'owner', raising=False)
+    app = create_app('testing')
+    app.config['JWT_SECRET_KEY'] = 'test'
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name='Olivia', last_name='Owner', email='owner@example.com')
+        owner.set_password('password')
+        db.session.add_all([owner, Amenity(name='Wifi')])
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def auth_headers(app, role='owner'):
+    with app.app_context():
+        owner = User.query.filter_by(email='owner@example.com').first()
+        token = create_access_token(identity=owner.id, additional_claims={'role': role})
+    return {'Authorization': f'Bearer {token}'}
+
+def place(title, latitude, amenities=()):
+    return {'title': title, 'price': 80.0, 'latitude': latitude, 'longitude': 2.35,
+            'amenities': list(amenities)}
+
+def test_bulk_create_json_array(app):
+    client = app.test_client()
+    with app.app_context():
+        wifi = Amenity.query.filter_by(name='Wifi').first().id
+    body = [place('Loft', 48.85, [wifi]), place('Studio', 48.86)]
+    resp = client.post('/api/v1/places/bulk', json=body, headers=auth_headers(app))
+    assert resp.status_code == 201, resp.data
+    data = resp.get_json()
+    assert data['created'] == 2 and data['failed'] == 0
+    assert [r['status'] for r in data['results']] == ['created', 'created']
+    with app.app_context():
+        assert Place.query.count() == 2
+
+def test_bulk_create_ndjson_partial(app):
+    client = app.test_client()
+    lines = [json.dumps(place('Loft', 48.85)), 'pas du json', json.dumps(place('Sans prix', 48.87) | {'price': -1})]
+    resp = client.post('/api/v1/places/bulk', data='\n'.join(lines) + '\n',
+                       content_type='application/x-ndjson', headers=auth_headers(app))
+    assert resp.status_code == 207, resp.data
+    data = resp.get_json()
+    assert data['created'] == 1 and data['failed'] == 2
+    assert data['results'][0]['status'] == 'created'
+
+def test_bulk_create_rejects_non_array(app):
+    client = app.test_client()
+    resp = client.post('/api/v1/places/bulk', json={'title': 'Loft'}, headers=auth_headers(app))
+    assert resp.status_code == 400
+    assert 'JSON array' in resp.get_json()['error']
+
+def test_bulk_create_owner_only(app):
+    client = app.test_client()
+    resp = client.post('/api/v1/places/bulk', json=[place('Loft', 48.85)], headers=auth_headers(app, role='voyageur'))
+    assert resp.status_code == 403
+
+def test_bulk_ndjson_stops_at_max_items(app, monkeypatch):
+    monkeypatch.setattr('app.api.bulk.BULK_MAX_ITEMS', 2)
+    client = app.test_client()
+    lines = [json.dumps(place(f'Lieu {i}', 48.80 + i / 100)) for i in range(3)]
+    resp = client.post('/api/v1/places/bulk', data='\n'.join(lines) + '\n',
+                       content_type='application/x-ndjson', headers=auth_headers(app))
+    assert resp.status_code == 400
+    assert 'At most 2 places' in resp.get_json()['error']
+    with app.app_context():
+        assert Place.query.count() == 0
+
+def test_bulk_body_too_large(app):
+    app.config['MAX_CONTENT_LENGTH'] = 64
+    client = app.test_client()
+    resp = client.post('/api/v1/places/bulk', json=[place('Loft', 48.85)] * 5, headers=auth_headers(app))
+    assert resp.status_code == 413
@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        yield app
+
+def test_failed_statement_leaves_no_start_time(app):
+    with db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql('SELECT * FROM missing_table')
+        assert conn.info['query_started_at'] == []
+        conn.exec_driver_sql('SELECT 1')
+        assert conn.info['query_started_at'] == []
+
+def test_slow_query_log_start_times_after_failure(tmp_path):
+    app = create_app('testing', overrides={
+        'SLOW_QUERY_ENABLED': True, 'SLOW_QUERY_FILE': str(tmp_path / 'slow.log'),
+    })
+    with app.app_context(), db.engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql('SELECT * FROM missing_table')
+        assert conn.info['slow_query_started_at'] == []
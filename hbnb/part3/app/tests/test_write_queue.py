@@ -0,0 +1,54 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+import threading
+import pytest
+from app import create_app, db
+from app.extensions import cache, write_queue
+from app.models.amenity import Amenity
+from app.services.facade import HBnBFacade
+from app.services.write_queue import BatchSession
+
+@pytest.fixture
+def app(tmp_path):
+    # Base sur disque : la file d'écritures refuse SQLite en mémoire
+    app = create_app('testing', overrides={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'queue.db'}",
+        'WRITE_QUEUE_ENABLED': True,
+        'CACHE_ENABLED': True,
+    })
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+def fail_first_batch_commit(monkeypatch):
+    """Le premier commit de lot du writer échoue ; les commits suivants passent"""
+    original = BatchSession.commit
+    failures = [RuntimeError("commit du lot refusé")]
+
+    def commit(self):
+        if (threading.current_thread().name == 'hbnb-writer'
+                and self.info.get('write_savepoint') is None and failures):
+            raise failures.pop()
+        return original(self)
+
+    monkeypatch.setattr(BatchSession, 'commit', commit)
+
+def test_queued_write_invalidates_cache(app):
+    cache._generation('amenities')
+    HBnBFacade().create_amenity({'name': 'Wifi'})
+    assert cache.backend.get('gen:amenities') is None
+
+def test_replayed_write_invalidates_cache(app, monkeypatch):
+    fail_first_batch_commit(monkeypatch)
+    generation = cache._generation('amenities')
+    assert cache.backend.get('gen:amenities') == generation
+
+    amenity = HBnBFacade().create_amenity({'name': 'Wifi'})
+
+    assert write_queue.stats()['replays'] == 1
+    assert db.session.get(Amenity, amenity.id) is not None
+    assert cache.backend.get('gen:amenities') is None
@@ -0,0 +1,348 @@
+"""Scénarios de charge sur l'application réelle, résultats en JSON
+
+Construit (ou réutilise) la base synthétique de dataset.py, en copie une
+version de travail par pilote, puis rejoue des scénarios utilisateur :
+
+    browse           GET /places/ (tris et filtres variés)
+    place_detail     GET /places/<id>?expand=owner,amenities (lieux populaires plus souvent)
+    place_reviews    GET /places/<id>/reviews/
+    post_review      POST /reviews/ (voyageur authentifié)
+    login            POST /auth/login (hachage du mot de passe compris)
+    owner_dashboard  GET /places/?owner_id=<propriétaire>
+    read_write       mélange concurrent : 80 % de lectures ci-dessus, 20 % de POST /reviews/
+
+Deux pilotes : le client de test Flask (séquentiel, sans réseau) et un
+serveur WSGI local (werkzeug, threads) attaqué par --concurrency clients
+HTTP/1.1 keep-alive. Les requêtes de chaque scénario sont tirées d'avance
+avec la graine : deux exécutions rejouent exactement les mêmes requêtes.
+
+    python benchmarks/bench_app.py --scale small --requests 500 --driver both
+
+Rapport : latences p50/p95/p99 (ms), débit (req/s), requêtes SQL par
+requête (en-tête Server-Timing), statuts. Le JSON est écrit dans
+benchmarks/results/ ; comparer deux exécutions avec compare.py.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import (  # noqa: E402
+    BENCH_PASSWORD, add_dataset_arguments, build_database, database_overrides, spec_from_args
+)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# Scénario -> part des requêtes demandées (le login paie un hachage de mot de passe)
+SCENARIO_SHARE = {
+    'browse': 1.0,
+    'place_detail': 1.0,
+    'place_reviews': 1.0,
+    'post_review': 0.5,
+    'login': 0.1,
+    'owner_dashboard': 0.5,
+    'read_write': 1.0,
+}
+READ_WRITE_MIX = [('browse', 0.3), ('place_detail', 0.3), ('place_reviews', 0.2), ('post_review', 0.2)]
+BROWSE_VARIANTS = [
+    'limit=20',
+    'limit=20&sort=newest',
+    'limit=20&sort=price',
+    'limit=20&sort=-rating',
+    'limit=20&min_price=50&max_price=150',
+    'limit=50&fields=id,title,price',
+]
+
+
+class Context:
+    """Identifiants tirés de la base de travail pour construire les requêtes"""
+
+    def __init__(self, path, app):
+        conn = sqlite3.connect(path)
+        try:
+            # Rang de popularité = nombre d'avis (loi de puissance du jeu de données)
+            self.place_ids = [r[0] for r in conn.execute('SELECT id FROM places ORDER BY review_count DESC, id')]
+            self.owner_ids = [r[0] for r in conn.execute('SELECT DISTINCT owner_id FROM places ORDER BY owner_id')]
+            self.travellers = conn.execute(
+                "SELECT id, email FROM users WHERE email LIKE 'user%' ORDER BY email").fetchall()
+        finally:
+            conn.close()
+        self.place_weights = list(accumulate(1.0 / (rank + 1) for rank in range(len(self.place_ids))))
+
+        from flask_jwt_extended import create_access_token
+        with app.app_context():
+            self.tokens = {
+                user_id: create_access_token(identity=user_id, expires_delta=False)
+                for user_id, _ in self.travellers[:200]
+            }
+
+    def popular_place(self, rng):
+        return rng.choices(self.place_ids, cum_weights=self.place_weights)[0]
+
+
+def build_requests(name, count, ctx, rng):
+    """Liste de (méthode, chemin, corps JSON, en-têtes) du scénario"""
+    requests = []
+    for _ in range(count):
+        if name == 'browse':
+            requests.append(('GET', f'/api/v1/places/?{rng.choice(BROWSE_VARIANTS)}', None, {}))
+        elif name == 'place_detail':
+            requests.append(('GET', f'/api/v1/places/{ctx.popular_place(rng)}?expand=owner,amenities', None, {}))
+        elif name == 'place_reviews':
+            sort = rng.choice(['newest', 'highest', 'lowest'])
+            requests.append(('GET', f'/api/v1/places/{ctx.popular_place(rng)}/reviews/?limit=10&sort={sort}', None, {}))
+        elif name == 'post_review':
+            user_id = rng.choice(list(ctx.tokens))
+            body = {
+                'text': 'Avis de benchmark', 'rating': rng.randint(1, 5),
+                'user_id': user_id, 'place_id': ctx.popular_place(rng),
+            }
+            requests.append(('POST', '/api/v1/reviews/', body, {'Authorization': f'Bearer {ctx.tokens[user_id]}'}))
+        elif name == 'login':
+            _, email = rng.choice(ctx.travellers)
+            requests.append(('POST', '/api/v1/auth/login', {'email': email, 'password': BENCH_PASSWORD}, {}))
+        elif name == 'owner_dashboard':
+            requests.append(('GET', f'/api/v1/places/?owner_id={rng.choice(ctx.owner_ids)}&limit=50&sort=newest', None, {}))
+        elif name == 'read_write':
+            kind = rng.choices([k for k, _ in READ_WRITE_MIX], weights=[w for _, w in READ_WRITE_MIX])[0]
+            requests.extend(build_requests(kind, 1, ctx, rng))
+    return requests
+
+
+# ---------- Pilotes ----------
+def run_test_client(app, requests):
+    """Client de test Flask : (durées en secondes, requêtes SQL, statuts), durée totale"""
+    client = app.test_client()
+    samples = []
+    started_at = time.perf_counter()
+    for method, path, body, headers in requests:
+        t0 = time.perf_counter()
+        response = client.open(path, method=method, json=body, headers=headers)
+        duration = time.perf_counter() - t0
+        samples.append((duration, _queries(response.headers.get('Server-Timing')), response.status_code))
+    return samples, time.perf_counter() - started_at
+
+
+class WsgiServer:
+    """Serveur werkzeug local (threads, HTTP/1.1 keep-alive) dans un thread"""
+
+    def __init__(self, app):
+        from werkzeug.serving import WSGIRequestHandler, make_server
+
+        class Handler(WSGIRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_request(self, *args, **kwargs):
+                pass
+
+        self.server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=Handler)
+        self.port = self.server.server_port
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def run_wsgi(server, requests, concurrency):
+    """Clients HTTP concurrents : chacun rejoue une part des requêtes"""
+    samples = []
+    lock = threading.Lock()
+
+    def worker(part):
+        conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=60)
+        local = []
+        for method, path, body, headers in part:
+            payload = json.dumps(body).encode('utf-8') if body is not None else None
+            headers = dict(headers, **({'Content-Type': 'application/json'} if payload else {}))
+            t0 = time.perf_counter()
+            try:
+                conn.request(method, path, body=payload, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                status, timing = response.status, response.getheader('Server-Timing')
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', server.port, timeout=60)
+                status, timing = 0, None
+            local.append((time.perf_counter() - t0, _queries(timing), status))
+        conn.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(requests[i::concurrency],)) for i in range(concurrency)]
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started_at
+
+
+def _queries(server_timing):
+    match = _QUERIES.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+# ---------- Rapport ----------
+def percentile(values, p):
+    """Percentile p (0-100) par interpolation linéaire sur des valeurs triées"""
+    if not values:
+        return None
+    position = (len(values) - 1) * p / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarize(samples, elapsed):
+    durations = sorted(s[0] * 1000 for s in samples)
+    queries = [s[1] for s in samples if s[1] is not None]
+    statuses = {}
+    for _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for s in samples if s[2] == 0 or s[2] >= 500),
+        'statuses': statuses,
+        'p50_ms': round(percentile(durations, 50), 3),
+        'p95_ms': round(percentile(durations, 95), 3),
+        'p99_ms': round(percentile(durations, 99), 3),
+        'mean_ms': round(sum(durations) / len(durations), 3),
+        'max_ms': round(durations[-1], 3),
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        'max_queries': max(queries) if queries else None,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=False,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(args):
+    template = args.db
+    dataset = build_database(template, spec_from_args(args), args.config)
+    work = f'{template}.work'
+
+    from app import create_app
+
+    scenarios = [s for s in SCENARIO_SHARE if not args.scenarios or s in args.scenarios]
+    drivers = ['test_client', 'wsgi'] if args.driver == 'both' else [args.driver]
+    results = {}
+    for driver in drivers:
+        # Base de travail neuve par pilote : les écritures d'un pilote ne faussent pas l'autre
+        shutil.copyfile(template, work)
+        overrides = {**database_overrides(work), 'QUERY_STATS_SERVER_TIMING': True, **args.set}
+        app = create_app(args.config, overrides=overrides)
+        ctx = Context(work, app)
+        results[driver] = {}
+        for name in scenarios:
+            rng = random.Random(f'{args.seed_requests}:{name}')
+            count = max(1, int(args.requests * SCENARIO_SHARE[name]))
+            warmup = build_requests(name, min(args.warmup, count), ctx, rng)
+            requests = build_requests(name, count, ctx, rng)
+            if driver == 'test_client':
+                run_test_client(app, warmup)
+                samples, elapsed = run_test_client(app, requests)
+            else:
+                with WsgiServer(app) as server:
+                    run_wsgi(server, warmup, args.concurrency)
+                    samples, elapsed = run_wsgi(server, requests, args.concurrency)
+            results[driver][name] = summarize(samples, elapsed)
+            print(_line(driver, name, results[driver][name]), file=sys.stderr)
+        with app.app_context():
+            from app.extensions import db
+            db.engine.dispose()
+    os.remove(work)
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'label': args.label,
+        'environment': environment(),
+        'config': args.config,
+        'settings': {
+            'requests': args.requests, 'warmup': args.warmup, 'concurrency': args.concurrency,
+            'seed_requests': args.seed_requests, 'overrides': args.set,
+        },
+        'dataset': dataset,
+        'results': results,
+    }
+
+
+def _line(driver, name, r):
+    return (f"{driver:<11} {name:<16} n={r['requests']:<5} p50={r['p50_ms']:>8.2f}ms "
+            f"p95={r['p95_ms']:>8.2f}ms p99={r['p99_ms']:>8.2f}ms "
+            f"{r['throughput_rps']:>8.1f} req/s  q/req={r['queries_per_request']}  errors={r['errors']}")
+
+
+def _setting(value):
+    key, _, raw = value.partition('=')
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des scénarios utilisateur de l'API")
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db', help='base modèle (construite si absente)')
+    add_dataset_arguments(parser)
+    parser.add_argument('--config', default='production')
+    parser.add_argument('--driver', choices=['test_client', 'wsgi', 'both'], default='both')
+    parser.add_argument('--requests', type=int, default=500, help='requêtes par scénario (avant pondération)')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=4, help='clients HTTP du pilote wsgi')
+    parser.add_argument('--scenario', dest='scenarios', action='append', choices=list(SCENARIO_SHARE))
+    parser.add_argument('--seed-requests', type=int, default=1)
+    parser.add_argument('--set', action='append', type=_setting, default=[],
+                        metavar='KEY=VALUE', help='réglage de config (valeur JSON), répétable')
+    parser.add_argument('--label', default=None, help='nom de l\'exécution (fichier de résultats)')
+    parser.add_argument('--output', default=None, help='fichier JSON (défaut : benchmarks/results/)')
+    args = parser.parse_args()
+    args.set = dict(args.set)
+
+    report = run(args)
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{args.label or args.scale}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
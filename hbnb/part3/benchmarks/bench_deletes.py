@@ -0,0 +1,203 @@
+"""Suppression d'utilisateurs : cascade par lieu contre DELETE ensemblistes
+
+Sur une copie neuve de la base synthétique :
+
+    typical  les --delete-owners propriétaires ayant le plus de lieux sont supprimés
+             un par un par HBnBFacade.delete_user (durée p50/max, requêtes SQL
+             et commits par suppression) ;
+    large    --large-places lieux sont réattribués à un seul propriétaire,
+             supprimé par delete_user (une transaction) puis, sur une autre
+             copie, par la purge par lots (--mode purge) : durée de la requête
+             qui la lance, durée totale, lot médian et plus long lot.
+
+Après chaque scénario : lignes orphelines (liens, cellules, avis) et lieux
+dont les agrégats de notes ne correspondent plus à leurs avis.
+
+    python benchmarks/bench_deletes.py --scale medium --large-places 5000
+
+Une ligne JSON par scénario.
+"""
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import build_database, add_dataset_arguments, database_overrides, spec_from_args  # noqa: E402
+
+CHECKS = {
+    'orphan_links': "SELECT COUNT(*) FROM place_amenity WHERE place_id NOT IN (SELECT id FROM places)",
+    'orphan_cells': "SELECT COUNT(*) FROM place_cells WHERE place_id NOT IN (SELECT id FROM places)",
+    'orphan_reviews': "SELECT COUNT(*) FROM reviews WHERE place_id NOT IN (SELECT id FROM places) "
+                      "OR user_id NOT IN (SELECT id FROM users)",
+    'rating_mismatches': "SELECT COUNT(*) FROM places p WHERE review_count != "
+                         "(SELECT COUNT(*) FROM reviews r WHERE r.place_id = p.id) OR rating_sum != "
+                         "(SELECT COALESCE(SUM(rating), 0) FROM reviews r WHERE r.place_id = p.id)",
+}
+
+
+def check(path):
+    conn = sqlite3.connect(path)
+    result = {name: conn.execute(sql).fetchone()[0] for name, sql in CHECKS.items()}
+    conn.close()
+    return result
+
+
+def make_large_owner(path, places):
+    """Réattribue `places` lieux au premier propriétaire et renvoie son id"""
+    conn = sqlite3.connect(path)
+    owner_id = conn.execute('SELECT owner_id FROM places ORDER BY id LIMIT 1').fetchone()[0]
+    conn.execute('UPDATE places SET owner_id = ? WHERE id IN (SELECT id FROM places ORDER BY id LIMIT ?)',
+                 (owner_id, places))
+    conn.commit()
+    conn.close()
+    return owner_id
+
+
+def counted(app):
+    """Compteurs de requêtes SQL et de commits du moteur de l'application"""
+    from sqlalchemy import event
+    from app.extensions import db
+
+    counts = {'statements': 0, 'commits': 0}
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def statement(*args):
+        counts['statements'] += 1
+
+    @event.listens_for(engine, 'commit')
+    def commit(*args):
+        counts['commits'] += 1
+
+    return counts
+
+
+def typical(path, owners):
+    from app import create_app
+    from app.extensions import db
+    from app.services.facade import HBnBFacade
+
+    conn = sqlite3.connect(path)
+    user_ids = [r[0] for r in conn.execute(
+        'SELECT owner_id FROM places GROUP BY owner_id ORDER BY COUNT(*) DESC, owner_id LIMIT ?', (owners,))]
+    conn.close()
+    app = create_app('production', overrides={**database_overrides(path), 'CACHE_ENABLED': False})
+    counts = counted(app)
+    durations, statements, commits = [], [], []
+    with app.app_context():
+        facade = HBnBFacade()
+        for user_id in user_ids:
+            before = dict(counts)
+            started_at = time.perf_counter()
+            facade.delete_user(user_id)
+            durations.append(time.perf_counter() - started_at)
+            statements.append(counts['statements'] - before['statements'])
+            commits.append(counts['commits'] - before['commits'])
+            db.session.remove()
+        db.engine.dispose()
+    return {
+        'users': len(user_ids),
+        'p50_ms': round(statistics.median(durations) * 1000, 1),
+        'max_ms': round(max(durations) * 1000, 1),
+        'statements_per_delete': round(statistics.mean(statements), 1),
+        'commits_per_delete': round(statistics.mean(commits), 1),
+        **check(path),
+    }
+
+
+def large_sync(path, owner_id):
+    from app import create_app
+    from app.extensions import db
+    from app.services.facade import HBnBFacade
+
+    app = create_app('production', overrides={**database_overrides(path), 'CACHE_ENABLED': False})
+    counts = counted(app)
+    with app.app_context():
+        started_at = time.perf_counter()
+        HBnBFacade().delete_user(owner_id)
+        elapsed = time.perf_counter() - started_at
+        db.engine.dispose()
+    return {'seconds': round(elapsed, 3), **counts, **check(path)}
+
+
+def large_purge(path, owner_id, chunk_size):
+    from app import create_app
+    from app.extensions import db
+    from app.services.migrations import upgrade
+    from app.services.purge import run_purge, start_purge
+
+    app = create_app('production', overrides={**database_overrides(path), 'CACHE_ENABLED': False})
+    chunks = []
+    with app.app_context():
+        upgrade()
+        started_at = time.perf_counter()
+        job = start_purge(owner_id, background=False)
+        request_ms = (time.perf_counter() - started_at) * 1000
+        last = [time.perf_counter()]
+
+        def progress(job):
+            now = time.perf_counter()
+            chunks.append(now - last[0])
+            last[0] = now
+
+        job = run_purge(job.id, chunk_size, progress)
+        elapsed = time.perf_counter() - started_at
+        result = {'status': job.status, 'places_deleted': job.places_deleted,
+                  'reviews_deleted': job.reviews_deleted}
+        db.engine.dispose()
+    return {
+        'request_ms': round(request_ms, 1),
+        'seconds': round(elapsed, 3),
+        'chunks': len(chunks),
+        'p50_chunk_ms': round(statistics.median(chunks) * 1000, 1) if chunks else None,
+        'max_chunk_ms': round(max(chunks) * 1000, 1) if chunks else None,
+        **result,
+        **check(path),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure la suppression d'utilisateurs et de leur inventaire")
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db')
+    add_dataset_arguments(parser)
+    parser.add_argument('--delete-owners', type=int, default=20, help='propriétaires supprimés (scénario typical)')
+    parser.add_argument('--large-places', type=int, default=5000)
+    parser.add_argument('--chunk-size', type=int, default=200)
+    parser.add_argument('--mode', action='append', choices=['sync', 'purge'],
+                        help='scénario large : delete_user, purge par lots (répétable)')
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    build_database(args.db, spec)
+    work = f'{args.db}.deletes'
+
+    def fresh():
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(work + suffix):
+                os.remove(work + suffix)
+        shutil.copyfile(args.db, work)
+
+    fresh()
+    print(json.dumps({'scenario': 'typical', **typical(work, args.delete_owners)}))
+    for mode in args.mode or ['sync', 'purge']:
+        fresh()
+        owner_id = make_large_owner(work, args.large_places)
+        if mode == 'sync':
+            result = large_sync(work, owner_id)
+        else:
+            result = large_purge(work, owner_id, args.chunk_size)
+        print(json.dumps({'scenario': f'large_{mode}', 'places': args.large_places, **result}))
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+
+
+if __name__ == '__main__':
+    main()
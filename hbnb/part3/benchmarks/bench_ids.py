@@ -0,0 +1,225 @@
+"""Clés primaires : UUIDv4 aléatoires contre UUIDv7 ordonnés (texte ou 16 octets)
+
+Chaque variante tourne dans un processus neuf (HBNB_ID_STORAGE fixe le
+schéma à l'import) sur une base vide, avec un petit cache de pages SQLite
+(--cache-kib, 2 Mio par défaut comme SQLite) et sans mmap, pour que les
+B-tree dépassent le cache comme en production :
+
+    uuid4   ids aléatoires (ancien défaut), texte de 36 caractères
+    uuid7   ids ordonnés dans le temps (new_id), texte
+    binary  ids ordonnés, 16 octets (HBNB_ID_STORAGE=binary)
+
+Mesures :
+- place_amenity : création de --places lieux avec --links amenities chacun
+  (transactions de 500 lieux), liens insérés par seconde ;
+- reviews : --reviews avis (transactions de --batch), lignes par seconde ;
+- taux de succès du cache de pages pendant ces insertions, puis pendant la
+  relecture par clé primaire des 2000 avis les plus récents (cache froid) ;
+- taille et remplissage (dbstat) de chaque table et index des deux tables.
+
+    python benchmarks/bench_ids.py --reviews 300000 --places 20000
+
+Une ligne JSON par variante.
+"""
+import argparse
+import ctypes
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+VARIANTS = {
+    'uuid4': 'string',
+    'uuid7': 'string',
+    'binary': 'binary',
+}
+# sqlite3_db_status : SQLITE_DBSTATUS_CACHE_HIT / CACHE_MISS
+CACHE_HIT, CACHE_MISS = 7, 8
+
+
+class CacheCounters:
+    """Compteurs du cache de pages d'une connexion sqlite3 (sqlite3_db_status)
+
+    Le module sqlite3 ne les expose pas : on lit le pointeur sqlite3* en
+    tête de l'objet Connection (CPython) et on appelle la bibliothèque liée
+    au module _sqlite3. Indisponible ailleurs : les taux valent alors None.
+    """
+
+    def __init__(self, dbapi_connection):
+        try:
+            import _sqlite3
+            status = ctypes.CDLL(_sqlite3.__file__).sqlite3_db_status
+            status.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int),
+                               ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+            self._status = status
+            self._db = ctypes.c_void_p.from_address(id(dbapi_connection) + object.__basicsize__).value
+        except (AttributeError, OSError, ImportError):
+            self._status = None
+
+    def take(self):
+        """(succès, échecs) depuis le dernier appel"""
+        if self._status is None:
+            return None, None
+        values = []
+        for op in (CACHE_HIT, CACHE_MISS):
+            current, highwater = ctypes.c_int(), ctypes.c_int()
+            self._status(self._db, op, ctypes.byref(current), ctypes.byref(highwater), 1)
+            values.append(current.value)
+        return tuple(values)
+
+
+def hit_ratio(hits, misses):
+    if hits is None or not hits + misses:
+        return None
+    return round(hits / (hits + misses), 4)
+
+
+def child(args):
+    from app import create_app
+    from app.extensions import db
+    from app.models.user import User
+    from app.models.amenity import Amenity
+    from app.models.place import Place, PlaceAmenity
+    from app.models.review import Review
+    from app.services.ids import new_id
+    from config import ProductionConfig
+
+    variant = args.variant[0]
+    generate = (lambda: str(uuid.uuid4())) if variant == 'uuid4' else new_id
+    rng = random.Random(args.seed)
+    pragmas = dict(ProductionConfig.SQLITE_PRAGMAS, mmap_size=0, cache_size=-args.cache_kib)
+    app = create_app('production', overrides={
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{args.path}', 'SQLITE_PRAGMAS': pragmas,
+        'LOG_LEVEL': 'WARNING', 'SLOW_QUERY_ENABLED': False, 'METRICS_MULTIPROC_DIR': None,
+    })
+    clock = [datetime(2024, 1, 1)]
+
+    def stamp():
+        clock[0] += timedelta(milliseconds=7)
+        return {'created_at': clock[0], 'updated_at': clock[0]}
+
+    result = {'variant': variant, 'storage': VARIANTS[variant]}
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as conn:
+            counters = CacheCounters(conn.connection.dbapi_connection)
+            users = [generate() for _ in range(args.users)]
+            conn.execute(db.insert(User), [
+                {'id': user_id, 'first_name': 'U', 'last_name': str(n), 'email': f'u{n}@bench.local',
+                 'password_hash': 'x', 'role': 'owner', **stamp()} for n, user_id in enumerate(users)])
+            amenities = [generate() for _ in range(args.amenities)]
+            conn.execute(db.insert(Amenity), [
+                {'id': amenity_id, 'name': f'amenity {n}', **stamp()} for n, amenity_id in enumerate(amenities)])
+            conn.commit()
+
+            # Lieux et leurs amenities, par transactions de 500 lieux
+            places = []
+            counters.take()
+            started_at = time.perf_counter()
+            for start in range(0, args.places, 500):
+                rows, links = [], []
+                for n in range(start, min(start + 500, args.places)):
+                    place_id = generate()
+                    places.append(place_id)
+                    rows.append({'id': place_id, 'title': f'Lieu {n}', 'price': 100.0, 'latitude': 48.8,
+                                 'longitude': 2.3, 'owner_id': rng.choice(users), **stamp()})
+                    links += [{'place_id': place_id, 'amenity_id': a}
+                              for a in rng.sample(amenities, args.links)]
+                conn.execute(db.insert(Place), rows)
+                conn.execute(db.insert(PlaceAmenity), links)
+                conn.commit()
+            elapsed = time.perf_counter() - started_at
+            hits, misses = counters.take()
+            result['place_amenity_insert'] = {
+                'links_per_s': round(args.places * args.links / elapsed),
+                'cache_hit_ratio': hit_ratio(hits, misses), 'cache_misses': misses,
+            }
+
+            # Avis, par transactions de --batch lignes
+            recent = []
+            started_at = time.perf_counter()
+            for start in range(0, args.reviews, args.batch):
+                rows = []
+                for _ in range(min(args.batch, args.reviews - start)):
+                    review_id = generate()
+                    rows.append({'id': review_id, 'text': 'Avis', 'rating': rng.randint(1, 5),
+                                 'user_id': rng.choice(users), 'place_id': rng.choice(places), **stamp()})
+                conn.execute(db.insert(Review), rows)
+                conn.commit()
+                recent = (recent + [row['id'] for row in rows])[-2000:]
+            elapsed = time.perf_counter() - started_at
+            hits, misses = counters.take()
+            result['reviews_insert'] = {
+                'rows_per_s': round(args.reviews / elapsed),
+                'cache_hit_ratio': hit_ratio(hits, misses), 'cache_misses': misses,
+            }
+        db.engine.dispose()
+
+        # Relecture des avis récents sur une connexion neuve (cache froid)
+        with db.engine.connect() as conn:
+            counters = CacheCounters(conn.connection.dbapi_connection)
+            counters.take()
+            rng.shuffle(recent)
+            started_at = time.perf_counter()
+            for review_id in recent:
+                conn.execute(db.select(Review.rating).where(Review.id == review_id)).scalar_one()
+            elapsed = time.perf_counter() - started_at
+            hits, misses = counters.take()
+            result['recent_reviews_read'] = {
+                'lookups_per_s': round(len(recent) / elapsed),
+                'cache_hit_ratio': hit_ratio(hits, misses), 'cache_misses': misses,
+            }
+            sizes = {}
+            for name, tbl, pages, size, unused in conn.exec_driver_sql(
+                    "SELECT name, tbl_name, COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat "
+                    "JOIN sqlite_master USING (name) WHERE tbl_name IN ('reviews', 'place_amenity') "
+                    "GROUP BY name ORDER BY tbl_name, name"):
+                sizes[name] = {'kib': size // 1024, 'fill': round(1 - unused / size, 3)}
+            result['sizes'] = sizes
+            result['file_kib'] = os.path.getsize(args.path) // 1024
+        db.engine.dispose()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare UUIDv4 et UUIDv7 comme clés primaires')
+    parser.add_argument('--variant', action='append', choices=list(VARIANTS))
+    parser.add_argument('--reviews', type=int, default=300000)
+    parser.add_argument('--places', type=int, default=20000)
+    parser.add_argument('--links', type=int, default=5, help='amenities par lieu')
+    parser.add_argument('--users', type=int, default=5000)
+    parser.add_argument('--amenities', type=int, default=50)
+    parser.add_argument('--batch', type=int, default=100, help='avis par transaction')
+    parser.add_argument('--cache-kib', type=int, default=2048)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+    for variant in args.variant or list(VARIANTS):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'ids.db')
+            command = [sys.executable, os.path.abspath(__file__), '--child', '--variant', variant, '--path', path]
+            for name in ('reviews', 'places', 'links', 'users', 'amenities', 'batch', 'cache_kib', 'seed'):
+                command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+            env = dict(os.environ, HBNB_ID_STORAGE=VARIANTS[variant])
+            process = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+            lines = [line for line in process.stdout.splitlines() if line.startswith('{"variant"')]
+            if process.returncode != 0 or not lines:
+                sys.exit(f'échec de la variante {variant} :\n{process.stderr[-2000:]}')
+            print(lines[-1])
+
+
+if __name__ == '__main__':
+    main()
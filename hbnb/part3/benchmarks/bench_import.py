@@ -0,0 +1,125 @@
+"""Débit de `flask hbnb import` sur le jeu de données synthétique
+
+Exporte le jeu de données de dataset.py en fichiers d'import (clés
+naturelles : email du propriétaire ou de l'auteur, noms d'amenities),
+puis les importe dans une base vide, dans l'ordre users, amenities,
+places, reviews, et mesure chaque étape (reconstruction des index
+différés et des agrégats comprise).
+
+    python benchmarks/bench_import.py --scale medium --reviews 1000000
+    python benchmarks/bench_import.py --scale small --format csv --passwords
+
+--passwords exporte des mots de passe en clair (hachés pendant l'import
+par le pool de processus) au lieu d'un password_hash déjà calculé.
+Affiche une ligne JSON par type.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import BENCH_PASSWORD, Dataset, add_dataset_arguments, database_overrides, spec_from_args  # noqa: E402
+
+COLUMNS = {
+    'users': ['first_name', 'last_name', 'email', 'password', 'password_hash', 'is_admin', 'created_at'],
+    'amenities': ['name'],
+    'places': ['id', 'title', 'description', 'price', 'latitude', 'longitude', 'owner_email',
+               'amenities', 'created_at'],
+    'reviews': ['text', 'rating', 'user_email', 'place_id', 'created_at'],
+}
+
+
+def export_rows(dataset, passwords):
+    """Lignes d'import par type, au format attendu par la commande"""
+    emails = {user['id']: user['email'] for user in dataset.users}
+    amenity_names = {amenity['id']: amenity['name'] for amenity in dataset.amenities}
+    links = {}
+    for link in dataset.place_amenities:
+        links.setdefault(link['place_id'], []).append(amenity_names[link['amenity_id']])
+    return {
+        'users': (
+            dict(first_name=u['first_name'], last_name=u['last_name'], email=u['email'],
+                 is_admin=u['is_admin'], created_at=u['created_at'].isoformat(),
+                 **({'password': BENCH_PASSWORD} if passwords else {'password_hash': u['password_hash']}))
+            for u in dataset.users
+        ),
+        'amenities': ({'name': a['name']} for a in dataset.amenities),
+        'places': (
+            dict(id=p['id'], title=p['title'], description=p['description'], price=p['price'],
+                 latitude=p['latitude'], longitude=p['longitude'], owner_email=emails[p['owner_id']],
+                 amenities=links.get(p['id'], []), created_at=p['created_at'].isoformat())
+            for p in dataset.places
+        ),
+        'reviews': (
+            dict(text=r['text'], rating=r['rating'], user_email=emails[r['user_id']],
+                 place_id=r['place_id'], created_at=r['created_at'].isoformat())
+            for r in dataset.reviews
+        ),
+    }
+
+
+def write_file(path, fmt, kind, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == 'ndjson':
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+            return
+        writer = csv.DictWriter(f, fieldnames=COLUMNS[kind])
+        writer.writeheader()
+        for row in rows:
+            if isinstance(row.get('amenities'), list):
+                row['amenities'] = '|'.join(row['amenities'])
+            writer.writerow(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure l'import en masse")
+    add_dataset_arguments(parser)
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson')
+    parser.add_argument('--passwords', action='store_true', help='mots de passe en clair à hacher')
+    parser.add_argument('--hash-method', help='méthode werkzeug (défaut : celle de l\'application)')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--keep-indexes', action='store_true', help='ne pas différer les index')
+    parser.add_argument('--config', default='production')
+    parser.add_argument('--dir', help='répertoire des fichiers et de la base (temporaire par défaut)')
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.extensions import db
+    from app.services.importer import BulkImporter, IMPORT_KINDS, read_rows
+
+    directory = args.dir or tempfile.mkdtemp(prefix='hbnb-import-')
+    os.makedirs(directory, exist_ok=True)
+    dataset = Dataset(spec_from_args(args))
+    paths = {}
+    for kind, rows in export_rows(dataset, args.passwords).items():
+        paths[kind] = os.path.join(directory, f'{kind}.{args.format}')
+        write_file(paths[kind], args.format, kind, rows)
+    del dataset
+
+    db_path = os.path.join(directory, 'import.db')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    app = create_app(args.config, overrides=database_overrides(db_path))
+    importer = BulkImporter(workers=args.workers, hash_method=args.hash_method,
+                            defer_indexes=not args.keep_indexes)
+    with app.app_context():
+        db.create_all()
+        for kind in IMPORT_KINDS:
+            started_at = time.perf_counter()
+            with open(paths[kind], encoding='utf-8', newline='') as stream:
+                report = importer.run(kind, read_rows(stream, args.format))
+            seconds = time.perf_counter() - started_at
+            result = report.to_dict()
+            result.update(format=args.format, rows_per_s=round(report.read / seconds) if seconds else None)
+            print(json.dumps(result))
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""Index des clés étrangères : mesures avant / après `flask hbnb migrate`
+
+Part de la base synthétique de dataset.py, en retire tous les index
+secondaires (une base créée avant les migrations), puis joue les mêmes
+opérations sur deux copies : telle quelle (avant) et après upgrade()
+(après, durée de la migration comprise dans le rapport).
+
+Opérations : avis d'un auteur (get_reviews_by_user), lieux d'un
+propriétaire (get_places_by_owner), page d'avis d'un lieu, tableau de
+bord propriétaire et liste des lieux récents (API), puis suppressions
+d'amenities et d'utilisateurs (delete_amenity, delete_user).
+
+    python benchmarks/bench_indexes.py --scale medium --samples 50
+
+Affiche une ligne JSON par opération (ms, médiane et p95).
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import build_database, add_dataset_arguments, database_overrides, spec_from_args  # noqa: E402
+
+
+def strip_indexes(path):
+    """Retire les index secondaires et l'historique des migrations"""
+    conn = sqlite3.connect(path)
+    names = [name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        "AND tbl_name != 'place_cells'"
+    )]
+    for name in names:
+        conn.execute(f'DROP INDEX {name}')
+    conn.execute('DROP TABLE IF EXISTS schema_migrations')
+    conn.commit()
+    conn.execute('VACUUM')
+    conn.close()
+    return names
+
+
+def sample_ids(path, samples, seed):
+    conn = sqlite3.connect(path)
+    rng = random.Random(seed)
+
+    def pick(sql, k):
+        rows = [row[0] for row in conn.execute(sql)]
+        return rng.sample(rows, min(k, len(rows)))
+
+    ids = {
+        'authors': pick('SELECT DISTINCT user_id FROM reviews', samples),
+        'owners': pick('SELECT DISTINCT owner_id FROM places', samples),
+        'places': pick('SELECT id FROM places', samples),
+        'amenities': pick('SELECT id FROM amenities', max(1, samples // 10)),
+        'travellers': pick('SELECT DISTINCT user_id FROM reviews', max(1, samples // 10)),
+    }
+    conn.close()
+    return ids
+
+
+def timed(calls):
+    durations = []
+    for call in calls:
+        started_at = time.perf_counter()
+        call()
+        durations.append(time.perf_counter() - started_at)
+    durations.sort()
+    return {
+        'n': len(durations),
+        'p50_ms': round(statistics.median(durations) * 1000, 3),
+        'p95_ms': round(durations[min(len(durations) - 1, int(len(durations) * 0.95))] * 1000, 3),
+    }
+
+
+def measure(path, ids, migrate):
+    from app import create_app
+    from app.extensions import db
+    from app.services.facade import HBnBFacade
+
+    overrides = dict(database_overrides(path), CACHE_ENABLED=False, QUERY_STATS_ENABLED=False)
+    app = create_app('production', overrides=overrides)
+    results = {}
+    with app.app_context():
+        if migrate:
+            from app.services.migrations import upgrade
+            started_at = time.perf_counter()
+            upgrade()
+            results['migration'] = {'seconds': round(time.perf_counter() - started_at, 3)}
+        facade = HBnBFacade()
+        client = app.test_client()
+
+        def api(url):
+            return lambda: client.get(url)
+
+        def reset(call):
+            def wrapper():
+                call()
+                db.session.remove()
+            return wrapper
+
+        results['reviews_by_user'] = timed(
+            reset(lambda u=u: facade.get_reviews_by_user(u)) for u in ids['authors'])
+        results['places_by_owner'] = timed(
+            reset(lambda o=o: facade.get_places_by_owner(o)) for o in ids['owners'])
+        results['place_reviews_page'] = timed(
+            api(f'/api/v1/places/{p}/reviews/?limit=20&sort=newest') for p in ids['places'])
+        results['owner_dashboard'] = timed(
+            api(f'/api/v1/places/?owner_id={o}&limit=50&sort=newest') for o in ids['owners'])
+        results['browse_newest'] = timed(
+            api('/api/v1/places/?limit=20&sort=newest') for _ in ids['places'])
+        # Suppressions en dernier : elles modifient la copie
+        results['delete_amenity'] = timed(
+            reset(lambda a=a: facade.delete_amenity(a)) for a in ids['amenities'])
+        results['delete_user'] = timed(
+            reset(lambda u=u: facade.delete_user(u)) for u in ids['travellers'])
+        db.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mesure les index des migrations')
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db')
+    add_dataset_arguments(parser)
+    parser.add_argument('--samples', type=int, default=50)
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    build_database(args.db, spec)
+    stripped = f'{args.db}.noindex'
+    shutil.copyfile(args.db, stripped)
+    dropped = strip_indexes(stripped)
+    ids = sample_ids(stripped, args.samples, spec.seed)
+
+    runs = {}
+    for variant, migrate in (('before', False), ('after', True)):
+        work = f'{args.db}.{variant}'
+        shutil.copyfile(stripped, work)
+        runs[variant] = measure(work, ids, migrate)
+        os.remove(work)
+    os.remove(stripped)
+
+    print(json.dumps({'dropped_indexes': dropped, 'migration': runs['after'].pop('migration')}))
+    for name, before in runs['before'].items():
+        after = runs['after'][name]
+        print(json.dumps({
+            'operation': name,
+            'before': before,
+            'after': after,
+            'speedup_p50': round(before['p50_ms'] / after['p50_ms'], 1) if after['p50_ms'] else None,
+        }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Coût par requête des logs sur le chemin des requêtes HTTP
+
+Rejoue des requêtes qui passent par les points de log de l'API (ligne
+'request' de query_stats, debug des PUT/POST /places/, refus 403) sans
+écrire en base. Les tours alternent logs actifs (stdout/stderr vers
+/dev/null : coût de formatage et d'écriture, pas celui du terminal) et
+logs coupés (logging.disable, print sans effet) ; la médiane des écarts
+entre tours voisins est le surcoût des logs par requête.
+
+    python benchmarks/bench_logging.py [--config production] [--rounds 20]
+
+Affiche une ligne JSON par scénario (µs par requête).
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PLACE = {'title': 'Bench', 'price': 10.0, 'latitude': 1.0, 'longitude': 1.0, 'amenities': []}
+
+
+def scenarios(auth):
+    return {
+        'GET /places/': lambda c: c.get('/api/v1/places/?limit=20'),
+        'POST /places/ (403)': lambda c: c.post('/api/v1/places/', json=PLACE, headers=auth('voyageur')),
+        'PUT /places/<id> (404)': lambda c: c.put('/api/v1/places/missing', json=PLACE, headers=auth('owner')),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--config', default='production')
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=100, help='requêtes par tour')
+    args = parser.parse_args()
+
+    out = sys.stdout
+    devnull = open(os.devnull, 'w')
+    muted = _Muted()
+    # Avant l'import de l'application : les handlers capturent le flux à leur création
+    sys.stdout = sys.stderr = devnull
+
+    from flask_jwt_extended import create_access_token
+    from app import create_app
+
+    app = create_app(args.config)
+    with app.app_context():
+        tokens = {
+            role: create_access_token(identity='bench-user', additional_claims={'role': role})
+            for role in ('owner', 'voyageur')
+        }
+
+    def auth(role):
+        return {'Authorization': f'Bearer {tokens[role]}'}
+
+    client = app.test_client()
+    for name, call in scenarios(auth).items():
+        for _ in range(50):
+            call(client)
+        timings = {'on': [], 'off': []}
+        overheads = []
+        for i in range(args.rounds):
+            rounds = {}
+            for mode in (('on', 'off') if i % 2 else ('off', 'on')):
+                logging.disable(logging.NOTSET if mode == 'on' else logging.CRITICAL)
+                sys.stdout = devnull if mode == 'on' else muted
+                samples = []
+                for _ in range(args.requests):
+                    started_at = time.perf_counter()
+                    call(client)
+                    samples.append((time.perf_counter() - started_at) * 1e6)
+                rounds[mode] = statistics.median(samples)
+                timings[mode] += samples
+            overheads.append(rounds['on'] - rounds['off'])
+        logging.disable(logging.NOTSET)
+        sys.stdout = devnull
+
+        print(json.dumps({
+            'scenario': name,
+            'config': args.config,
+            'requests': len(timings['on']),
+            'p50_us': round(statistics.median(timings['on']), 1),
+            'p50_muted_us': round(statistics.median(timings['off']), 1),
+            'logging_overhead_us': round(statistics.median(overheads), 1),
+        }), file=out)
+
+
+class _Muted:
+    """Sortie qui ignore tout (print sans écriture)"""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""Profils du moteur SQLite : réglages par défaut contre ProductionConfig
+
+Rejoue les mêmes scénarios (bench_app.py, pilote wsgi, clients HTTP
+concurrents) sous deux profils, chacun sur une copie neuve de la base :
+
+    default  SQLite tel quel : journal rollback (DELETE), synchronous=FULL,
+             cache de 2 Mio, pas de mmap, pool par défaut
+    tuned    SQLITE_PRAGMAS et SQLALCHEMY_ENGINE_OPTIONS de ProductionConfig
+             (WAL, synchronous=NORMAL, mmap, cache, busy_timeout)
+
+journal_mode est persistant dans le fichier : le profil default le remet
+explicitement à DELETE. Les « database is locked » remontent en 500 et
+sont comptés dans errors.
+
+    python benchmarks/bench_sqlite.py --scale small --requests 400 --concurrency 8
+
+Affiche une ligne JSON par scénario (débit, p50/p95/p99, erreurs des deux
+profils) et écrit le rapport complet dans benchmarks/results/.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_app import RESULTS_DIR, SCENARIO_SHARE, run  # noqa: E402
+from dataset import add_dataset_arguments  # noqa: E402
+
+PROFILES = {
+    'default': {'SQLITE_PRAGMAS': {'journal_mode': 'DELETE'}, 'SQLALCHEMY_ENGINE_OPTIONS': {}},
+    'tuned': {},
+}
+DEFAULT_SCENARIOS = ['browse', 'place_detail', 'place_reviews', 'post_review', 'read_write']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare les profils du moteur SQLite')
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db', help='base modèle (construite si absente)')
+    add_dataset_arguments(parser)
+    parser.add_argument('--requests', type=int, default=400, help='requêtes par scénario (avant pondération)')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--concurrency', type=int, default=8, help='clients HTTP concurrents')
+    parser.add_argument('--scenario', dest='scenarios', action='append', choices=list(SCENARIO_SHARE))
+    parser.add_argument('--seed-requests', type=int, default=1)
+    parser.add_argument('--output', default=None, help='fichier JSON (défaut : benchmarks/results/)')
+    args = parser.parse_args()
+
+    reports = {}
+    for profile, overrides in PROFILES.items():
+        print(f'--- {profile}', file=sys.stderr)
+        run_args = argparse.Namespace(**vars(args))
+        run_args.config = 'production'
+        run_args.driver = 'wsgi'
+        run_args.scenarios = args.scenarios or DEFAULT_SCENARIOS
+        run_args.set = overrides
+        run_args.label = f'sqlite-{profile}'
+        reports[profile] = run(run_args)
+
+    for name, default in reports['default']['results']['wsgi'].items():
+        tuned = reports['tuned']['results']['wsgi'][name]
+        print(json.dumps({
+            'scenario': name,
+            'default': {k: default[k] for k in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors')},
+            'tuned': {k: tuned[k] for k in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors')},
+            'throughput_ratio': round(tuned['throughput_rps'] / default['throughput_rps'], 2)
+            if default['throughput_rps'] else None,
+        }))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+        output = os.path.join(RESULTS_DIR, f'{stamp}-sqlite-profiles.json')
+    with open(output, 'w') as f:
+        json.dump(reports, f, indent=2)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Démarrage à froid d'un worker : du lancement à la première réponse
+
+Chaque tour lance un interpréteur neuf sous `python -X importtime` qui
+importe le module de l'application (run.py, comme `gunicorn run:app`)
+puis sert /swagger.json et /api/v1/places/?limit=1. On mesure, en
+médiane sur les tours :
+
+- ready_ms : du lancement du processus à la fin de la première requête ;
+- import_ms : import du module (import time de `run`, création de l'app comprise) ;
+- swagger_ms : première requête /swagger.json (spec générée ou relue) ;
+- les modules les plus coûteux à l'import (temps propre).
+
+    python benchmarks/bench_startup.py --config production --runs 15
+    flask --app run hbnb export-swagger   # puis relancer : spec relue du fichier
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import {module} as target
+imported = time.perf_counter()
+client = target.app.test_client()
+swagger = client.get('/swagger.json')
+swagger_done = time.perf_counter()
+first = client.get('/api/v1/places/?limit=1')
+done = time.perf_counter()
+api = target.app.extensions.get('hbnb_api')
+print(json.dumps({{
+    'import_s': imported - started,
+    'swagger_s': swagger_done - imported,
+    'first_request_s': done - swagger_done,
+    'statuses': [swagger.status_code, first.status_code],
+    'spec_from_file': bool(api is not None and api.spec_file and __import__('os').path.exists(api.spec_file)),
+}}), file=sys.__stdout__, flush=True)
+"""
+
+
+def parse_importtime(stderr):
+    """{module: (temps propre µs, cumulé µs)} depuis la sortie de -X importtime"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def run_once(args):
+    env = dict(os.environ, HBNB_CONFIG=args.config)
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(module=args.module)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    lines = [line for line in process.stdout.splitlines() if line.startswith('{"import_s"')]
+    if process.returncode != 0 or not lines:
+        sys.exit(f'échec du processus enfant :\n{process.stderr[-2000:]}')
+    result = json.loads(lines[-1])
+    # Sortie du processus non comprise : prêt = fin de la première requête
+    result['ready_s'] = elapsed
+    result['modules'] = parse_importtime(process.stderr)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mesure le démarrage à froid')
+    parser.add_argument('--config', default='production')
+    parser.add_argument('--module', default='run')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--top', type=int, default=10, help='modules les plus lents affichés')
+    args = parser.parse_args()
+
+    runs = [run_once(args) for _ in range(args.runs)]
+
+    def median_ms(key):
+        return round(statistics.median(r[key] for r in runs) * 1000, 1)
+
+    own = {}
+    for r in runs:
+        for name, (own_us, _) in r['modules'].items():
+            own.setdefault(name, []).append(own_us)
+    slowest = sorted(own.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]
+    app_modules = [
+        cumulative for r in runs for name, (_, cumulative) in r['modules'].items()
+        if name == args.module
+    ]
+    print(json.dumps({
+        'config': args.config,
+        'module': args.module,
+        'runs': args.runs,
+        'spec_from_file': runs[0]['spec_from_file'],
+        'statuses': runs[0]['statuses'],
+        'ready_ms': median_ms('ready_s'),
+        'import_ms': median_ms('import_s'),
+        'importtime_module_ms': round(statistics.median(app_modules) / 1000, 1) if app_modules else None,
+        'swagger_ms': median_ms('swagger_s'),
+        'first_request_ms': median_ms('first_request_s'),
+        'slowest_imports_ms': {name: round(statistics.median(v) / 1000, 1) for name, v in slowest},
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Rafales d'avis : commit par écriture contre file d'écritures (commit groupé)
+
+--concurrency threads postent chacun --per-client avis via
+HBnBFacade.create_review, tous en même temps, sur une copie neuve de la
+base synthétique. Variantes : file d'écritures désactivée (chaque appel
+committe) ou activée, pour chaque valeur de --synchronous (FULL : un
+fsync par commit, NORMAL : au checkpoint WAL) et de --max-batch.
+
+    python benchmarks/bench_writes.py --scale small --concurrency 16 --per-client 50
+
+Une ligne JSON par variante : avis/s, latence p50/p95 d'un appel,
+erreurs, lots committés et taille moyenne des lots.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset import build_database, add_dataset_arguments, database_overrides, spec_from_args  # noqa: E402
+
+
+def pick_reviews(path, concurrency, per_client, seed):
+    """Avis à poster : (user_id, place_id) hors lieux de l'auteur, par client"""
+    conn = sqlite3.connect(path)
+    rng = random.Random(seed)
+    users = [r[0] for r in conn.execute("SELECT id FROM users WHERE email LIKE 'user%' ORDER BY id")]
+    places = conn.execute('SELECT id, owner_id FROM places ORDER BY id').fetchall()
+    conn.close()
+    clients = []
+    for _ in range(concurrency):
+        calls = []
+        while len(calls) < per_client:
+            user_id = rng.choice(users)
+            place_id, owner_id = rng.choice(places)
+            if owner_id != user_id:
+                calls.append({'text': 'Avis de rafale', 'rating': rng.randint(1, 5),
+                              'user_id': user_id, 'place_id': place_id})
+        clients.append(calls)
+    return clients
+
+
+def burst(path, clients, overrides):
+    from app import create_app
+    from app.extensions import db, write_queue
+    from app.services.facade import HBnBFacade
+
+    app = create_app('production', overrides={**database_overrides(path), **overrides})
+    durations, errors = [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(clients) + 1)
+
+    def client(calls):
+        local = []
+        with app.app_context():
+            facade = HBnBFacade()
+            barrier.wait()
+            for data in calls:
+                started_at = time.perf_counter()
+                try:
+                    facade.create_review(data)
+                except Exception as e:
+                    with lock:
+                        errors.append(str(e))
+                local.append(time.perf_counter() - started_at)
+                db.session.remove()
+        with lock:
+            durations.extend(local)
+
+    threads = [threading.Thread(target=client, args=(calls,)) for calls in clients]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started_at = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started_at
+
+    with app.app_context():
+        stats = write_queue.stats()
+        db.engine.dispose()
+    durations.sort()
+    return {
+        'reviews': len(durations),
+        'reviews_per_s': round(len(durations) / elapsed, 1),
+        'p50_ms': round(statistics.median(durations) * 1000, 2),
+        'p95_ms': round(durations[int(len(durations) * 0.95) - 1] * 1000, 2),
+        'errors': len(errors),
+        'first_error': errors[0] if errors else None,
+        'batches': stats.get('batches'),
+        'mean_batch': stats.get('mean_batch'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure le commit groupé des écritures")
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db')
+    add_dataset_arguments(parser)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--per-client', type=int, default=50)
+    parser.add_argument('--synchronous', action='append', choices=['FULL', 'NORMAL'])
+    parser.add_argument('--max-batch', type=int, action='append', help='tailles de lot essayées (répétable)')
+    args = parser.parse_args()
+
+    spec = spec_from_args(args)
+    build_database(args.db, spec)
+    clients = pick_reviews(args.db, args.concurrency, args.per_client, spec.seed)
+    work = f'{args.db}.writes'
+
+    from config import ProductionConfig
+
+    for synchronous in args.synchronous or ['FULL', 'NORMAL']:
+        pragmas = dict(ProductionConfig.SQLITE_PRAGMAS, synchronous=synchronous)
+        variants = [('per_write_commit', {'WRITE_QUEUE_ENABLED': False})]
+        variants += [(f'write_queue_{size}', {'WRITE_QUEUE_ENABLED': True, 'WRITE_QUEUE_MAX_BATCH': size})
+                     for size in args.max_batch or [8, 64]]
+        for name, overrides in variants:
+            shutil.copyfile(args.db, work)
+            result = burst(work, clients, {'SQLITE_PRAGMAS': pragmas, 'CACHE_ENABLED': False, **overrides})
+            print(json.dumps({'synchronous': synchronous, 'variant': name,
+                              'concurrency': args.concurrency, **result}))
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(work + suffix):
+            os.remove(work + suffix)
+
+
+if __name__ == '__main__':
+    main()
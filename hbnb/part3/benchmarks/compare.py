@@ -0,0 +1,54 @@
+"""Compare deux rapports de bench_app.py (référence, puis candidat)
+
+    python benchmarks/compare.py results/avant.json results/apres.json
+
+Une ligne par pilote et scénario : p50, p95, p99, débit et requêtes SQL
+par requête, avec l'écart relatif au rapport de référence.
+"""
+import json
+import sys
+
+METRICS = [
+    ('p50_ms', 'p50'),
+    ('p95_ms', 'p95'),
+    ('p99_ms', 'p99'),
+    ('throughput_rps', 'req/s'),
+    ('queries_per_request', 'q/req'),
+]
+
+
+def delta(before, after):
+    if before is None or after is None:
+        return 'n/a'
+    if not before:
+        return f'{after}'
+    return f'{before:g} -> {after:g} ({(after - before) / before * 100:+.1f}%)'
+
+
+def compare(base, candidate):
+    lines = []
+    for driver, scenarios in candidate['results'].items():
+        for name, after in scenarios.items():
+            before = base['results'].get(driver, {}).get(name)
+            if before is None:
+                continue
+            cells = [f'{label} {delta(before.get(key), after.get(key))}' for key, label in METRICS]
+            lines.append(f'{driver:<11} {name:<16} ' + '  '.join(cells))
+    return lines
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit('usage: compare.py REFERENCE.json CANDIDATE.json')
+    with open(sys.argv[1]) as f:
+        base = json.load(f)
+    with open(sys.argv[2]) as f:
+        candidate = json.load(f)
+    if base.get('dataset', {}).get('spec') != candidate.get('dataset', {}).get('spec'):
+        print('⚠️ Jeux de données différents : comparaison indicative', file=sys.stderr)
+    for line in compare(base, candidate):
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
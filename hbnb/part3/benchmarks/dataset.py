@@ -0,0 +1,299 @@
+"""Jeu de données synthétique et déterministe pour les benchmarks
+
+Même graine et même taille => mêmes lignes, octet pour octet. Les lieux
+sont regroupés autour de villes (gaussienne autour du centre), les avis
+suivent une loi de puissance (quelques lieux très commentés, une longue
+traîne presque sans avis) et tous les utilisateurs partagent le mot de
+passe BENCH_PASSWORD (un seul hachage, calculé une fois).
+
+    python benchmarks/dataset.py --scale small --db /tmp/hbnb-bench.db
+
+Le chargement passe par des INSERT Core en executemany, puis reconstruit
+les index dérivés (place_cells, FTS) et les agrégats des notes comme le
+feraient les commandes `flask hbnb`.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+BENCH_PASSWORD = 'bench-password'
+EPOCH = datetime(2024, 1, 1)
+INSERT_CHUNK = 10000
+
+# (ville, latitude, longitude, poids, écart-type en degrés)
+CITIES = [
+    ('Paris', 48.8566, 2.3522, 20, 0.08),
+    ('London', 51.5074, -0.1278, 16, 0.10),
+    ('New York', 40.7128, -74.0060, 16, 0.10),
+    ('Barcelona', 41.3874, 2.1686, 10, 0.05),
+    ('Lisbon', 38.7223, -9.1393, 8, 0.05),
+    ('Rome', 41.9028, 12.4964, 8, 0.06),
+    ('Berlin', 52.5200, 13.4050, 7, 0.08),
+    ('Tokyo', 35.6762, 139.6503, 7, 0.12),
+    ('Marseille', 43.2965, 5.3698, 4, 0.05),
+    ('Lyon', 45.7640, 4.8357, 4, 0.04),
+    ('Montréal', 45.5019, -73.5674, 3, 0.06),
+    ('Dakar', 14.7167, -17.4677, 2, 0.05),
+]
+KINDS = ['Loft', 'Studio', 'Appartement', 'Maison', 'Villa', 'Chambre', 'Cabane', 'Péniche', 'Duplex']
+ADJECTIVES = ['Charmant', 'Lumineux', 'Calme', 'Spacieux', 'Cosy', 'Moderne', 'Ancien', 'Design', 'Familial']
+FEATURES = ['vue sur la mer', 'terrasse', 'proche du métro', 'jardin', 'parquet', 'cheminée',
+            'rooftop', 'piscine', 'quartier animé', 'centre historique', 'au calme', 'parking']
+FIRST_NAMES = ['Alice', 'Bruno', 'Chloé', 'David', 'Emma', 'Farid', 'Gaëlle', 'Hugo', 'Inès', 'Jules',
+               'Karim', 'Léa', 'Marc', 'Nina', 'Omar', 'Paula', 'Quentin', 'Rose', 'Sami', 'Tara']
+LAST_NAMES = ['Martin', 'Bernard', 'Dubois', 'Thomas', 'Robert', 'Richard', 'Petit', 'Durand',
+              'Leroy', 'Moreau', 'Simon', 'Laurent', 'Diallo', 'Garcia', 'Nguyen', 'Rossi']
+AMENITY_NAMES = ['Wi-Fi', 'Cuisine', 'Lave-linge', 'Climatisation', 'Chauffage', 'Parking', 'Piscine',
+                 'Jacuzzi', 'Télévision', 'Sèche-cheveux', 'Fer à repasser', 'Bureau', 'Ascenseur',
+                 'Balcon', 'Barbecue', 'Lit bébé', 'Animaux acceptés', 'Accès PMR', 'Cheminée',
+                 'Salle de sport', 'Vue mer', 'Jardin', 'Lave-vaisselle', 'Four', 'Micro-ondes',
+                 'Cafetière', 'Borne de recharge', 'Vélos', 'Coffre-fort', 'Détecteur de fumée']
+REVIEW_TEXTS = ['Séjour parfait, je recommande.', 'Très bien situé, un peu bruyant.',
+                'Hôte réactif et logement propre.', 'Conforme aux photos.', 'Décevant, pas très propre.',
+                'Super vue, literie confortable.', 'Rapport qualité/prix correct.', 'À éviter.']
+# Probabilités des notes 1 à 5 (les notes hautes dominent, comme sur les vraies plateformes)
+RATING_WEIGHTS = [4, 6, 14, 34, 42]
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    seed: int = 42
+    users: int = 1000
+    owners: int = 100
+    amenities: int = 30
+    places: int = 2000
+    reviews: int = 20000
+    amenities_per_place: int = 8
+    # Exposant de la loi de Zipf des avis par lieu
+    review_skew: float = 1.1
+
+
+SCALES = {
+    'tiny': DatasetSpec(users=100, owners=10, amenities=15, places=200, reviews=1000),
+    'small': DatasetSpec(),
+    'medium': DatasetSpec(users=10000, owners=1000, amenities=30, places=20000, reviews=200000),
+    'large': DatasetSpec(users=100000, owners=5000, amenities=30, places=200000, reviews=2000000),
+}
+
+
+class Dataset:
+    """Lignes du jeu de données (dictionnaires prêts pour un INSERT Core)"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        rng = random.Random(spec.seed)
+        self._rng = rng
+        self.users = []
+        self.owner_ids = []
+        self.traveller_ids = []
+        self.amenities = []
+        self.places = []
+        self.place_amenities = []
+        self.reviews = []
+        self._generate_users()
+        self._generate_amenities()
+        self._generate_places()
+        self._generate_reviews()
+
+    def _id(self):
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _moment(self, start=EPOCH, days=365):
+        return start + timedelta(seconds=self._rng.randrange(days * 86400))
+
+    def _generate_users(self):
+        from werkzeug.security import generate_password_hash
+
+        password_hash = generate_password_hash(BENCH_PASSWORD)
+        rng = self._rng
+        for i in range(self.spec.users):
+            is_owner = i < self.spec.owners
+            user_id = self._id()
+            created_at = self._moment()
+            self.users.append({
+                'id': user_id,
+                'first_name': rng.choice(FIRST_NAMES),
+                'last_name': rng.choice(LAST_NAMES),
+                'email': f"{'owner' if is_owner else 'user'}{i}@bench.hbnb.io",
+                'password_hash': password_hash,
+                'is_admin': i == 0,
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+            (self.owner_ids if is_owner else self.traveller_ids).append(user_id)
+
+    def _generate_amenities(self):
+        for i in range(self.spec.amenities):
+            name = AMENITY_NAMES[i % len(AMENITY_NAMES)]
+            if i >= len(AMENITY_NAMES):
+                name = f'{name} {i // len(AMENITY_NAMES) + 1}'
+            self.amenities.append({
+                'id': self._id(), 'name': name, 'created_at': EPOCH, 'updated_at': EPOCH,
+            })
+
+    def _generate_places(self):
+        rng = self._rng
+        city_weights = list(accumulate(city[3] for city in CITIES))
+        amenity_ids = [a['id'] for a in self.amenities]
+        for _ in range(self.spec.places):
+            city, lat, lon, _, sigma = rng.choices(CITIES, cum_weights=city_weights)[0]
+            place_id = self._id()
+            created_at = self._moment()
+            self.places.append({
+                'id': place_id,
+                'title': f'{rng.choice(ADJECTIVES)} {rng.choice(KINDS).lower()} à {city}',
+                'description': ', '.join(rng.sample(FEATURES, 3)).capitalize() + '.',
+                'price': round(max(15.0, rng.lognormvariate(4.5, 0.6)), 2),
+                'latitude': round(rng.gauss(lat, sigma), 7),
+                'longitude': round(rng.gauss(lon, sigma), 7),
+                'owner_id': rng.choice(self.owner_ids),
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+            count = rng.randint(0, min(self.spec.amenities_per_place, len(amenity_ids)))
+            for amenity_id in rng.sample(amenity_ids, count):
+                self.place_amenities.append({'place_id': place_id, 'amenity_id': amenity_id})
+
+    def _generate_reviews(self):
+        rng = self._rng
+        # L'ordre de génération (aléatoire) sert de rang de popularité
+        self.place_weights = list(accumulate(
+            1.0 / (rank + 1) ** self.spec.review_skew for rank in range(len(self.places))
+        ))
+        if not self.places or not self.traveller_ids:
+            return
+        rating_weights = list(accumulate(RATING_WEIGHTS))
+        places = rng.choices(self.places, cum_weights=self.place_weights, k=self.spec.reviews)
+        for place in places:
+            created_at = self._moment(place['created_at'], 180)
+            self.reviews.append({
+                'id': self._id(),
+                'text': rng.choice(REVIEW_TEXTS),
+                'rating': rng.choices(range(1, 6), cum_weights=rating_weights)[0],
+                'place_id': place['id'],
+                'user_id': rng.choice(self.traveller_ids),
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+
+    def counts(self):
+        return {
+            'users': len(self.users),
+            'amenities': len(self.amenities),
+            'places': len(self.places),
+            'place_amenity': len(self.place_amenities),
+            'reviews': len(self.reviews),
+        }
+
+
+def load(dataset):
+    """Insère le jeu de données dans la base de l'application courante"""
+    from app.extensions import db
+    from app.models.amenity import Amenity
+    from app.models.place import Place, PlaceAmenity
+    from app.models.review import Review
+    from app.models.user import User
+    from app.services.facade import HBnBFacade
+
+    db.create_all()
+    tables = [
+        (User, dataset.users),
+        (Amenity, dataset.amenities),
+        (Place, dataset.places),
+        (PlaceAmenity, dataset.place_amenities),
+        (Review, dataset.reviews),
+    ]
+    with db.engine.begin() as conn:
+        for model, rows in tables:
+            for start in range(0, len(rows), INSERT_CHUNK):
+                conn.execute(db.insert(model.__table__), rows[start:start + INSERT_CHUNK])
+
+    facade = HBnBFacade()
+    facade.rebuild_place_cells()
+    facade.rebuild_search_index()
+    facade.repair_rating_aggregates()
+
+
+def build_database(path, spec, config_name='production'):
+    """Crée (ou réutilise) une base SQLite contenant le jeu de données de spec
+
+    Un fichier <path>.json décrit la base ; si la spécification n'a pas
+    changé, la base existante est réutilisée telle quelle.
+    """
+    meta_path = f'{path}.json'
+    if os.path.exists(path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('spec') == asdict(spec):
+            return meta
+
+    from app import create_app
+
+    for stale in (path, meta_path):
+        if os.path.exists(stale):
+            os.remove(stale)
+    started_at = time.perf_counter()
+    dataset = Dataset(spec)
+    generated_at = time.perf_counter()
+    app = create_app(config_name, overrides=database_overrides(path))
+    with app.app_context():
+        load(dataset)
+        from app.extensions import db
+        db.engine.dispose()
+    meta = {
+        'spec': asdict(spec),
+        'counts': dataset.counts(),
+        'generate_s': round(generated_at - started_at, 2),
+        'load_s': round(time.perf_counter() - generated_at, 2),
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def database_overrides(path):
+    """Réglages pour pointer l'application sur une base de benchmark"""
+    return {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(path)}',
+        'LOG_LEVEL': 'WARNING',
+        'SLOW_QUERY_ENABLED': False,
+        'METRICS_MULTIPROC_DIR': None,
+    }
+
+
+def spec_from_args(args):
+    spec = SCALES[args.scale]
+    changes = {
+        field: getattr(args, field) for field in ('seed', 'users', 'owners', 'amenities', 'places', 'reviews')
+        if getattr(args, field) is not None
+    }
+    return DatasetSpec(**{**asdict(spec), **changes})
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int)
+    for field in ('users', 'owners', 'amenities', 'places', 'reviews'):
+        parser.add_argument(f'--{field}', type=int)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Génère la base SQLite des benchmarks')
+    parser.add_argument('--db', default='/tmp/hbnb-bench.db')
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+    meta = build_database(args.db, spec_from_args(args))
+    print(json.dumps(meta, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -339,46 +339,62 @@ if (registerForm) {
             credentials: 'include'
         } : {};
 
-        // Appel API simple
-        fetch('http://localhost:5001/api/v1/places/', options)
-            .then(response => response.json())
-            .then(places => {
-                // Vider la liste
-                placesList.innerHTML = '';
-
-                // Créer une carte pour chaque lieu
-                places.forEach(place => {
-                    const card = document.createElement('div');
-                    card.className = 'place-card';
-                    card.dataset.price = place.price_by_night;
-                    card.innerHTML = `
-                        <h3 class="place-name">${place.name}</h3>
-                        <p class="place-price">${place.price_by_night} €/nuit</p>
-                        <button class="details-button" onclick="window.location.href='place.html?id=${place.id}'">
-                          Voir les détails
-                        </button>
-                    `;
-                    placesList.appendChild(card);
-                });
+        const loadMoreButton = document.createElement('button');
+        loadMoreButton.className = 'details-button';
+        loadMoreButton.textContent = 'Voir plus de lieux';
+        loadMoreButton.style.display = 'none';
+        placesList.after(loadMoreButton);
+
+        // Paliers de prix : le filtrage est fait côté serveur (max_price)
+        const priceSteps = [50, 100, 150, 200, 300, 500];
+        priceFilter.innerHTML = '<option value="">Tous</option>' + 
+            priceSteps.map(price => `<option value="${price}">≤ ${price} €</option>`).join('');
+
+        // Chargement page par page : l'API renvoie { places, next_cursor }
+        function loadPlacesPage(cursor) {
+            const params = new URLSearchParams({ limit: 20, sort: 'price', fields: 'id,name,price_by_night,review_count,average_rating' });
+            if (priceFilter.value) {
+                params.set('max_price', priceFilter.value);
+            }
+            if (cursor) {
+                params.set('after', cursor);
+            }
+
+            fetch('http://localhost:5001/api/v1/places/?' + params.toString(), options)
+                .then(response => response.json())
+                .then(page => {
+                    if (!cursor) {
+                        placesList.innerHTML = '';
+                    }
 
-                // Créer les options de filtre prix
-                const prices = [...new Set(places.map(p => p.price_by_night))].sort((a, b) => a - b);
-                priceFilter.innerHTML = '<option value="">Tous</option>' + 
-                    prices.map(price => `<option value="${price}">≤ ${price} €</option>`).join('');
-
-                // Gestion du filtre
-                priceFilter.addEventListener('change', () => {
-                    const maxPrice = Number(priceFilter.value);
-                    document.querySelectorAll('.place-card').forEach(card => {
-                        const cardPrice = Number(card.dataset.price);
-                        card.style.display = (!maxPrice || cardPrice <= maxPrice) ? '' : 'none';
+                    // Créer une carte pour chaque lieu
+                    page.places.forEach(place => {
+                        const card = document.createElement('div');
+                        card.className = 'place-card';
+                        card.dataset.price = place.price_by_night;
+                        card.innerHTML = `
+                            <h3 class="place-name">${place.name}</h3>
+                            <p class="place-price">${place.price_by_night} €/nuit</p>
+                            <p class="place-rating">${place.review_count ? `★ ${place.average_rating} (${place.review_count} avis)` : 'Pas encore d\'avis'}</p>
+                            <button class="details-button" onclick="window.location.href='place.html?id=${place.id}'">
+                              Voir les détails
+                            </button>
+                        `;
+                        placesList.appendChild(card);
                     });
+
+                    loadMoreButton.style.display = page.next_cursor ? '' : 'none';
+                    loadMoreButton.onclick = () => loadPlacesPage(page.next_cursor);
+                })
+                .catch(error => {
+                    placesList.innerHTML = '<p>Erreur de chargement des lieux</p>';
+                    console.error('Erreur:', error);
                 });
-            })
-            .catch(error => {
-                placesList.innerHTML = '<p>Erreur de chargement des lieux</p>';
-                console.error('Erreur:', error);
-            });
+        }
+
+        // Gestion du filtre : rechargement depuis la première page
+        priceFilter.addEventListener('change', () => loadPlacesPage(null));
+        loadPlacesPage(null);
     }
 
     // -------------------------------------------------------------
@@ -664,23 +680,32 @@ if (registerForm) {
             try {
                 myPlacesList.innerHTML = '<div class="loading-places"><p>🔄 Chargement de vos lieux...</p></div>';
                 
-                const response = await fetch('http://localhost:5001/api/v1/places/', {
-                    headers: { 'Authorization': 'Bearer ' + jwt },
-                    credentials: 'include'
-                });
-
-                if (!response.ok) {
-                    throw new Error(`Erreur API: ${response.status}`);
-                }
-
-                const allPlaces = await response.json();
-                
                 // Décoder le JWT pour récupérer l'ID utilisateur
                 const tokenParts = jwt.split('.');
                 const payload = JSON.parse(atob(tokenParts[1]));
                 const currentUserId = payload.sub;
-                
-                const myPlaces = allPlaces.filter(place => place.owner_id === currentUserId);
+
+                // Filtrage par propriétaire côté serveur, pages suivies via next_cursor
+                const myPlaces = [];
+                let cursor = null;
+                do {
+                    const params = new URLSearchParams({ limit: 100, owner_id: currentUserId, expand: 'amenities' });
+                    if (cursor) {
+                        params.set('after', cursor);
+                    }
+                    const response = await fetch('http://localhost:5001/api/v1/places/?' + params.toString(), {
+                        headers: { 'Authorization': 'Bearer ' + jwt },
+                        credentials: 'include'
+                    });
+
+                    if (!response.ok) {
+                        throw new Error(`Erreur API: ${response.status}`);
+                    }
+
+                    const page = await response.json();
+                    myPlaces.push(...page.places);
+                    cursor = page.next_cursor;
+                } while (cursor);
                 
                 if (myPlaces.length === 0) {
                     myPlacesList.innerHTML = '';
@@ -754,7 +779,7 @@ if (registerForm) {
             const totalPlaces = places.length;
             const totalPrice = places.reduce((sum, place) => sum + (place.price_by_night || 0), 0);
             const averagePrice = totalPlaces > 0 ? (totalPrice / totalPlaces).toFixed(0) : 0;
-            const totalReviews = places.reduce((sum, place) => sum + (place.reviews?.length || 0), 0);
+            const totalReviews = places.reduce((sum, place) => sum + (place.review_count || 0), 0);
             
             document.getElementById('total-places').textContent = totalPlaces;
             document.getElementById('average-price').textContent = `${averagePrice} €`;
@@ -966,23 +991,37 @@ if (registerForm) {
             return;
         }
 
-        function loadReviews() {
+        const loadMoreReviewsButton = document.createElement('button');
+        loadMoreReviewsButton.className = 'details-button';
+        loadMoreReviewsButton.textContent = 'Voir plus d\'avis';
+        loadMoreReviewsButton.style.display = 'none';
+
+        // Chargement page par page : l'API renvoie { reviews, next_cursor, total, ... }
+        function loadReviews(cursor) {
             console.log('Chargement des avis...');
             
             const fetchOptions = jwt ? { 
                 headers: { 'Authorization': 'Bearer ' + jwt },
                 credentials: 'include'
             } : {};
+
+            const params = new URLSearchParams({ limit: 20, sort: 'newest', fields: 'id,text,rating,user_name' });
+            if (cursor) {
+                params.set('after', cursor);
+            }
             
-            fetch(`http://localhost:5001/api/v1/places/${placeId}/reviews/`, fetchOptions)
+            fetch(`http://localhost:5001/api/v1/places/${placeId}/reviews/?` + params.toString(), fetchOptions)
                 .then(resp => resp.json())
-                .then(reviews => {
+                .then(page => {
                     const listDiv = document.getElementById('review-list');
                     if (!listDiv) return;
                     
-                    listDiv.innerHTML = '';
+                    if (!cursor) {
+                        listDiv.innerHTML = '';
+                        listDiv.after(loadMoreReviewsButton);
+                    }
                     
-                    if (reviews.length === 0) {
+                    if (page.total === 0) {
                         listDiv.innerHTML = `
                             <div class="no-reviews" style="text-align: center; padding: 40px; background: #f8f9fa; border-radius: 10px; margin: 20px 0;">
                                 <div style="font-size: 3rem; margin-bottom: 15px;">💭</div>
@@ -990,10 +1029,18 @@ if (registerForm) {
                                 <p style="color: #6c757d;">Soyez le premier à partager votre expérience !</p>
                             </div>
                         `;
+                        loadMoreReviewsButton.style.display = 'none';
                         return;
                     }
+
+                    if (!cursor) {
+                        const summary = document.createElement('p');
+                        summary.className = 'review-summary';
+                        summary.textContent = `★ ${page.average_rating} (${page.total} avis)`;
+                        listDiv.appendChild(summary);
+                    }
                     
-                    reviews.forEach(rv => {
+                    page.reviews.forEach(rv => {
                         const reviewCard = document.createElement('div');
                         reviewCard.className = 'review-card';
                         reviewCard.innerHTML = `
@@ -1005,6 +1052,9 @@ if (registerForm) {
                         `;
                         listDiv.appendChild(reviewCard);
                     });
+
+                    loadMoreReviewsButton.style.display = page.next_cursor ? '' : 'none';
+                    loadMoreReviewsButton.onclick = () => loadReviews(page.next_cursor);
                 })
                 .catch(err => {
                     const listDiv = document.getElementById('review-list');
@@ -1020,8 +1070,8 @@ if (registerForm) {
                 credentials: 'include'
             } : {};
 
-            // Chargement des détails du lieu
-            fetch(`http://localhost:5001/api/v1/places/${placeId}`, fetchOptions)
+            // Chargement des détails du lieu (les avis sont paginés à part)
+            fetch(`http://localhost:5001/api/v1/places/${placeId}?expand=owner,amenities`, fetchOptions)
                 .then(resp => {
                     if (!resp.ok) throw new Error("Lieu introuvable");
                     return resp.json();
@@ -1053,7 +1103,7 @@ if (registerForm) {
                         `;
                     }
 
-                    loadReviews();
+                    loadReviews(null);
                 })
                 .catch(err => {
                     console.error('Erreur:', err);
@@ -1105,7 +1155,7 @@ if (registerForm) {
                         })
                         .then(() => {
                             reviewForm.reset();
-                            loadReviews();
+                            loadReviews(null);
                         })
                         .catch(err => {
                             alert(err.message || "Erreur inconnue");